@@ -1,10 +1,13 @@
 from fastapi import FastAPI
 from .user import router as user_router
-from .stadium import stadium_router
+from .stadium import stadium_router, admin_router as stadium_admin_router
 from .admin import router as admin_router
 from .booking import booking_router
 from .auth import router as auth_router
-# from .stadium_image import stadium_image_router
+from .stadium_image import stadium_image_router
+from .media import media_router
+from .analytics import analytics_router
+from .export import export_router
 
 
 def setup(app: FastAPI) -> None:
@@ -20,15 +23,32 @@ def setup(app: FastAPI) -> None:
         router=booking_router,
         tags=["Booking"]
     )
+    # Before the admin routes below, whose /bookings/{booking_id} would shadow /bookings/export
+    app.include_router(
+        router=export_router,
+        tags=['Export']
+    )
     app.include_router(
         router=stadium_router,
         tags=['Stadium']
     )
+    app.include_router(
+        router=stadium_admin_router,
+        tags=['Admin']
+    )
     app.include_router(
         router=admin_router,
         tags=['Admin']
     )
-    # app.include_router(
-    #     router=stadium_image_router,
-    #     tags=['Stadium Image']
-    # )
+    app.include_router(
+        router=stadium_image_router,
+        tags=['Stadium Image']
+    )
+    app.include_router(
+        router=media_router,
+        tags=['Media']
+    )
+    app.include_router(
+        router=analytics_router,
+        tags=['Analytics']
+    )
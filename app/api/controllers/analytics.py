@@ -0,0 +1,64 @@
+"""
+Revenue and occupancy analytics for stadium owners and admins.
+
+Revenue and occupancy come from the rollup tables only, so their cost depends on the
+date range, not on the number of bookings. Rollups follow booking changes within the
+aggregator's interval (30s by default). The district heatmap is computed from the
+bookings with NumPy and cached per window.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app import dto
+from app.api.controllers.stadium_image import get_managed_stadium
+from app.api.dependencies import get_current_user, dao_provider
+from app.dto.user import UserResponse
+from app.infrastructure.database.dao.holder import HolderDao
+
+analytics_router = APIRouter(prefix="/api/v0/stadiums")
+
+
+@analytics_router.get("/{stadium_id}/analytics/revenue", description="Get stadium revenue per day, week or month")
+async def stadium_revenue(
+        stadium_id: int,
+        start_date: Optional[date] = Query(None, description="First day (YYYY-MM-DD), defaults to end_date - 29 days"),
+        end_date: Optional[date] = Query(None, description="Last day (YYYY-MM-DD), defaults to today"),
+        period: str = Query("day", description="Bucket size: day, week or month"),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumRevenueResponse:
+    stadium = await get_managed_stadium(stadium_id, user, dao)
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=29)
+    return await dao.analytics.get_revenue(stadium, start_date, end_date, period)
+
+
+@analytics_router.get("/{stadium_id}/analytics/occupancy", description="Get stadium occupancy per hour of the week")
+async def stadium_occupancy(
+        stadium_id: int,
+        start_date: Optional[date] = Query(None, description="First day (YYYY-MM-DD), defaults to end_date - 27 days"),
+        end_date: Optional[date] = Query(None, description="Last day (YYYY-MM-DD), defaults to today"),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumOccupancyResponse:
+    stadium = await get_managed_stadium(stadium_id, user, dao)
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=27)
+    return await dao.analytics.get_occupancy(stadium, start_date, end_date)
+
+
+@analytics_router.get("/{stadium_id}/analytics/heatmap",
+                      description="Get stadium occupancy per weekday and hour compared with its district")
+async def stadium_heatmap(
+        stadium_id: int,
+        start_date: Optional[date] = Query(None, description="First day (YYYY-MM-DD), defaults to end_date - 89 days"),
+        end_date: Optional[date] = Query(None, description="Last day (YYYY-MM-DD), defaults to today"),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumHeatmapResponse:
+    stadium = await get_managed_stadium(stadium_id, user, dao)
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=89)
+    return await dao.analytics.get_heatmap(stadium, start_date, end_date)
@@ -1,15 +1,22 @@
-from fastapi import Depends, HTTPException, APIRouter
+from typing import List, Optional, Set
+
+from fastapi import Depends, HTTPException, APIRouter, Request, Response
 from sqlalchemy import update
 
+from app.api.controllers.stadium_image import get_managed_stadium
 from app.api.dependencies import dao_provider, get_current_user
+from app.api.dependencies.conditional import etag_matches, if_match_versions, version_etag
+from app.api.dependencies.idempotency import IdempotentRoute
 from app.dto import UserResponse
-from app.dto.booking import BookingCreate
+from app.dto.booking import BookingCreate, BookingSeriesCreate, BookingSeriesUpdate, BookingSeriesResponse, \
+    BulkBookingCreate, BulkBookingResponse, WaitlistJoin, WaitlistEntryResponse, BookingEventResponse
 from app.infrastructure.database.dao.holder import HolderDao
 from app.infrastructure.database.models import BookingModel
 from app.infrastructure.database.models.booking import BookingStatus
 from app.infrastructure.database.models.user import UserRole
 
-booking_router = APIRouter(prefix="/bookings")
+# Mutating booking endpoints honour an Idempotency-Key header, so client retries are safe
+booking_router = APIRouter(prefix="/bookings", route_class=IdempotentRoute)
 
 
 @booking_router.get("/", description="Get user's bookings")
@@ -24,18 +31,130 @@ async def booking_list(
 
 
 
+@booking_router.post("/bulk", description="Create many bookings across stadiums at once")
+async def booking_bulk_create(
+        data: BulkBookingCreate,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BulkBookingResponse:
+    return await dao.booking.create_bulk(data, user_id=user.id)
+
+
+@booking_router.post("/series", description="Create a weekly recurring booking series")
+async def booking_series_create(
+        data: BookingSeriesCreate,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BookingSeriesResponse:
+    return await dao.series.create(data, user_id=user.id)
+
+
+@booking_router.get("/series/{series_id}", description="Get booking series with its bookings")
+async def booking_series_detail(
+        series_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BookingSeriesResponse:
+    return await dao.series.get(series_id, user_id=user.id)
+
+
+@booking_router.patch("/series/{series_id}", description="Change times or notes of upcoming series bookings")
+async def booking_series_edit(
+        series_id: int,
+        data: BookingSeriesUpdate,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BookingSeriesResponse:
+    return await dao.series.edit(series_id, data, user_id=user.id)
+
+
+@booking_router.put("/series/{series_id}/confirm", description="Confirm all pending series bookings")
+async def booking_series_confirm(
+        series_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BookingSeriesResponse:
+    return await dao.series.confirm(series_id, user_id=user.id)
+
+
+@booking_router.put("/series/{series_id}/cancel", description="Cancel upcoming series bookings")
+async def booking_series_cancel(
+        series_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> BookingSeriesResponse:
+    return await dao.series.cancel(series_id, user_id=user.id)
+
+
+@booking_router.post("/waitlist", description="Wait for a taken time range; it is offered when freed")
+async def waitlist_join(
+        data: WaitlistJoin,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> WaitlistEntryResponse:
+    return await dao.waitlist.join(data, user_id=user.id)
+
+
+@booking_router.get("/waitlist", description="Get user's waitlist entries and offers")
+async def waitlist_list(
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> List[WaitlistEntryResponse]:
+    return await dao.waitlist.get_by_user(user_id=user.id)
+
+
+@booking_router.delete("/waitlist/{entry_id}", description="Leave the waitlist or turn down an offer")
+async def waitlist_leave(
+        entry_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+):
+    await dao.waitlist.leave(entry_id, user_id=user.id)
+    return {"message": "Left the waitlist"}
+
+
+@booking_router.post("/waitlist/{entry_id}/claim", description="Book the range a waitlist entry was offered")
+async def waitlist_claim(
+        entry_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+):
+    return await dao.booking.create_from_offer(entry_id, user_id=user.id)
+
+
 @booking_router.get("/{booking_id}", description="Get booking by ID")
 async def booking_detail(
         booking_id: int,
+        request: Request,
+        response: Response,
         user: UserResponse = Depends(get_current_user),
         dao: HolderDao = Depends(dao_provider)
 ):
     booking = await dao.booking._get_by_id(booking_id)
-    if not booking or booking.user_id != 1:
+    if not booking or booking.user_id != user.id:
         raise HTTPException(status_code=404, detail="Booking not found or access denied")
+    etag = version_etag(booking.version)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return booking
 
 
+@booking_router.get("/{booking_id}/history", description="Status history of a booking (its user or stadium managers)")
+async def booking_history(
+        booking_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> List[BookingEventResponse]:
+    booking = await dao.booking._get_by_id(booking_id)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found or access denied")
+    if booking.user_id != user.id:
+        await get_managed_stadium(booking.stadium_id, user, dao)
+    return await dao.booking_events.get_by_booking(booking_id)
+
+
 @booking_router.post("/", description="Create new booking")
 async def booking_create(
         data: BookingCreate,
@@ -49,20 +168,27 @@ async def booking_create(
 @booking_router.put("/{booking_id}/cancel", description="Cancel booking")
 async def booking_cancel(
         booking_id: int,
+        response: Response,
+        if_match: Optional[Set[int]] = Depends(if_match_versions),
         user: UserResponse = Depends(get_current_user),
         dao: HolderDao = Depends(dao_provider)
 ):
-    booking = await dao.booking.update_status(booking_id=booking_id, status=BookingStatus.CANCELLED, user_id=user.id)
+    booking = await dao.booking.update_status(booking_id=booking_id, status=BookingStatus.CANCELLED,
+                                              user_id=user.id, if_match=if_match)
+    response.headers["ETag"] = version_etag(booking.version)
     return booking
 
 
 @booking_router.put("/{booking_id}/confirm", description="Confirm booking")
 async def booking_confirm_user(
         booking_id: int,
+        response: Response,
+        if_match: Optional[Set[int]] = Depends(if_match_versions),
         user: UserResponse = Depends(get_current_user),
         dao: HolderDao = Depends(dao_provider)
 ):
-    booking = await dao.booking.confirm_booking(booking_id=booking_id, user_id=user.id)
+    booking = await dao.booking.confirm_booking(booking_id=booking_id, user_id=user.id, if_match=if_match)
+    response.headers["ETag"] = version_etag(booking.version)
     return booking
 
 
@@ -0,0 +1,82 @@
+"""
+Streaming CSV / NDJSON exports of bookings and users.
+
+Access is checked on the request's session; rows are then streamed from a
+server-side cursor on a session of their own, so exports of any size run in
+constant memory.
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.controllers.stadium_image import get_managed_stadium
+from app.api.dependencies import get_current_user, dao_provider
+from app.api.dependencies.authentication import get_admin_user
+from app.api.dependencies.database import pool_provider
+from app.dto import User
+from app.dto.user import UserResponse
+from app.infrastructure.database.dao.holder import HolderDao
+from app.infrastructure.database.models.booking import BookingStatus
+from app.infrastructure.export import EXPORT_FORMATS, stream_rows
+
+export_router = APIRouter(prefix="/api/v0")
+
+FORMAT_QUERY = Query("csv", description="csv or ndjson")
+
+
+def export_response(pool: sessionmaker, statement: Select, fmt: str, name: str) -> StreamingResponse:
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return StreamingResponse(
+        stream_rows(pool, statement, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+
+@export_router.get("/stadiums/{stadium_id}/bookings/export", description="Export a stadium's bookings")
+async def export_stadium_bookings(
+        stadium_id: int,
+        format: str = FORMAT_QUERY,
+        status: Optional[BookingStatus] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider),
+        pool: sessionmaker = Depends(pool_provider)
+) -> StreamingResponse:
+    await get_managed_stadium(stadium_id, user, dao)
+    statement = dao.booking.export_query(status=status, stadium_id=stadium_id,
+                                         start_date=start_date, end_date=end_date)
+    return export_response(pool, statement, format, f"stadium-{stadium_id}-bookings")
+
+
+@export_router.get("/admin/bookings/export", description="Export all bookings (Admin only)")
+async def export_bookings_admin(
+        format: str = FORMAT_QUERY,
+        status: Optional[BookingStatus] = None,
+        stadium_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        dao: HolderDao = Depends(dao_provider),
+        pool: sessionmaker = Depends(pool_provider),
+        admin: User = Depends(get_admin_user)
+) -> StreamingResponse:
+    statement = dao.booking.export_query(status=status, stadium_id=stadium_id, user_id=user_id,
+                                         start_date=start_date, end_date=end_date)
+    return export_response(pool, statement, format, "bookings")
+
+
+@export_router.get("/admin/users/export", description="Export all users (Admin only)")
+async def export_users_admin(
+        format: str = FORMAT_QUERY,
+        dao: HolderDao = Depends(dao_provider),
+        pool: sessionmaker = Depends(pool_provider),
+        admin: User = Depends(get_admin_user)
+) -> StreamingResponse:
+    return export_response(pool, dao.user.export_query(), format, "users")
@@ -0,0 +1,71 @@
+"""
+On-demand image renditions.
+
+Any stored original can be requested at an allowed width and format. The first
+request renders it in the image process pool and keeps it in the disk LRU cache;
+concurrent requests for the same rendition wait for that one render. Renditions
+are addressed by content hash, so they never change and are cached immutably.
+"""
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+
+from app.api.dependencies.conditional import etag_matches
+from app.api.dependencies.media import media_store, resize_cache
+from app.infrastructure.media import image_processor, SingleFlight
+from app.infrastructure.media.images import render_resized, ImageProcessingError
+from app.infrastructure.media.serving import MediaFileResponse, IMMUTABLE_CACHE_CONTROL
+
+RESIZE_WIDTHS = (160, 320, 480, 640, 800, 1024, 1280, 1600, 1920)
+RESIZE_FORMATS = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+media_router = APIRouter(prefix="/api/v0/media")
+
+_renders = SingleFlight()
+
+
+def resize_url(content_hash: str, width: int, fmt: str) -> str:
+    return f"{media_router.prefix}/images/{content_hash}?width={width}&format={fmt}"
+
+
+async def render_into_cache(content_hash: str, key: str, width: int, fmt: str):
+    source = await asyncio.to_thread(media_store.original_path, content_hash)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    try:
+        size = await image_processor.run(render_resized, str(source), str(resize_cache.path(key)), width, fmt)
+    except ImageProcessingError:
+        raise HTTPException(status_code=500, detail="Failed to render image")
+    resize_cache.add(key, size)
+    return resize_cache.path(key)
+
+
+@media_router.get("/images/{content_hash}", description="Get a stored image at an allowed width and format")
+async def get_resized_image(
+        request: Request,
+        content_hash: str = Path(..., pattern="^[0-9a-f]{64}$"),
+        width: int = Query(...),
+        fmt: str = Query("webp", alias="format")
+):
+    if width not in RESIZE_WIDTHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid width. Allowed: {', '.join(map(str, RESIZE_WIDTHS))}"
+        )
+    if fmt not in RESIZE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Allowed: {', '.join(RESIZE_FORMATS)}"
+        )
+
+    # A rendition never changes, so its key is a strong validator
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{content_hash[:16]}-{width}.{fmt}"'}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    key = f"{content_hash[:2]}/{content_hash}/{width}.{fmt}"
+    path = resize_cache.get(key)
+    if path is None:
+        path = await _renders.run(key, lambda: render_into_cache(content_hash, key, width, fmt))
+    return MediaFileResponse(path, media_type=RESIZE_FORMATS[fmt], headers=headers)
@@ -9,80 +9,84 @@ Main router for stadium controller
 
 """
 import asyncio
-import uuid
-from datetime import datetime, date
-from pathlib import Path
+from datetime import datetime, date, timedelta
 from typing import List
 
-import aiofiles
-from PIL import Image
 from app import dto
 from app.api.dependencies import get_current_user, dao_provider
 from app.api.dependencies.authentication import get_admin_user
-from app.api.dependencies.settings import BASE_DIR
+from app.api.dependencies.conditional import ConditionalGet, if_match_versions, version_etag
 from app.dto import User
+from app.api.controllers.stadium_image import get_managed_stadium
+from app.dto.booking import AdminBookingListResponse, BookingResponse, BookingEventResponse
 from app.dto.stadium2 import StadiumUpdate, StadiumCreate
 from app.dto.user import UserResponse
 from app.infrastructure.database.dao.holder import HolderDao
+from app.infrastructure.database.models.booking import BookingStatus
 from app.infrastructure.database.models.user import UserRole
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from typing import Optional
-from fastapi.responses import FileResponse
-
-MEDIA_DIR = BASE_DIR / 'media'
-STADIUM_MEDIA_DIR = MEDIA_DIR / 'stadiums'
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
-IMAGE_SIZES = {
-    'thumbnail': (300, 200),
-    'medium': (800, 600),
-    'large': (1200, 800)
-}
+from app.infrastructure.scheduling.broadcast import availability_hub, sse_frame
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Optional, Set
+from fastapi.responses import StreamingResponse
+
+SSE_HEARTBEAT_SECONDS = 15
 
 stadium_router = APIRouter(prefix="/api/v0/stadiums")
 admin_router = APIRouter(prefix="/api/v0/admin")
 
 
-@admin_router.get("/stadiums", description="List all stadiums created by admin")
-async def admin_stadium_list(
+@stadium_router.get("/", description="List all stadiums", dependencies=[Depends(ConditionalGet("list"))])
+async def stadium_list(
         skip: int = 0,
         limit: int = 10,
         district: Optional[str] = Query(None),
         surface: Optional[str] = Query(None),
         size: Optional[str] = Query(None),
         dao: HolderDao = Depends(dao_provider)
-):
+) -> List[dto.StadiumListItemResponse]:
     if district or surface or size:
         stadiums = await dao.stadium.search(district=district, surface=surface, size=size, skip=skip, limit=limit)
     else:
         stadiums = await dao.stadium._get_all(skip=skip, limit=limit)
-    return stadiums
 
+    covers = await dao.image.get_covers([stadium.id for stadium in stadiums])
+    items = []
+    for stadium in stadiums:
+        item = dto.StadiumListItemResponse.model_validate(stadium)
+        if stadium.id in covers:
+            item.cover_image = dto.ImagePreviewDTO.model_validate(covers[stadium.id])
+        items.append(item)
+    return items
 
-@stadium_router.get("/", description="List all stadiums")
-async def stadium_list(
-        skip: int = 0,
-        limit: int = 10,
+
+@stadium_router.get("/trending", description="Get stadiums trending this week, overall or in a district")
+async def stadium_trending(
         district: Optional[str] = Query(None),
-        surface: Optional[str] = Query(None),
-        size: Optional[str] = Query(None),
+        limit: int = Query(10, ge=1, le=50),
         dao: HolderDao = Depends(dao_provider)
-):
-    if district or surface or size:
-        stadiums = await dao.stadium.search(district=district, surface=surface, size=size, skip=skip, limit=limit)
-    else:
-        stadiums = await dao.stadium._get_all(skip=skip, limit=limit)
-    return stadiums
+) -> List[dto.TrendingStadiumResponse]:
+    items = []
+    for stadium, score in await dao.stats.get_trending(district, limit):
+        item = dto.TrendingStadiumResponse.model_validate(stadium)
+        item.trending_score = round(score, 2)
+        items.append(item)
+    return items
 
 
-@stadium_router.get("/{stadium_id}", description="Get stadium by ID")
+@stadium_router.get("/{stadium_id}", description="Get stadium by ID",
+                    dependencies=[Depends(ConditionalGet("stadium"))])
 async def stadium_detail(
         stadium_id: int,
+        response: Response,
         dao: HolderDao = Depends(dao_provider)
-) -> dto.StadiumResponse:
-    stadium = await dao.stadium._get_by_id(stadium_id)
+) -> dto.StadiumDetailResponse:
+    stadium = await dao.stadium.get_with_images(stadium_id)
     if not stadium:
         raise HTTPException(status_code=404, detail="Stadium not found")
+    if "etag" not in response.headers:
+        # Redis didn't know the version yet; next time ConditionalGet can answer
+        response.headers["ETag"] = version_etag(stadium.version)
+        await dao.stadium.remember_version(stadium)
     return stadium
 
 
@@ -103,10 +107,13 @@ async def stadium_create(
 async def stadium_update(
         stadium_id: int,
         data: StadiumUpdate,
+        response: Response,
+        if_match: Optional[Set[int]] = Depends(if_match_versions),
         user: UserResponse = Depends(get_current_user),
         dao: HolderDao = Depends(dao_provider)
 ):
-    stadium = await dao.stadium.update(stadium_id=stadium_id, stadium_data=data, owner_id=user.id)
+    stadium = await dao.stadium.update(stadium_id=stadium_id, stadium_data=data, user=user, if_match=if_match)
+    response.headers["ETag"] = version_etag(stadium.version)
     return stadium
 
 
@@ -121,13 +128,14 @@ async def stadium_delete(
     if not stadium or (stadium.owner_id != user.id and user.role != UserRole.ADMIN):
         raise HTTPException(status_code=404, detail="Stadium not found or access denied")
 
-    success = await dao.stadium._delete(stadium_id)
+    success = await dao.stadium.delete(stadium_id)
     if not success:
         raise HTTPException(status_code=404, detail="Stadium not found")
     return {"message": "Stadium deleted successfully"}
 
 
-@stadium_router.get("/{stadium_id}/availability/daily", description="Get stadium daily availability")
+@stadium_router.get("/{stadium_id}/availability/daily", description="Get stadium daily availability",
+                    dependencies=[Depends(ConditionalGet("availability"))])
 async def stadium_daily_availability(
         stadium_id: int,
         dao: HolderDao = Depends(dao_provider)
@@ -136,7 +144,22 @@ async def stadium_daily_availability(
     return availability
 
 
-@stadium_router.get("/{stadium_id}/availability/hourly", description="Get stadium hourly availability")
+@stadium_router.get("/{stadium_id}/availability/calendar", description="Get stadium occupancy heatmap for a date range",
+                    dependencies=[Depends(ConditionalGet("availability"))])
+async def stadium_calendar_availability(
+        stadium_id: int,
+        start_date: Optional[date] = Query(None, description="First day (YYYY-MM-DD), defaults to today"),
+        end_date: Optional[date] = Query(None, description="Last day (YYYY-MM-DD), defaults to start_date + 29 days"),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumCalendarResponse:
+    start_date = start_date or date.today()
+    end_date = end_date or start_date + timedelta(days=29)
+    availability = await dao.stadium.get_calendar_availability(stadium_id, start_date, end_date)
+    return availability
+
+
+@stadium_router.get("/{stadium_id}/availability/hourly", description="Get stadium hourly availability",
+                    dependencies=[Depends(ConditionalGet("availability"))])
 async def stadium_hourly_availability(
         stadium_id: int,
         target_date: date = Query(..., description="Date to check availability (YYYY-MM-DD)"),
@@ -146,22 +169,110 @@ async def stadium_hourly_availability(
     return availability
 
 
-def validate_image_file(file: UploadFile) -> None:
-    """Validate uploaded image file"""
-    if not file.filename:
-        raise HTTPException(
-            status_code=400,
-            detail="No file provided"
-        )
+@stadium_router.get("/{stadium_id}/availability/free-windows", description="Get free time windows for a date",
+                    dependencies=[Depends(ConditionalGet("availability"))])
+async def stadium_free_windows(
+        stadium_id: int,
+        target_date: date = Query(..., description="Date to check availability (YYYY-MM-DD)"),
+        min_minutes: int = Query(0, ge=0, description="Only return windows at least this long"),
+        dao: HolderDao = Depends(dao_provider)
+):
+    return await dao.stadium.get_free_windows(stadium_id, target_date, min_minutes)
 
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
+
+@stadium_router.get("/{stadium_id}/availability/stream",
+                    description="Live availability updates for a date (Server-Sent Events)")
+async def stadium_availability_stream(
+        request: Request,
+        stadium_id: int,
+        target_date: date = Query(..., description="Date to watch (YYYY-MM-DD)"),
+        dao: HolderDao = Depends(dao_provider)
+):
+    # Subscribe before taking the snapshot so no change falls between the two
+    subscriber = availability_hub.subscribe(stadium_id, target_date)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many live subscribers, poll instead",
+                            headers={"Retry-After": "5"})
+    try:
+        snapshot = await dao.stadium.get_hourly_availability(stadium_id, target_date)
+    except Exception:
+        availability_hub.unsubscribe(subscriber)
+        raise
+
+    async def event_stream():
+        try:
+            yield sse_frame("snapshot", snapshot.model_dump_json())
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    frame = b": ping\n\n"
+                yield frame
+        finally:
+            availability_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@stadium_router.get("/{stadium_id}/bookings/events", description="Audit log of the stadium's bookings (owner only)")
+async def stadium_booking_events(
+        stadium_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = Query(100, ge=1, le=1000),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> List[BookingEventResponse]:
+    await get_managed_stadium(stadium_id, user, dao)
+    return await dao.booking_events.get_by_stadium(stadium_id, since=since, until=until, skip=skip, limit=limit)
 
 
+@stadium_router.get("/{stadium_id}/schedule", description="Get stadium opening schedule",
+                    dependencies=[Depends(ConditionalGet("stadium"))])
+async def stadium_schedule(
+        stadium_id: int,
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumScheduleResponse:
+    return await dao.stadium.get_schedule(stadium_id)
+
+
+@stadium_router.put("/{stadium_id}/schedule", description="Replace stadium weekly opening schedule")
+async def stadium_schedule_update(
+        stadium_id: int,
+        data: dto.StadiumScheduleUpdate,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumScheduleResponse:
+    return await dao.stadium.set_weekly_schedule(stadium_id, data, user)
+
+
+@stadium_router.put("/{stadium_id}/schedule/exceptions", description="Set opening hours for a single date")
+async def stadium_schedule_exception_set(
+        stadium_id: int,
+        data: dto.ScheduleException,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumScheduleResponse:
+    return await dao.stadium.set_schedule_exception(stadium_id, data, user)
+
+
+@stadium_router.delete("/{stadium_id}/schedule/exceptions/{exception_date}",
+                       description="Remove a date exception from the schedule")
+async def stadium_schedule_exception_delete(
+        stadium_id: int,
+        exception_date: date,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> dto.StadiumScheduleResponse:
+    return await dao.stadium.delete_schedule_exception(stadium_id, exception_date, user)
+
 
 # Admin Stadium Routes
 @admin_router.get("/stadiums")
@@ -185,7 +296,7 @@ async def get_all_stadiums_admin(
     total_count = await dao.stadium.count_with_filters(search=search, status=status)
 
     return {
-        "stadiums": stadiums,
+        "stadiums": [dto.StadiumResponse.model_validate(stadium) for stadium in stadiums],
         "total": total_count,
         "page": skip // limit + 1,
         "pages": (total_count + limit - 1) // limit
@@ -218,30 +329,20 @@ async def create_stadium_admin(
 async def update_stadium_admin(
         stadium_id: int,
         stadium_data: dto.StadiumUpdate,
+        response: Response,
+        if_match: Optional[Set[int]] = Depends(if_match_versions),
         dao: HolderDao = Depends(dao_provider),
         admin: User = Depends(get_admin_user)
 ):
     """
     Update stadium (Admin only)
     """
-    stadium = await dao.stadium._get_by_id(stadium_id)
-    if not stadium:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Stadium {stadium_id} not found"
-        )
-
-    try:
-        updated_stadium = await dao.stadium.update(stadium_id, stadium_data)
-        return {
-            "message": "Stadium updated successfully",
-            "stadium": updated_stadium
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Error updating stadium: {str(e)}"
-        )
+    updated_stadium = await dao.stadium.update(stadium_id, stadium_data, user=admin, if_match=if_match)
+    response.headers["ETag"] = version_etag(updated_stadium.version)
+    return {
+        "message": "Stadium updated successfully",
+        "stadium": updated_stadium
+    }
 
 
 @admin_router.delete("/stadiums/{stadium_id}")
@@ -260,28 +361,10 @@ async def delete_stadium_admin(
             detail=f"Stadium {stadium_id} not found"
         )
 
-    try:
-        # Delete associated images first
-        if stadium.image:
-            image_path = Path(stadium.image)
-            stadium_dir = BASE_DIR / image_path.parent
-            if stadium_dir.exists():
-                for file_path in stadium_dir.glob("*"):
-                    if file_path.is_file():
-                        file_path.unlink()
-                if not any(stadium_dir.iterdir()):
-                    stadium_dir.rmdir()
-
-        # Delete stadium
-        await dao.stadium.delete(stadium_id)
-
-        return {"message": "Stadium deleted successfully"}
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Error deleting stadium: {str(e)}"
-        )
+    # Image files are shared by content and removed by the media garbage collector
+    # once no image references them
+    await dao.stadium.delete(stadium_id)
+    return {"message": "Stadium deleted successfully"}
 
 
 # Admin Booking Routes
@@ -289,16 +372,17 @@ async def delete_stadium_admin(
 async def get_all_bookings_admin(
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=1000),
-        status: Optional[str] = None,
+        status: Optional[BookingStatus] = None,
         stadium_id: Optional[int] = None,
         user_id: Optional[int] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         dao: HolderDao = Depends(dao_provider),
         admin: User = Depends(get_admin_user)
-):
+) -> AdminBookingListResponse:
     """
-    Get all bookings with advanced filtering (Admin only)
+    Get all bookings with advanced filtering (Admin only).
+    Very large totals are estimates, flagged by total_is_exact.
     """
     bookings = await dao.booking.get_all_with_filters(
         skip=skip,
@@ -309,7 +393,7 @@ async def get_all_bookings_admin(
         start_date=start_date,
         end_date=end_date
     )
-    total_count = await dao.booking.count_with_filters(
+    total_count, is_exact = await dao.booking.count_with_filters(
         status=status,
         stadium_id=stadium_id,
         user_id=user_id,
@@ -317,12 +401,13 @@ async def get_all_bookings_admin(
         end_date=end_date
     )
 
-    return {
-        "bookings": bookings,
-        "total": total_count,
-        "page": skip // limit + 1,
-        "pages": (total_count + limit - 1) // limit
-    }
+    return AdminBookingListResponse(
+        bookings=[BookingResponse.model_validate(booking) for booking in bookings],
+        total=total_count,
+        total_is_exact=is_exact,
+        page=skip // limit + 1,
+        pages=(total_count + limit - 1) // limit
+    )
 
 
 @admin_router.get("/bookings/{booking_id}")
@@ -382,22 +467,8 @@ async def cancel_booking_admin(
     """
     Cancel/Delete booking (Admin only)
     """
-    booking = await dao.booking._get_by_id(booking_id)
-    if not booking:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Booking {booking_id} not found"
-        )
-
-    try:
-        await dao.booking.cancel(booking_id)
-        return {"message": "Booking cancelled successfully"}
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Error cancelling booking: {str(e)}"
-        )
+    await dao.booking.cancel(booking_id, actor_id=admin.id)
+    return {"message": "Booking cancelled successfully"}
 
 
 @admin_router.get("/stats/dashboard")
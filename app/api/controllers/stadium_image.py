@@ -0,0 +1,276 @@
+"""
+Stadium image upload and management.
+
+Uploads are copied to disk in chunks (size limit enforced while copying) and hashed
+on the way. Content that is already stored is reused as is; new content is decoded
+once in the image process pool to reject broken files and published to the
+content-addressed media store; the same pass computes the placeholder and dominant
+colour that stadium responses carry inline. Sizes are rendered on demand by the
+media router.
+"""
+import asyncio
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+
+from app.api.controllers.media import resize_url
+from app.api.dependencies import get_current_user, dao_provider
+from app.api.dependencies.media import media_store
+from app.api.dependencies.settings import MEDIA_DIR
+from app.dto.stadium2 import (ImageUploadResponseDTO, MultipleImageUploadResponseDTO, StadiumImagesResponseDTO,
+                              ImageResponseDTO, ImageDeleteResponseDTO, SetPrimaryImageResponseDTO)
+from app.dto.user import UserResponse
+from app.infrastructure.database.dao.holder import HolderDao
+from app.infrastructure.database.models.stadium import MediaObjectModel
+from app.infrastructure.media import image_processor, save_upload, SingleFlight
+from app.infrastructure.media.images import inspect_image, ImageProcessingError
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_FILES_PER_UPLOAD = 10
+MULTIPART_OVERHEAD = 64 * 1024
+ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+IMAGE_SIZES = {  # Widths from the media router's allow-list
+    'thumbnail': 320,
+    'medium': 800,
+    'large': 1280
+}
+
+stadium_image_router = APIRouter(prefix="/api/v0/stadiums")
+
+
+def validate_image_file(file: UploadFile) -> None:
+    """Validate uploaded image file"""
+    if not file.filename:
+        raise HTTPException(
+            status_code=400,
+            detail="No file provided"
+        )
+
+    file_ext = Path(file.filename).suffix.lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+
+def check_content_length(request: Request, max_files: int) -> None:
+    """Refuse obviously oversized bodies before the multipart parser spools them"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            int(content_length) > max_files * (MAX_FILE_SIZE + MULTIPART_OVERHEAD):
+        raise HTTPException(status_code=413, detail="Request body too large")
+
+
+def legacy_image_dir(url: str) -> Path:
+    """Per-image directory used before the content-addressed store"""
+    return MEDIA_DIR / Path(url).relative_to("/media").parent
+
+
+# Uploads being stored in this worker by content hash; identical uploads share one
+_stores = SingleFlight()
+
+
+async def store_object(dao: HolderDao, db_lock: asyncio.Lock, content_hash: str, staging_dir: Path,
+                       original: str, size: int) -> None:
+    try:
+        details = await image_processor.run(inspect_image, str(staging_dir / original))
+        async with db_lock:
+            # Published under the media row's lock, so the garbage collector can't remove it meanwhile
+            await dao.media.register(
+                content_hash, original, size, **details,
+                store=lambda: asyncio.to_thread(media_store.publish, staging_dir, content_hash)
+            )
+    except BaseException:
+        await asyncio.to_thread(media_store.discard, staging_dir)
+        raise
+
+
+async def store_upload(file: UploadFile, dao: HolderDao, db_lock: Optional[asyncio.Lock] = None) -> MediaObjectModel:
+    """
+    Store one upload, processing it only if its content is not stored yet.
+    Concurrent calls sharing a session must pass the same db_lock.
+    """
+    db_lock = db_lock or asyncio.Lock()
+    validate_image_file(file)
+    staging_dir = media_store.new_staging_dir()
+    original = f"original{Path(file.filename).suffix.lower()}"
+    size, content_hash = await save_upload(file, staging_dir / original, MAX_FILE_SIZE)
+
+    async with db_lock:
+        media = await dao.media.get_by_hash(content_hash)
+    if media is not None:
+        await asyncio.to_thread(media_store.discard, staging_dir)
+        return media
+
+    try:
+        await _stores.run(
+            content_hash, lambda: store_object(dao, db_lock, content_hash, staging_dir, original, size)
+        )
+    except ImageProcessingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        # Gone already unless another upload of the same content did the storing
+        await asyncio.to_thread(media_store.discard, staging_dir)
+    async with db_lock:
+        media = await dao.media.get_by_hash(content_hash)
+    if media is None:
+        # Registered by the upload that did the storing, then collected within the grace period
+        raise HTTPException(status_code=409, detail="Image storage changed, please retry the upload")
+    return media
+
+
+def media_urls(media: MediaObjectModel) -> Tuple[str, dict]:
+    """(primary url, variant urls) of a stored object"""
+    variants = {
+        name: {fmt: resize_url(media.content_hash, width, fmt) for fmt in ("jpeg", "webp")}
+        for name, width in IMAGE_SIZES.items()
+    }
+    return variants["large"]["jpeg"], variants
+
+
+async def create_image(dao: HolderDao, stadium_id: int, media: MediaObjectModel, alt_text: Optional[str],
+                       is_primary: bool):
+    url, variants = media_urls(media)
+    return await dao.image.create(
+        stadium_id, url, variants,
+        content_hash=media.content_hash,
+        placeholder=media.placeholder,
+        dominant_color=media.dominant_color,
+        alt_text=alt_text,
+        is_primary=is_primary
+    )
+
+
+async def get_managed_stadium(stadium_id: int, user: UserResponse, dao: HolderDao):
+    stadium = await dao.stadium._get_by_id(stadium_id)
+    if not stadium:
+        raise HTTPException(status_code=404, detail="Stadium not found")
+    await dao.stadium._ensure_can_manage(stadium, user)
+    return stadium
+
+
+@stadium_image_router.post("/{stadium_id}/images", description="Upload a stadium image")
+async def upload_stadium_image(
+        request: Request,
+        stadium_id: int,
+        file: UploadFile = File(...),
+        is_primary: bool = Form(False),
+        alt_text: Optional[str] = Form(None, max_length=255),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> ImageUploadResponseDTO:
+    check_content_length(request, 1)
+    await get_managed_stadium(stadium_id, user, dao)
+
+    media = await store_upload(file, dao)
+    image = await create_image(dao, stadium_id, media, alt_text, is_primary)
+    return ImageUploadResponseDTO(
+        message="Image uploaded successfully",
+        image_id=image.id,
+        url=image.url,
+        is_primary=image.is_primary,
+        stadium_id=stadium_id
+    )
+
+
+@stadium_image_router.post("/{stadium_id}/images/bulk", description="Upload several stadium images")
+async def upload_stadium_images(
+        request: Request,
+        stadium_id: int,
+        files: List[UploadFile] = File(...),
+        primary_index: Optional[int] = Form(None, ge=0),
+        alt_texts: Optional[List[str]] = Form(None),
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> MultipleImageUploadResponseDTO:
+    check_content_length(request, MAX_FILES_PER_UPLOAD)
+    if len(files) > MAX_FILES_PER_UPLOAD:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_FILES_PER_UPLOAD} files per upload")
+    await get_managed_stadium(stadium_id, user, dao)
+
+    # Storing runs concurrently; image rows are written in order afterwards
+    db_lock = asyncio.Lock()
+    results = await asyncio.gather(
+        *(store_upload(file, dao, db_lock) for file in files),
+        return_exceptions=True
+    )
+
+    uploaded, failed = [], []
+    for index, (file, result) in enumerate(zip(files, results)):
+        if isinstance(result, HTTPException):
+            failed.append({"filename": file.filename, "error": result.detail})
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        alt_text = alt_texts[index] if alt_texts and index < len(alt_texts) else None
+        image = await create_image(dao, stadium_id, result, alt_text, index == primary_index)
+        uploaded.append(ImageUploadResponseDTO(
+            message="Image uploaded successfully",
+            image_id=image.id,
+            url=image.url,
+            is_primary=image.is_primary,
+            stadium_id=stadium_id
+        ))
+
+    return MultipleImageUploadResponseDTO(
+        message=f"Uploaded {len(uploaded)} of {len(files)} images",
+        stadium_id=stadium_id,
+        total_uploaded=len(uploaded),
+        uploaded_images=uploaded,
+        failed_uploads=failed
+    )
+
+
+@stadium_image_router.get("/{stadium_id}/images", description="List stadium images")
+async def list_stadium_images(
+        stadium_id: int,
+        dao: HolderDao = Depends(dao_provider)
+) -> StadiumImagesResponseDTO:
+    stadium = await dao.stadium._get_by_id(stadium_id)
+    if not stadium:
+        raise HTTPException(status_code=404, detail="Stadium not found")
+
+    images = [ImageResponseDTO.model_validate(image) for image in await dao.image.get_by_stadium(stadium_id)]
+    return StadiumImagesResponseDTO(
+        stadium_id=stadium_id,
+        stadium_name=stadium.name,
+        total_images=len(images),
+        primary_image=next((image.url for image in images if image.is_primary), None),
+        images=images
+    )
+
+
+@stadium_image_router.put("/{stadium_id}/images/{image_id}/primary", description="Set primary stadium image")
+async def set_primary_stadium_image(
+        stadium_id: int,
+        image_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> SetPrimaryImageResponseDTO:
+    await get_managed_stadium(stadium_id, user, dao)
+    if not await dao.image.get_for_stadium(stadium_id, image_id):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    await dao.image.set_primary(stadium_id, image_id)
+    return SetPrimaryImageResponseDTO(message="Primary image updated", image_id=image_id, stadium_id=stadium_id)
+
+
+@stadium_image_router.delete("/{stadium_id}/images/{image_id}", description="Delete stadium image")
+async def delete_stadium_image(
+        stadium_id: int,
+        image_id: int,
+        user: UserResponse = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)
+) -> ImageDeleteResponseDTO:
+    await get_managed_stadium(stadium_id, user, dao)
+    image = await dao.image.get_for_stadium(stadium_id, image_id)
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    await dao.image.delete(image)
+    if image.content_hash is None:
+        await asyncio.to_thread(shutil.rmtree, legacy_image_dir(image.url), True)
+    return ImageDeleteResponseDTO(message="Image deleted successfully", deleted_image_id=image_id)
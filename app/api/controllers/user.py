@@ -29,10 +29,14 @@
     Returns:
         _type_: _description_
 """
+import asyncio
+import shutil
+import uuid
+from pathlib import Path
 from typing import Annotated
 
 import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBasic, HTTPBasicCredentials, OAuth2PasswordRequestForm
 from sqlalchemy.exc import IntegrityError
 
@@ -43,10 +47,29 @@ from app import dto
 from app.config import Settings
 
 import os
-from app.api.dependencies.settings import BASE_DIR, get_redis_connection
+from app.api.dependencies.settings import BASE_DIR, MEDIA_DIR, get_redis_connection
+from app.api.controllers.stadium_image import MAX_FILE_SIZE, check_content_length, validate_image_file
+from app.infrastructure.media import image_processor, save_upload
+from app.infrastructure.media.images import render_avatar, ImageProcessingError
 from redis import asyncio as redis_asyncio
 
-# TODO 1. Save user profile image in the local directory
+AVATAR_DIR = MEDIA_DIR / "avatars"
+AVATAR_SIZES = (64, 128, 256)
+
+
+def avatar_dir(url: str) -> Path:
+    return MEDIA_DIR / Path(url).relative_to("/media").parent
+
+
+def publish_avatar(staging_dir: Path, original: Path, photo_dir: Path) -> None:
+    original.unlink()
+    photo_dir.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        staging_dir.rename(photo_dir)
+    except OSError:
+        # Same photo uploaded again
+        if not photo_dir.is_dir():
+            raise
 
 # FOR ACTIONS RUNNER
 router = APIRouter(
@@ -74,10 +97,7 @@ async def create_user(
         hashed_password = auth.get_password_hash(user_data.password)
         user_data.password = hashed_password
         new_user = await dao.user.add_user(user_data=user_data)
-        profile = await dao.profile.get_by_id(new_user.id)
-
-        if profile is None:
-            user_profile = await dao.profile.create_profile(user_id=new_user.id)
+        await dao.profile.create_profile(user_id=new_user.id)
         return new_user
 
     except ValueError as err:
@@ -121,7 +141,8 @@ async def delete_user(
 
 @router.patch(
     path='/profile/edit',
-    description='Edit profile'
+    description='Edit profile',
+    response_model=dto.ProfileOut
 )
 async def edit_profile(
         profile_data: dto.ProfileBase,
@@ -140,11 +161,44 @@ async def get_profile(
         user: dto.user = Depends(get_current_user),
         dao: HolderDao = Depends(dao_provider)):
     profile = await dao.profile.get_profile_by_user(user.id) or await dao.profile.create_profile(user.id)
-    print(profile.user.phone_number)
-    print(profile.user.is_active)
     return profile
 
 
+@router.post(
+    path='/profile/photo',
+    description='Upload profile photo',
+    response_model=dto.ProfileOut)
+async def upload_profile_photo(
+        request: Request,
+        file: UploadFile = File(...),
+        user: dto.user = Depends(get_current_user),
+        dao: HolderDao = Depends(dao_provider)):
+    check_content_length(request, 1)
+    validate_image_file(file)
+    staging_dir = AVATAR_DIR / ".staging" / uuid.uuid4().hex
+    original = staging_dir / f"original{Path(file.filename).suffix.lower()}"
+    try:
+        _, content_hash = await save_upload(file, original, MAX_FILE_SIZE)
+        try:
+            names = await image_processor.run(render_avatar, str(original), str(staging_dir), AVATAR_SIZES)
+        except ImageProcessingError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Only the thumbnails are kept; the name changes with the content so clients never see a stale photo
+        photo_dir = AVATAR_DIR / str(user.id) / content_hash[:16]
+        await asyncio.to_thread(publish_avatar, staging_dir, original, photo_dir)
+    finally:
+        await asyncio.to_thread(shutil.rmtree, staging_dir, True)
+
+    url_prefix = f"/media/{photo_dir.relative_to(MEDIA_DIR).as_posix()}"
+    thumbnails = {str(size): f"{url_prefix}/{name}" for size, name in names.items()}
+    previous = await dao.profile.set_photo(user.id, thumbnails[str(max(AVATAR_SIZES))], thumbnails)
+    if previous:
+        previous_dir = avatar_dir(next(iter(previous.values())))
+        if previous_dir != photo_dir:
+            await asyncio.to_thread(shutil.rmtree, previous_dir, True)
+    return await dao.profile.get_profile_by_user(user.id)
+
+
 from pydantic import BaseModel
 
 
@@ -1,11 +1,24 @@
+import asyncio
+
 from fastapi import FastAPI
 from sqlalchemy.orm import sessionmaker
-from starlette.staticfiles import StaticFiles
 
 from app.api.dependencies.authentication import AuthProvider, get_current_user
-from app.api.dependencies.database import DbProvider, dao_provider
-from app.api.dependencies.settings import get_settings
+from app.api.dependencies.database import DbProvider, dao_provider, pool_provider
+from app.api.dependencies.media import media_gc, resize_cache
+from app.api.dependencies.settings import get_settings, get_redis_connection, MEDIA_DIR
 from app.config import Settings, load_config
+from app.infrastructure.audit import booking_events
+from app.infrastructure.cache.aggregator import RollupAggregator
+from app.infrastructure.cache.reconcile import StatsReconciler
+from app.infrastructure.media import image_processor
+from app.infrastructure.media.serving import MediaFiles
+from app.infrastructure.scheduling.broadcast import availability_hub
+from app.infrastructure.scheduling.offers import OfferSweeper
+
+stats_reconciler = StatsReconciler()
+rollup_aggregator = RollupAggregator()
+offer_sweeper = OfferSweeper()
 
 
 def setup(app: FastAPI, pool: sessionmaker, settings: Settings) -> None:
@@ -17,7 +30,44 @@ def setup(app: FastAPI, pool: sessionmaker, settings: Settings) -> None:
     db_provider = DbProvider(pool=pool)
     auth_provider = AuthProvider(settings=settings)
     app.dependency_overrides[dao_provider] = db_provider.dao
+    app.dependency_overrides[pool_provider] = db_provider.session_pool
     # app.dependency_overrides[get_current_user] = auth_provider.get_current_user
     app.dependency_overrides[get_settings] = load_config
-    app.mount("/media", StaticFiles(directory="app/media"), name="media")
+    app.mount("/media", MediaFiles(directory=MEDIA_DIR), name="media")
+
+    async def start_availability_hub():
+        await availability_hub.start(await get_redis_connection())
+
+    async def start_media_gc():
+        await media_gc.start(pool)
+
+    async def start_stats_reconciler():
+        await stats_reconciler.start(pool)
+
+    async def start_rollup_aggregator():
+        await rollup_aggregator.start(pool)
+
+    async def start_booking_events():
+        await booking_events.start(pool)
+
+    async def start_offer_sweeper():
+        await offer_sweeper.start(pool)
+
+    async def load_resize_cache():
+        await asyncio.to_thread(resize_cache.load)
+
+    app.add_event_handler("startup", start_availability_hub)
+    app.add_event_handler("startup", start_media_gc)
+    app.add_event_handler("startup", load_resize_cache)
+    app.add_event_handler("startup", start_stats_reconciler)
+    app.add_event_handler("startup", start_rollup_aggregator)
+    app.add_event_handler("startup", start_booking_events)
+    app.add_event_handler("startup", start_offer_sweeper)
+    app.add_event_handler("shutdown", availability_hub.stop)
+    app.add_event_handler("shutdown", media_gc.stop)
+    app.add_event_handler("shutdown", stats_reconciler.stop)
+    app.add_event_handler("shutdown", rollup_aggregator.stop)
+    app.add_event_handler("shutdown", booking_events.stop)
+    app.add_event_handler("shutdown", offer_sweeper.stop)
+    app.add_event_handler("shutdown", image_processor.shutdown)
 
@@ -0,0 +1,111 @@
+import logging
+from datetime import date, datetime, time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Set
+
+from fastapi import HTTPException, Request, Response, Header
+
+from app.api.dependencies.settings import get_redis_connection
+from app.infrastructure.cache import StadiumVersions
+
+logger = logging.getLogger(__name__)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def version_etag(version: int) -> str:
+    """Strong ETag of a row's version column; what If-Match is checked against"""
+    return f'"v{version}"'
+
+
+def if_match_versions(if_match: Optional[str] = Header(None)) -> Optional[Set[int]]:
+    """
+    Dependency for conditional updates: the row versions named by If-Match, None
+    without the header or for "*". Weak and foreign tags never match (RFC 9110 13.1.1),
+    so a header naming only those leaves an empty set and the update fails with 412.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = set()
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith('"v') and tag.endswith('"') and tag[2:-1].isdigit():
+            versions.add(int(tag[2:-1]))
+    return versions
+
+
+def not_modified_since(if_modified_since: str, last_modified: int) -> bool:
+    try:
+        return parsedate_to_datetime(if_modified_since).timestamp() >= last_modified
+    except (TypeError, ValueError):
+        return False
+
+
+class ConditionalGet:
+    """
+    Dependency for cacheable stadium reads.
+
+    Builds an ETag from the Redis version counters and raises 304 when the client
+    already has it, so the endpoint (and Postgres) are never reached. Otherwise the
+    validators are added to the endpoint's response. Declare it before dao_provider.
+
+    scope:
+        "stadium"      - stadium row, schedule and images (detail); the row's version_etag
+        "availability" - stadium row + its bookings, re-keyed daily since results depend on today
+        "list"         - any stadium in listings
+    """
+
+    def __init__(self, scope: str):
+        if scope not in ("stadium", "availability", "list"):
+            raise ValueError(f"Unknown conditional GET scope: {scope}")
+        self.scope = scope
+
+    async def _validators(self, request: Request):
+        versions = StadiumVersions(await get_redis_connection())
+        if self.scope == "list":
+            data, modified = await versions.get_list()
+            return f'"l{data}.{modified}"', modified
+
+        stadium_id = int(request.path_params["stadium_id"])
+        if self.scope == "stadium":
+            version, modified = await versions.get_version(stadium_id)
+            # Unknown until the row is read or changed; the endpoint then sends version_etag itself
+            return (None, modified) if version is None else (version_etag(version), modified)
+
+        data, bookings, modified = await versions.get(stadium_id)
+        today = date.today()
+        midnight = int(datetime.combine(today, time.min).timestamp())
+        return f'"a{data}.{bookings}.{modified}.{today.toordinal()}"', max(modified, midnight)
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        try:
+            etag, last_modified = await self._validators(request)
+        except Exception as e:
+            # Redis unavailable: serve normally, just without validators
+            logger.error(f"Failed to read stadium versions: {e}")
+            return
+        if etag is None:
+            return
+
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+        if_none_match: Optional[str] = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            is_fresh = etag_matches(if_none_match, etag)
+        else:
+            if_modified_since = request.headers.get("if-modified-since")
+            is_fresh = if_modified_since is not None and not_modified_since(if_modified_since, last_modified)
+
+        if is_fresh:
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
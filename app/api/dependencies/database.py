@@ -11,6 +11,13 @@ def dao_provider() -> HolderDao:
     ...
 
 
+def pool_provider() -> sessionmaker:
+    """
+    Session factory, for work that outlives the request's session (streamed responses)
+    """
+    ...
+
+
 class DbProvider:
     def __init__(self, pool: sessionmaker):
         self.pool = pool
@@ -18,3 +25,6 @@ class DbProvider:
     async def dao(self):
         async with self.pool() as session:
             yield HolderDao(session=session)
+
+    def session_pool(self) -> sessionmaker:
+        return self.pool
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from app.api.dependencies.settings import get_redis_connection
+from app.infrastructure.cache import IdempotencyStore
+
+logger = logging.getLogger(__name__)
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+
+
+def request_scope(request: Request) -> str:
+    """Keys belong to a caller, identified by the credentials the request carries"""
+    return hashlib.sha256(request.headers.get("authorization", "").encode()).hexdigest()[:32]
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Route class honouring an Idempotency-Key header on mutating requests.
+
+    The first request with a key runs and its response (any status below 500,
+    including HTTPExceptions) is stored for a day; retries get the stored response
+    with ``Idempotent-Replayed: true``. A duplicate arriving while the first one
+    still runs waits for its result instead of running again. Reusing a key for a
+    different method, path or body is rejected with 422. Server errors release the
+    key so a retry runs again. Without Redis requests run as if no key was sent.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            key = request.headers.get("idempotency-key")
+            if key is None or request.method not in MUTATING_METHODS:
+                return await handler(request)
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise HTTPException(status_code=400,
+                                    detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+            body = await request.body()
+            fingerprint = hashlib.sha256(f"{request.method} {request.url.path}\n".encode() + body).hexdigest()
+            scope = request_scope(request)
+            try:
+                store = IdempotencyStore(await get_redis_connection())
+                record = await store.claim(scope, key, fingerprint)
+            except Exception as e:
+                logger.error(f"Failed to claim idempotency key: {e}")
+                return await handler(request)
+
+            if record is not None:
+                return await self._replay(store, scope, key, fingerprint, record)
+            return await self._run(handler, request, store, scope, key, fingerprint)
+
+        return route_handler
+
+    @staticmethod
+    async def _replay(store: IdempotencyStore, scope: str, key: str, fingerprint: str, record: dict) -> Response:
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if record["state"] == "pending":
+            record = await store.wait(scope, key)
+            if record is None:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            if record["state"] == "abandoned":
+                raise HTTPException(status_code=409, detail="The request with this Idempotency-Key failed, retry it")
+        return Response(content=record["body"], status_code=record["status"], media_type=record["media_type"],
+                        headers={"Idempotent-Replayed": "true"})
+
+    @staticmethod
+    async def _run(handler: Callable, request: Request, store: IdempotencyStore,
+                   scope: str, key: str, fingerprint: str) -> Response:
+        try:
+            response = await handler(request)
+        except HTTPException as exc:
+            if exc.status_code < 500:
+                result = (exc.status_code, json.dumps({"detail": exc.detail}), "application/json")
+            else:
+                result = None
+            await IdempotentRoute._settle(store, scope, key, fingerprint, result)
+            raise
+        except Exception:
+            await IdempotentRoute._settle(store, scope, key, fingerprint, None)
+            raise
+
+        body = getattr(response, "body", None)
+        if response.status_code < 500 and body is not None:
+            result = (response.status_code, body.decode(), response.media_type or "application/json")
+        else:
+            result = None
+        await IdempotentRoute._settle(store, scope, key, fingerprint, result)
+        return response
+
+    @staticmethod
+    async def _settle(store: IdempotencyStore, scope: str, key: str, fingerprint: str, result) -> None:
+        """Store (status, body, media_type), or release the key when there is nothing to replay"""
+        try:
+            if result is None:
+                await store.abandon(scope, key)
+            else:
+                await store.finish(scope, key, fingerprint, *result)
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response: {e}")
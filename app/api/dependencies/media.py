@@ -0,0 +1,12 @@
+from app.api.dependencies.settings import MEDIA_DIR
+from app.infrastructure.media.cache import DiskLRUCache
+from app.infrastructure.media.gc import MediaGarbageCollector
+from app.infrastructure.media.storage import ContentStore
+
+RESIZE_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+
+# Originals, served by the /media static mount
+media_store = ContentStore(MEDIA_DIR / "objects", url_prefix="/media/objects")
+# On-demand renditions of the originals, served by the media router
+resize_cache = DiskLRUCache(MEDIA_DIR / "resized", max_bytes=RESIZE_CACHE_MAX_BYTES)
+media_gc = MediaGarbageCollector(media_store, caches=[resize_cache])
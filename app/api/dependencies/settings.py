@@ -17,5 +17,16 @@ async def get_redis_connection() -> asyncio.Redis:
     return r
 
 
+async def get_redis_binary_connection() -> asyncio.Redis:
+    """Same Redis as get_redis_connection, but values come back as raw bytes"""
+    try:
+        r = asyncio.Redis(host='164.92.93.98', port=6379,
+                          decode_responses=False, db=1,
+                          password="your_secure_redis_password")
+    except asyncio.connection.ConnectionError as err:
+        raise Exception(str(err))
+    return r
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
+MEDIA_DIR = BASE_DIR / 'media'
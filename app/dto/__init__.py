@@ -9,4 +9,9 @@ from .token import Token
 from .profile import ProfileBase, ProfileOut, ProfileCreate
 from .role import RoleBase, RoleOut, RoleEdit, RoleCreate, Role
 from .stadium2 import (StadiumUpdate,StadiumBase,StadiumCreate,StadiumResponse,
-                       HourlyAvailability, WeeklyAvailability, StadiumAvailabilityResponse)
+                       HourlyAvailability, WeeklyAvailability, StadiumAvailabilityResponse,
+                       DailyOccupancy, StadiumCalendarResponse, WeekdaySchedule, ScheduleException,
+                       StadiumScheduleUpdate, StadiumScheduleResponse, ImagePreviewDTO,
+                       StadiumListItemResponse, StadiumDetailResponse, RevenueBucket, StadiumRevenueResponse,
+                       HourOccupancy, StadiumOccupancyResponse, StadiumHeatmapResponse,
+                       TrendingStadiumResponse)
@@ -1,10 +1,10 @@
-from datetime import datetime
+from datetime import datetime, date, time
 from decimal import Decimal
-from typing import Union
+from typing import Union, List, Optional
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator, root_validator
 
-from app.infrastructure.database.models.booking import BookingStatus
+from app.infrastructure.database.models.booking import BookingStatus, WaitlistStatus
 
 
 class BookingBase(BaseModel):
@@ -34,7 +34,116 @@ class BookingResponse(BookingBase):
     user_id: int
     total_price: Decimal
     status: BookingStatus
+    series_id: Optional[int] = None
+    version: int
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class AdminBookingListResponse(BaseModel):
+    bookings: List[BookingResponse]
+    total: int
+    # False when total is the query planner's estimate for a very large result
+    total_is_exact: bool
+    page: int
+    pages: int
+
+
+MAX_SERIES_OCCURRENCES = 52
+
+
+class BookingSeriesCreate(BookingCreate):
+    """First occurrence plus a weekly recurrence: a number of occurrences or a last date"""
+    interval_weeks: int = Field(1, ge=1, le=4, description="Weeks between occurrences")
+    occurrences: Optional[int] = Field(None, ge=1, le=MAX_SERIES_OCCURRENCES)
+    until: Optional[date] = Field(None, description="Last date an occurrence may start on")
+    skip_conflicts: bool = Field(False, description="Book the free occurrences instead of failing on conflicts")
+
+    @root_validator(skip_on_failure=True)
+    def validate_recurrence(cls, values):
+        if (values.get('occurrences') is None) == (values.get('until') is None):
+            raise ValueError("Exactly one of occurrences and until is required")
+        if values.get('until') is not None and values['until'] < values['start_time'].date():
+            raise ValueError("until must not be before the first occurrence")
+        return values
+
+
+class BookingSeriesUpdate(BaseModel):
+    """Applied to every upcoming active occurrence; times keep each occurrence's date"""
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    notes: Optional[str] = None
+
+    @root_validator(skip_on_failure=True)
+    def validate_times(cls, values):
+        if (values.get('start_time') is None) != (values.get('end_time') is None):
+            raise ValueError("start_time and end_time must be changed together")
+        return values
+
+
+class BookingConflict(BaseModel):
+    index: int = Field(..., description="0-based position of the booking in the request or series")
+    stadium_id: int
+    start_time: datetime
+    end_time: datetime
+    reason: str = Field(..., description="booked, held, closed, overlaps_request, stadium_not_found or "
+                                           "not_active (cancelled or expired during a series edit)")
+    booking_ids: List[int] = Field([], description="Existing bookings in the way (booked)")
+    overlaps_index: Optional[int] = Field(None, description="Earlier accepted item in the way (overlaps_request)")
+
+
+class BookingSeriesResponse(BaseModel):
+    id: int
+    stadium_id: int
+    interval_weeks: int
+    bookings: List[BookingResponse]
+    conflicts: List[BookingConflict] = []
+
+
+MAX_BULK_BOOKINGS = 200
+
+
+class BulkBookingCreate(BaseModel):
+    bookings: List[BookingCreate] = Field(..., min_length=1, max_length=MAX_BULK_BOOKINGS)
+    all_or_nothing: bool = Field(True, description="Fail on any conflict instead of booking the free items")
+
+
+class BulkBookingResponse(BaseModel):
+    bookings: List[BookingResponse]
+    conflicts: List[BookingConflict] = []
+
+
+class WaitlistJoin(BookingCreate):
+    """A taken range to wait for; notes are carried over to the booking once it is claimed"""
+
+
+class WaitlistEntryResponse(BaseModel):
+    id: int
+    stadium_id: int
+    start_time: datetime
+    end_time: datetime
+    status: WaitlistStatus
+    offered_until: Optional[datetime] = Field(None, description="Claim the offer before this time")
+    booking_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BookingEventResponse(BaseModel):
+    id: int
+    booking_id: int
+    stadium_id: int
+    actor_id: Optional[int] = Field(None, description="User who made the change; empty for system changes")
+    event: str = Field(..., description="created, updated or the new status")
+    from_status: Optional[BookingStatus] = None
+    to_status: Optional[BookingStatus] = None
+    start_time: datetime
+    end_time: datetime
+    occurred_at: datetime
+
+    class Config:
+        from_attributes = True
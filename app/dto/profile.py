@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Union, Dict, Optional
 import re
 from pydantic import field_validator, Field, EmailStr, BaseModel
 from app import dto
@@ -6,6 +6,7 @@ from . import base
 from datetime import datetime
 
 from .base import serialize_time
+from .user import User
 
 
 class ProfileBase(BaseModel):
@@ -33,3 +34,5 @@ class ProfileCreate(BaseModel):
 class ProfileOut(ProfileBase):
     id: int
     user_id: int
+    photo_thumbnails: Optional[Dict[str, str]] = None
+    user: Optional[User] = None
@@ -1,6 +1,6 @@
-from datetime import datetime, date
+from datetime import datetime, date, time
 from decimal import Decimal
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Dict
 
 from pydantic import BaseModel
 
@@ -35,6 +35,9 @@ class ImageResponseDTO(BaseModel):
     alt_text: Optional[str]
     stadium_id: int
     is_primary: bool
+    variants: Optional[Dict[str, Dict[str, str]]] = None  # {size: {"jpeg": url, "webp": url}}
+    placeholder: Optional[str] = None
+    dominant_color: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -42,6 +45,20 @@ class ImageResponseDTO(BaseModel):
         from_attributes = True
 
 
+class ImagePreviewDTO(BaseModel):
+    """Inline in stadium responses: render placeholder/colour at once, lazy-load the variants"""
+    id: int
+    url: str
+    alt_text: Optional[str] = None
+    is_primary: bool
+    variants: Optional[Dict[str, Dict[str, str]]] = None
+    placeholder: Optional[str] = None  # data:image/webp;base64,...
+    dominant_color: Optional[str] = None  # "#rrggbb"
+
+    class Config:
+        from_attributes = True
+
+
 class StadiumImagesResponseDTO(BaseModel):
     stadium_id: int
     stadium_name: str
@@ -154,6 +171,69 @@ class StadiumAvailabilityResponse(BaseModel):
     weekly_availability: List[WeeklyAvailability]
 
 
+class DailyOccupancy(BaseModel):
+    date: date
+    weekday: str
+    status: AvailabilityStatus
+    booking_count: int
+    booked_hours: float
+    occupancy_rate: float  # booked_hours / operating hours, 0.0 - 1.0
+
+
+class StadiumCalendarResponse(BaseModel):
+    stadium_id: int
+    stadium_name: str
+    start_date: date
+    end_date: date
+    days: List[DailyOccupancy]
+
+
+class RevenueBucket(BaseModel):
+    period_start: date  # First day of the day/week/month
+    revenue: Decimal
+    bookings: int
+
+
+class StadiumRevenueResponse(BaseModel):
+    stadium_id: int
+    stadium_name: str
+    period: str
+    start_date: date
+    end_date: date
+    total_revenue: Decimal
+    total_bookings: int
+    buckets: List[RevenueBucket]
+
+
+class HourOccupancy(BaseModel):
+    weekday: int  # 0 = Monday
+    hour: int
+    booked_minutes: int
+    open_minutes: int
+    occupancy_rate: float  # booked_minutes / open_minutes, 0.0 - 1.0
+
+
+class StadiumOccupancyResponse(BaseModel):
+    stadium_id: int
+    stadium_name: str
+    start_date: date
+    end_date: date
+    hours: List[HourOccupancy]
+
+
+class StadiumHeatmapResponse(BaseModel):
+    stadium_id: int
+    stadium_name: str
+    district: str
+    start_date: date
+    end_date: date
+    occupancy: List[List[float]]  # [weekday (0 = Monday)][hour], booked share 0.0 - 1.0
+    district_percentile: List[List[float]]  # Percent of district stadiums at or below, per cell
+    overall_occupancy: float
+    overall_percentile: float
+    district_stadiums: int
+
+
 class StadiumBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -169,10 +249,17 @@ class StadiumBase(BaseModel):
     amenities: Optional[str] = None
     opening_hour: str = "06:00"
     closing_hour: str = "23:00"
+    slot_minutes: int = Field(60, ge=15, le=240, description="Booking slot length in minutes")
+    availability_green_max: int = Field(2, ge=0, description="Max daily bookings shown as GREEN")
+    availability_yellow_max: int = Field(5, ge=0, description="Max daily bookings shown as YELLOW")
 
 
 class StadiumCreate(StadiumBase):
-    pass
+    @root_validator(skip_on_failure=True)
+    def validate_availability_thresholds(cls, values):
+        if values['availability_green_max'] > values['availability_yellow_max']:
+            raise ValueError("availability_green_max must not exceed availability_yellow_max")
+        return values
 
 
 class StadiumUpdate(BaseModel):
@@ -191,8 +278,19 @@ class StadiumUpdate(BaseModel):
     images: Optional[str] = None  # JSON string (not List[str])
     opening_hour: Optional[str] = None
     closing_hour: Optional[str] = None
+    slot_minutes: Optional[int] = Field(None, ge=15, le=240)
+    availability_green_max: Optional[int] = Field(None, ge=0)
+    availability_yellow_max: Optional[int] = Field(None, ge=0)
     is_active: Optional[bool] = None
 
+    @root_validator(skip_on_failure=True)
+    def validate_availability_thresholds(cls, values):
+        # Only when both are sent; StadiumDAO.update checks one against the stored other
+        green, yellow = values.get('availability_green_max'), values.get('availability_yellow_max')
+        if green is not None and yellow is not None and green > yellow:
+            raise ValueError("availability_green_max must not exceed availability_yellow_max")
+        return values
+
 
 class StadiumResponse(StadiumBase):
     id: int
@@ -204,8 +302,21 @@ class StadiumResponse(StadiumBase):
         from_attributes = True
 
 
+class StadiumListItemResponse(StadiumResponse):
+    cover_image: Optional[ImagePreviewDTO] = None
+
+
+class StadiumDetailResponse(StadiumResponse):
+    images: List[ImagePreviewDTO] = []
+    version: int
+
+
+class TrendingStadiumResponse(StadiumResponse):
+    trending_score: float = 0.0  # Confirmed bookings, halving in weight every 3.5 days
+
+
 class HourlyAvailability(BaseModel):
-    hour: str  # "09:00", "10:00", etc.
+    hour: str  # Slot start: "09:00", "09:30", etc.
     status: AvailabilityStatus  # GREEN or RED only
     is_available: bool
 
@@ -217,3 +328,70 @@ class HourlyAvailabilityResponse(BaseModel):
     hourly_availability: List[HourlyAvailability]
     total_slots: int
     available_slots: int
+    slot_minutes: int = 60
+
+
+class FreeWindow(BaseModel):
+    start: str  # "HH:MM"
+    end: str
+    minutes: int
+
+
+class FreeWindowsResponse(BaseModel):
+    stadium_id: int
+    date: date
+    slot_minutes: int
+    free_windows: List[FreeWindow]
+    longest_free_window: Optional[FreeWindow] = None
+
+
+class WeekdaySchedule(BaseModel):
+    weekday: int = Field(..., ge=0, le=6, description="0 = Monday ... 6 = Sunday")
+    opens_at: Optional[time] = None
+    closes_at: Optional[time] = Field(None, description="At or before opens_at means closing after midnight")
+    is_closed: bool = False
+
+    @root_validator(skip_on_failure=True)
+    def validate_hours(cls, values):
+        if not values.get('is_closed') and (values.get('opens_at') is None or values.get('closes_at') is None):
+            raise ValueError("opens_at and closes_at are required unless is_closed is set")
+        return values
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduleException(BaseModel):
+    date: date
+    opens_at: Optional[time] = None
+    closes_at: Optional[time] = None
+    is_closed: bool = False
+    note: Optional[str] = Field(None, max_length=255)
+
+    @root_validator(skip_on_failure=True)
+    def validate_hours(cls, values):
+        if not values.get('is_closed') and (values.get('opens_at') is None or values.get('closes_at') is None):
+            raise ValueError("opens_at and closes_at are required unless is_closed is set")
+        return values
+
+    class Config:
+        from_attributes = True
+
+
+class StadiumScheduleUpdate(BaseModel):
+    weekdays: List[WeekdaySchedule]
+
+    @validator('weekdays')
+    def validate_unique_weekdays(cls, v):
+        if len({day.weekday for day in v}) != len(v):
+            raise ValueError("Each weekday can only appear once")
+        return v
+
+
+class StadiumScheduleResponse(BaseModel):
+    stadium_id: int
+    slot_minutes: int
+    default_opening_hour: str
+    default_closing_hour: str
+    weekdays: List[WeekdaySchedule]
+    exceptions: List[ScheduleException]
@@ -0,0 +1 @@
+from .heatmap import occupancy_matrices, percentile_ranks
@@ -0,0 +1,93 @@
+"""
+Weekday x hour occupancy matrices computed with NumPy.
+
+Bookings arrive as flat int64 arrays of start/end seconds (naive timestamps read as
+UTC, so day boundaries stay where the wall clock has them) plus an owner index per
+booking, one owner per stadium. Every step is an array operation: bookings are cut
+into a first partial hour, a run of full hours and a last partial hour, scattered
+into per-hour buckets with bincount, then folded onto the 168 hours of the week.
+
+Benchmark (needs the usual app environment variables):
+    python -m app.infrastructure.analytics.heatmap
+"""
+from typing import Tuple
+
+import numpy as np
+
+HOUR = 3600
+HOURS_PER_WEEK = 7 * 24
+
+
+def occupancy_matrices(starts: np.ndarray, ends: np.ndarray, owners: np.ndarray, n_owners: int,
+                       window_start: int, window_end: int, first_weekday: int) -> np.ndarray:
+    """
+    Share (0.0 - 1.0) of each hour of the week that each owner was booked during
+    [window_start, window_end), which must be whole days. first_weekday is the weekday
+    of window_start, 0 = Monday. Returns an array of shape (n_owners, 7, 24).
+    """
+    n_hours = (window_end - window_start) // HOUR
+    width = n_hours + 1  # An end on the window boundary lands in one extra, empty column
+
+    starts = np.clip(starts, window_start, window_end) - window_start
+    ends = np.clip(ends, window_start, window_end) - window_start
+    keep = ends > starts
+    starts, ends, owners = starts[keep], ends[keep], owners[keep]
+
+    first_hour = starts // HOUR
+    last_hour = ends // HOUR
+    row = owners * width
+    same = first_hour == last_hour
+    size = n_owners * width
+
+    seconds = np.bincount(row + first_hour, weights=np.where(same, ends - starts, (first_hour + 1) * HOUR - starts),
+                          minlength=size)
+    seconds += np.bincount(row + last_hour, weights=np.where(same, 0, ends - last_hour * HOUR), minlength=size)
+    # Full hours in between: +1 after the first hour, -1 at the last one, then a running sum
+    full = last_hour - first_hour > 1
+    steps = np.bincount(row[full] + first_hour[full] + 1, minlength=size) \
+        - np.bincount(row[full] + last_hour[full], minlength=size)
+    seconds += np.cumsum(steps.reshape(n_owners, width), axis=1).ravel() * HOUR
+
+    per_hour = seconds.reshape(n_owners, width)[:, :n_hours]
+    hour_of_week = (first_weekday * 24 + np.arange(n_hours)) % HOURS_PER_WEEK
+    cells = (np.arange(n_owners)[:, None] * HOURS_PER_WEEK + hour_of_week[None, :]).ravel()
+    booked = np.bincount(cells, weights=per_hour.ravel(), minlength=n_owners * HOURS_PER_WEEK)
+    available = np.bincount(hour_of_week, minlength=HOURS_PER_WEEK) * HOUR
+
+    occupancy = np.divide(booked.reshape(n_owners, HOURS_PER_WEEK), available,
+                          out=np.zeros((n_owners, HOURS_PER_WEEK)), where=available > 0)
+    # Overlapping bookings of one stadium cannot make it more than fully booked
+    return np.minimum(occupancy, 1.0).reshape(n_owners, 7, 24)
+
+
+def percentile_ranks(matrices: np.ndarray, index: int) -> Tuple[np.ndarray, float]:
+    """
+    Percent of owners at or below owner ``index``: per cell (7 x 24) and for the
+    mean occupancy over the whole week.
+    """
+    cells = (matrices <= matrices[index]).mean(axis=0) * 100
+    overall = matrices.mean(axis=(1, 2))
+    return cells, float((overall <= overall[index]).mean() * 100)
+
+
+def benchmark(n_bookings: int = 1_000_000, n_stadiums: int = 200, days: int = 365) -> None:
+    import time
+
+    rng = np.random.default_rng(0)
+    window_start = 1_704_067_200  # 2024-01-01, a Monday
+    window_end = window_start + days * 86400
+    starts = window_start + rng.integers(0, days * 24 * 2, n_bookings) * 1800
+    ends = starts + rng.integers(1, 5, n_bookings) * 1800
+    owners = rng.integers(0, n_stadiums, n_bookings)
+
+    began = time.perf_counter()
+    matrices = occupancy_matrices(starts, ends, owners, n_stadiums, window_start, window_end, 0)
+    rasterized = time.perf_counter()
+    percentile_ranks(matrices, 0)
+    ranked = time.perf_counter()
+    print(f"{n_bookings} bookings, {n_stadiums} stadiums, {days} days: "
+          f"rasterize {(rasterized - began) * 1000:.1f}ms, percentiles {(ranked - rasterized) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1 @@
+from .writer import BookingEventWriter, booking_events
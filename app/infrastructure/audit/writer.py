@@ -0,0 +1,98 @@
+"""
+Buffered writer of the booking audit log.
+
+Booking changes append their events to an in-process buffer, which costs the
+request no round trip. A background task inserts the buffer into booking_events
+with multi-row INSERTs of up to BATCH_ROWS rows. It runs every ``interval``
+seconds, or as soon as a batch is full. A failed insert puts the rows back for
+the next run. Events still buffered when a worker dies are lost. Shutdown
+flushes what is left, and the buffer is capped at max_buffered events.
+"""
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.database.models import BookingEventModel
+
+logger = logging.getLogger(__name__)
+
+# 9 columns a row, well under Postgres' 32767 bind parameters per statement
+BATCH_ROWS = 1000
+
+
+class BookingEventWriter:
+    def __init__(self, interval: float = 1.0, max_buffered: int = 100_000):
+        self.interval = interval
+        self.max_buffered = max_buffered
+        self._buffer: List[dict] = []
+        self._full = asyncio.Event()
+        self._pool: Optional[sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, events: Iterable[dict]) -> None:
+        """Buffer BookingEventModel rows (as column dicts) for the next flush"""
+        self._buffer.extend(events)
+        overflow = len(self._buffer) - self.max_buffered
+        if overflow > 0:
+            del self._buffer[:overflow]
+            logger.error(f"Booking event buffer full, dropped {overflow} oldest events")
+        if len(self._buffer) >= BATCH_ROWS:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """Insert everything buffered so far; returns how many events were written"""
+        events, self._buffer = self._buffer, []
+        self._full.clear()
+        written = 0
+        try:
+            async with self._pool() as session:
+                for start in range(0, len(events), BATCH_ROWS):
+                    await session.execute(insert(BookingEventModel).values(events[start:start + BATCH_ROWS]))
+                    await session.commit()
+                    written = start + BATCH_ROWS
+        except BaseException:
+            # Back in front of what arrived meanwhile, in order
+            self._buffer[:0] = events[written:]
+            raise
+        return len(events)
+
+    async def start(self, pool: sessionmaker) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            # A flush cut short puts its rows back; draining before then would write them twice
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._pool is not None and self._buffer:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to write booking events on shutdown: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            if not self._buffer:
+                continue
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to write booking events: {e}")
+                await asyncio.sleep(self.interval)
+
+
+booking_events = BookingEventWriter()
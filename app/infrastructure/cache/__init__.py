@@ -0,0 +1,7 @@
+from .versions import StadiumVersions
+from .stats import AdminStats
+from .rollups import RollupQueue
+from .heatmaps import HeatmapCache
+from .leaderboard import StadiumLeaderboard
+from .counts import BookingCounts
+from .idempotency import IdempotencyStore
@@ -0,0 +1,92 @@
+"""
+Background rebuilding of the analytics rollups.
+
+Booking changes queue their (stadium, day) buckets in Redis; every worker drains
+the queue in batches and rebuilds each bucket from its bookings. Rebuilding is
+idempotent, so a bucket handled twice is harmless and a failed one is queued again;
+a batch taken by a worker that died goes back to the queue when its lease ends.
+The first run after deployment queues every day that has bookings.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies.settings import get_redis_connection
+from app.infrastructure.cache.rollups import RollupQueue
+from app.infrastructure.database.dao.rdb.analytics import AnalyticsDAO
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_KEY = "rollup:backfilled"
+BACKFILL_LOCK_KEY = "rollup:backfilling"
+
+
+class RollupAggregator:
+    def __init__(self, interval: float = 30, batch_size: int = 200, lease: int = 300):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lease = lease
+        self._pool: Optional[sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def backfill(self) -> None:
+        """
+        Queue every bucket with bookings, once per deployment. Only marked done once
+        the buckets are queued; a failed attempt is retried by the next worker to start.
+        """
+        redis_client = await get_redis_connection()
+        if await redis_client.exists(BACKFILL_KEY):
+            return
+        # Keeps workers starting together from all backfilling; expires if the holder dies
+        if not await redis_client.set(BACKFILL_LOCK_KEY, 1, nx=True, ex=self.lease):
+            return
+        try:
+            async with self._pool() as session:
+                buckets = await AnalyticsDAO(session).get_rollup_buckets()
+            await RollupQueue(redis_client).mark(buckets)
+            await redis_client.set(BACKFILL_KEY, 1)
+        finally:
+            await redis_client.delete(BACKFILL_LOCK_KEY)
+        logger.info(f"Queued {len(buckets)} rollup buckets for backfill")
+
+    async def aggregate(self) -> int:
+        """Rebuild one batch of queued buckets; returns how many were taken"""
+        queue = RollupQueue(await get_redis_connection())
+        buckets = await queue.pop(self.batch_size, self.lease)
+        async with self._pool() as session:
+            dao = AnalyticsDAO(session)
+            for index, (stadium_id, day) in enumerate(buckets):
+                try:
+                    await dao.refresh_day(stadium_id, day)
+                except BaseException:
+                    await queue.mark(buckets[index:])
+                    await queue.ack(buckets)
+                    raise
+        await queue.ack(buckets)
+        return len(buckets)
+
+    async def start(self, pool: sessionmaker) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await self.backfill()
+        except Exception as e:
+            logger.error(f"Rollup backfill failed: {e}")
+        while True:
+            try:
+                while await self.aggregate() == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Rollup aggregation failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,40 @@
+"""
+Exact booking counts cached per filter signature.
+
+Any booking change bumps ``booking_count:generation``. Counts are stored under
+``booking_count:{generation}:{digest of the filters}``, so a bump orphans every
+cached count at once and the old keys just expire. Callers read the generation
+before counting; a count that raced a bump is stored under the old generation
+and is never served.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from redis import asyncio as redis_asyncio
+
+GENERATION_KEY = "booking_count:generation"
+COUNT_TTL = 600
+
+
+class BookingCounts:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(generation: int, filters: Dict[str, Any]) -> str:
+        signature = json.dumps(filters, sort_keys=True, default=str)
+        return f"booking_count:{generation}:{hashlib.sha1(signature.encode()).hexdigest()}"
+
+    async def generation(self) -> int:
+        return int(await self.redis.get(GENERATION_KEY) or 0)
+
+    async def bump(self) -> None:
+        await self.redis.incr(GENERATION_KEY)
+
+    async def get(self, generation: int, filters: Dict[str, Any]) -> Optional[int]:
+        count = await self.redis.get(self._key(generation, filters))
+        return None if count is None else int(count)
+
+    async def set(self, generation: int, filters: Dict[str, Any], count: int) -> None:
+        await self.redis.set(self._key(generation, filters), count, ex=COUNT_TTL)
@@ -0,0 +1,30 @@
+"""
+Computed occupancy heatmaps, cached per (stadium, window) as JSON.
+
+Heatmaps compare a stadium with its whole district, so no single stadium's
+version can invalidate them; they expire instead, sooner while the window
+still includes today.
+"""
+from datetime import date
+from typing import Optional
+
+from redis import asyncio as redis_asyncio
+
+CURRENT_TTL = 300
+PAST_TTL = 6 * 3600
+
+
+class HeatmapCache:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(stadium_id: int, start_date: date, end_date: date) -> str:
+        return f"heatmap:{stadium_id}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+    async def get(self, stadium_id: int, start_date: date, end_date: date) -> Optional[str]:
+        return await self.redis.get(self._key(stadium_id, start_date, end_date))
+
+    async def set(self, stadium_id: int, start_date: date, end_date: date, payload: str) -> None:
+        ttl = PAST_TTL if end_date < date.today() else CURRENT_TTL
+        await self.redis.set(self._key(stadium_id, start_date, end_date), payload, ex=ttl)
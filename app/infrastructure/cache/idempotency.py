@@ -0,0 +1,87 @@
+"""
+Stored responses of requests sent with an Idempotency-Key.
+
+``idempotency:{scope}:{key}`` holds JSON: ``{"state": "pending", "fingerprint"}``
+while the first request runs, then ``{"state": "done", "fingerprint", "status",
+"body", "media_type"}``. Claiming a key and reading what is there is one Lua
+call. When the first request finishes, the record is also pushed onto
+``{key}:done``. A concurrent duplicate blocks on that list with BRPOPLPUSH back onto
+itself, so every waiter gets the record in one round trip and leaves it for the
+next waiter.
+"""
+import json
+from typing import Optional
+
+from redis import asyncio as redis_asyncio
+
+# How long a request may run holding its key; also how long duplicates wait for it
+LOCK_TTL = 30
+RESULT_TTL = 24 * 3600
+
+# KEYS = record key, done list; ARGV = pending record, lock ttl
+CLAIM_SCRIPT = """
+local record = redis.call('GET', KEYS[1])
+if record then
+    return record
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('DEL', KEYS[2])
+return false
+"""
+
+# KEYS = record key, done list; ARGV = final record, result ttl, done list ttl
+FINISH_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('DEL', KEYS[2])
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# KEYS = record key, done list; ARGV = abandoned marker, done list ttl
+ABANDON_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('DEL', KEYS[2])
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+class IdempotencyStore:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(scope: str, key: str) -> str:
+        return f"idempotency:{scope}:{key}"
+
+    async def claim(self, scope: str, key: str, fingerprint: str) -> Optional[dict]:
+        """None if this request now owns the key, otherwise the record already there"""
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        record_key = self._key(scope, key)
+        record = await self.redis.register_script(CLAIM_SCRIPT)(
+            keys=[record_key, f"{record_key}:done"], args=[pending, LOCK_TTL]
+        )
+        return json.loads(record) if record else None
+
+    async def finish(self, scope: str, key: str, fingerprint: str, status: int, body: str, media_type: str) -> None:
+        record = json.dumps({"state": "done", "fingerprint": fingerprint, "status": status,
+                             "body": body, "media_type": media_type})
+        record_key = self._key(scope, key)
+        await self.redis.register_script(FINISH_SCRIPT)(
+            keys=[record_key, f"{record_key}:done"], args=[record, RESULT_TTL, LOCK_TTL * 2]
+        )
+
+    async def abandon(self, scope: str, key: str) -> None:
+        """Release the key without a result, so the next retry runs again"""
+        record_key = self._key(scope, key)
+        await self.redis.register_script(ABANDON_SCRIPT)(
+            keys=[record_key, f"{record_key}:done"], args=[json.dumps({"state": "abandoned"}), LOCK_TTL * 2]
+        )
+
+    async def wait(self, scope: str, key: str) -> Optional[dict]:
+        """Block until the request holding the key finishes; None if it outlives LOCK_TTL"""
+        done_key = f"{self._key(scope, key)}:done"
+        record = await self.redis.brpoplpush(done_key, done_key, LOCK_TTL)
+        return json.loads(record) if record else None
@@ -0,0 +1,113 @@
+"""
+Trending stadiums: Redis sorted sets of time-decayed confirmed bookings.
+
+Scores use forward decay. A booking made at time t adds 2 ** ((t - landmark) / HALF_LIFE),
+so newer bookings weigh more and nothing ever has to be decayed in place.
+Dividing by the same weight for "now" turns a score back into "confirmed
+bookings, counting one made HALF_LIFE ago as half". The weights grow with time;
+a rebuild re-bases the landmark (doubles hold about ten years of half-lives).
+
+``trending:global`` ranks every stadium, ``trending:district:{name}`` ranks one
+district. Both are updated together on confirmation (and undone on cancellation),
+so a top-N read is a single ZREVRANGEBYSCORE, O(log n + N).
+"""
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from redis import asyncio as redis_asyncio
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_KEY = "trending:global"
+LANDMARK_KEY = "trending:landmark"
+HALF_LIFE = 3.5 * 24 * 3600
+# Past this many half-lives the weights approach the float range; time to rebuild
+MAX_HALF_LIVES = 700
+
+
+def district_key(district: str) -> str:
+    return f"trending:district:{district}"
+
+
+def booking_weight(moment: float, landmark: float) -> float:
+    return 2 ** ((moment - landmark) / HALF_LIFE)
+
+
+def utc_timestamp(moment: datetime) -> float:
+    """Unix time of a naive UTC datetime, as stored in the bookings table"""
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+class StadiumLeaderboard:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    async def landmark(self) -> float:
+        await self.redis.set(LANDMARK_KEY, int(time.time()), nx=True)
+        return float(await self.redis.get(LANDMARK_KEY))
+
+    async def record(self, entries: Iterable[Tuple[int, str, datetime, int]]) -> None:
+        """
+        Add (delta=1) or withdraw (delta=-1) confirmed bookings, given as
+        (stadium_id, district, created_at, delta)
+        """
+        landmark = await self.landmark()
+        pipe = self.redis.pipeline(transaction=False)
+        for stadium_id, district, booked_at, delta in entries:
+            moment = utc_timestamp(booked_at)
+            if (moment - landmark) / HALF_LIFE > MAX_HALF_LIVES:
+                logger.warning("Trending leaderboard landmark is too old, rebuild the leaderboard")
+            weight = delta * booking_weight(moment, landmark)
+            pipe.zincrby(GLOBAL_KEY, weight, stadium_id)
+            pipe.zincrby(district_key(district), weight, stadium_id)
+        await pipe.execute()
+
+    async def top(self, district: Optional[str] = None, limit: int = 10) -> List[Tuple[int, float]]:
+        """[(stadium_id, decayed bookings as of now)], best first"""
+        key = district_key(district) if district else GLOBAL_KEY
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(LANDMARK_KEY)
+        pipe.zrevrangebyscore(key, "+inf", "(0", start=0, num=limit, withscores=True)
+        landmark, entries = await pipe.execute()
+        if landmark is None:
+            return []
+        now = booking_weight(time.time(), float(landmark))
+        return [(int(stadium_id), score / now) for stadium_id, score in entries]
+
+    async def remove(self, stadium_id: int, district: str) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrem(GLOBAL_KEY, stadium_id)
+        pipe.zrem(district_key(district), stadium_id)
+        await pipe.execute()
+
+    async def move(self, stadium_id: int, old_district: str, new_district: str) -> None:
+        score = await self.redis.zscore(district_key(old_district), stadium_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zrem(district_key(old_district), stadium_id)
+        if score is not None:
+            pipe.zadd(district_key(new_district), {stadium_id: score})
+        await pipe.execute()
+
+    async def replace(self, landmark: float, scores: Iterable[Tuple[int, str, float]]) -> None:
+        """Swap in freshly computed (stadium_id, district, score) rows and their landmark at once"""
+        staged = {}
+        for stadium_id, district, score in scores:
+            staged.setdefault(GLOBAL_KEY, {})[stadium_id] = score
+            staged.setdefault(district_key(district), {})[stadium_id] = score
+
+        stale = [key async for key in self.redis.scan_iter(match=district_key("*"))
+                 if not key.endswith(":rebuild")]
+        pipe = self.redis.pipeline(transaction=False)
+        for key, members in staged.items():
+            pipe.delete(f"{key}:rebuild")
+            pipe.zadd(f"{key}:rebuild", members)
+        await pipe.execute()
+
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(LANDMARK_KEY, int(landmark))
+        pipe.delete(GLOBAL_KEY, *stale)
+        for key in staged:
+            pipe.rename(f"{key}:rebuild", key)
+        await pipe.execute()
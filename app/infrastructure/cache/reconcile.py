@@ -0,0 +1,53 @@
+"""
+Periodic correction of the admin dashboard aggregates.
+
+Every worker runs the reconciler, but a Redis lock that lives for one interval lets
+only one of them recompute per interval.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.api.dependencies.settings import get_redis_connection
+from app.infrastructure.database.dao.rdb.stats import StatsDAO
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "admin_stats:reconcile_lock"
+
+
+class StatsReconciler:
+    def __init__(self, interval: int = 3600):
+        self.interval = interval
+        self._pool: Optional[sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def reconcile(self) -> bool:
+        """Recompute unless another worker did within the interval; returns whether this one did"""
+        redis_client = await get_redis_connection()
+        if not await redis_client.set(LOCK_KEY, 1, nx=True, ex=self.interval):
+            return False
+        async with self._pool() as session:
+            await StatsDAO(session).reconcile()
+        return True
+
+    async def start(self, pool: sessionmaker) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Admin stats reconciliation failed: {e}")
+            await asyncio.sleep(self.interval)
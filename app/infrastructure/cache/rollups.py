@@ -0,0 +1,59 @@
+"""
+Queue of (stadium, day) rollup buckets whose bookings changed.
+
+A Redis set, so a bucket changed many times before the aggregator runs is
+rebuilt once; SPOP hands each bucket to a single worker. Popped buckets stay in
+``rollup:processing`` under a lease until the worker acknowledges them, and go
+back to the queue when the lease runs out, so a worker killed mid-batch loses
+nothing.
+"""
+from datetime import date
+from typing import Iterable, List, Tuple
+
+from redis import asyncio as redis_asyncio
+
+DIRTY_KEY = "rollup:dirty"
+PROCESSING_KEY = "rollup:processing"
+
+# KEYS = dirty set, processing sorted set (scored by lease end); ARGV = count, lease seconds
+POP_SCRIPT = """
+local now = tonumber(redis.call('TIME')[1])
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    redis.call('SADD', KEYS[1], member)
+    redis.call('ZREM', KEYS[2], member)
+end
+local members = redis.call('SPOP', KEYS[1], ARGV[1])
+for _, member in ipairs(members) do
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[2]), member)
+end
+return members
+"""
+
+
+def _member(stadium_id: int, day: date) -> str:
+    return f"{stadium_id}:{day.isoformat()}"
+
+
+class RollupQueue:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    async def mark(self, buckets: Iterable[Tuple[int, date]]) -> None:
+        members = {_member(stadium_id, day) for stadium_id, day in buckets}
+        if members:
+            await self.redis.sadd(DIRTY_KEY, *members)
+
+    async def pop(self, count: int, lease: int = 300) -> List[Tuple[int, date]]:
+        """Take up to count buckets for lease seconds, first requeueing those whose lease ran out"""
+        members = await self.redis.register_script(POP_SCRIPT)(keys=[DIRTY_KEY, PROCESSING_KEY], args=[count, lease])
+        buckets = []
+        for member in members or []:
+            stadium_id, day = member.split(":")
+            buckets.append((int(stadium_id), date.fromisoformat(day)))
+        return buckets
+
+    async def ack(self, buckets: Iterable[Tuple[int, date]]) -> None:
+        """Release the lease of popped buckets that were rebuilt, or queued again"""
+        members = {_member(stadium_id, day) for stadium_id, day in buckets}
+        if members:
+            await self.redis.zrem(PROCESSING_KEY, *members)
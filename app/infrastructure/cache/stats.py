@@ -0,0 +1,80 @@
+"""
+Admin dashboard aggregates kept in Redis and updated on every write.
+
+``admin_stats`` is a hash of totals (stadiums, users, bookings, active_bookings) and
+``admin_stats:revenue`` holds revenue in cents per ``YYYY-MM`` of the booking start.
+Writers apply deltas; StatsReconciler periodically replaces everything with values
+computed in Postgres, which corrects drift from failed or racing updates. Popular
+stadiums come from the trending leaderboard.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis import asyncio as redis_asyncio
+
+from app.infrastructure.database.models.booking import BookingStatus
+
+TOTALS_KEY = "admin_stats"
+REVENUE_KEY = "admin_stats:revenue"
+
+ACTIVE_STATUSES = {BookingStatus.PENDING, BookingStatus.CONFIRMED}
+# Statuses whose price counts as earned
+REVENUE_STATUSES = {BookingStatus.CONFIRMED, BookingStatus.COMPLETED}
+
+
+def month_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m")
+
+
+def to_cents(amount: Decimal) -> int:
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+class AdminStats:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    async def record_bookings(self, changes: Iterable[Tuple[datetime, Decimal, Optional[BookingStatus]]],
+                              status: BookingStatus) -> None:
+        """
+        Apply one transition to many bookings in a single round trip. changes holds
+        (start_time, total_price, previous_status); previous_status is None for a new booking.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for start_time, total_price, previous_status in changes:
+            if previous_status is None:
+                pipe.hincrby(TOTALS_KEY, "total_bookings", 1)
+
+            active = (status in ACTIVE_STATUSES) - (previous_status in ACTIVE_STATUSES)
+            if active:
+                pipe.hincrby(TOTALS_KEY, "active_bookings", active)
+            earned = (status in REVENUE_STATUSES) - (previous_status in REVENUE_STATUSES)
+            if earned:
+                pipe.hincrby(REVENUE_KEY, month_key(start_time), earned * to_cents(total_price))
+        await pipe.execute()
+
+    async def record_stadium(self, delta: int) -> None:
+        await self.redis.hincrby(TOTALS_KEY, "total_stadiums", delta)
+
+    async def record_user(self, delta: int) -> None:
+        await self.redis.hincrby(TOTALS_KEY, "total_users", delta)
+
+    async def get(self, month: str) -> Optional[Tuple[Dict[str, int], int]]:
+        """(totals, revenue cents of month) or None if never reconciled"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(TOTALS_KEY)
+        pipe.hget(REVENUE_KEY, month)
+        totals, revenue = await pipe.execute()
+        if not totals:
+            return None
+        return {name: int(value) for name, value in totals.items()}, int(revenue or 0)
+
+    async def replace(self, totals: Dict[str, int], revenue: Dict[str, int]) -> None:
+        """Overwrite all aggregates at once with freshly computed values"""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(TOTALS_KEY, REVENUE_KEY)
+        pipe.hset(TOTALS_KEY, mapping=totals)
+        if revenue:
+            pipe.hset(REVENUE_KEY, mapping=revenue)
+        await pipe.execute()
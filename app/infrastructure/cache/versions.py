@@ -0,0 +1,87 @@
+"""
+Per-stadium change counters kept in Redis.
+
+``stadium_version:{id}`` is a hash with ``data`` (stadium row or schedule changed),
+``bookings`` (a booking of the stadium changed) and ``modified`` (unix time of the
+last bump), plus ``version``, a copy of the stadium row's version column that
+only ever moves forward. ``stadium_version:list`` tracks any change that can alter
+stadium listings. Counters only grow; if Redis loses a hash, ``modified`` is
+re-seeded with the current time so ETags issued before the loss can never match again.
+"""
+import time
+from typing import Optional, Tuple
+
+from redis import asyncio as redis_asyncio
+
+LIST_KEY = "stadium_version:list"
+
+# KEYS[1] = stadium hash; ARGV[1] = row version. Commits can reach Redis out of order
+REMEMBER_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('HSET', KEYS[1], 'version', ARGV[1])
+end
+return 1
+"""
+
+
+class StadiumVersions:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(stadium_id: int) -> str:
+        return f"stadium_version:{stadium_id}"
+
+    async def bump_stadium(self, stadium_id: int, version: Optional[int] = None) -> None:
+        """version is the row's new version; None (e.g. deleted) forgets it"""
+        now = int(time.time())
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self._key(stadium_id), "data", 1)
+        pipe.hset(self._key(stadium_id), "modified", now)
+        if version is None:
+            pipe.hdel(self._key(stadium_id), "version")
+        pipe.hincrby(LIST_KEY, "data", 1)
+        pipe.hset(LIST_KEY, "modified", now)
+        await pipe.execute()
+        if version is not None:
+            await self.remember(stadium_id, version)
+
+    async def remember(self, stadium_id: int, version: int) -> None:
+        await self.redis.register_script(REMEMBER_SCRIPT)(keys=[self._key(stadium_id)], args=[version])
+
+    async def bump_list(self) -> None:
+        pipe = self.redis.pipeline()
+        pipe.hincrby(LIST_KEY, "data", 1)
+        pipe.hset(LIST_KEY, "modified", int(time.time()))
+        await pipe.execute()
+
+    async def bump_bookings(self, stadium_id: int) -> None:
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self._key(stadium_id), "bookings", 1)
+        pipe.hset(self._key(stadium_id), "modified", int(time.time()))
+        await pipe.execute()
+
+    async def _read(self, key: str) -> Tuple[int, int, int]:
+        pipe = self.redis.pipeline()
+        pipe.hsetnx(key, "modified", int(time.time()))
+        pipe.hmget(key, "data", "bookings", "modified")
+        _, (data, bookings, modified) = await pipe.execute()
+        return int(data or 0), int(bookings or 0), int(modified)
+
+    async def get(self, stadium_id: int) -> Tuple[int, int, int]:
+        """(data version, bookings version, modified unix time)"""
+        return await self._read(self._key(stadium_id))
+
+    async def get_version(self, stadium_id: int) -> Tuple[Optional[int], int]:
+        """(row version, None until known, modified unix time)"""
+        pipe = self.redis.pipeline()
+        pipe.hsetnx(self._key(stadium_id), "modified", int(time.time()))
+        pipe.hmget(self._key(stadium_id), "version", "modified")
+        _, (version, modified) = await pipe.execute()
+        return (int(version) if version is not None else None), int(modified)
+
+    async def get_list(self) -> Tuple[int, int]:
+        """(list version, modified unix time)"""
+        data, _, modified = await self._read(LIST_KEY)
+        return data, modified
@@ -1,7 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database.dao.rdb import UserDAO, BookingDAO
+from app.infrastructure.database.dao.rdb import UserDAO, BookingDAO, ImageDAO, MediaDAO, ProfileDAO
 from app.infrastructure.database.dao.rdb.base import BaseDAO
 from app.infrastructure.database.dao.rdb.stadium import StadiumDAO
+from app.infrastructure.database.dao.rdb.stats import StatsDAO
+from app.infrastructure.database.dao.rdb.analytics import AnalyticsDAO
+from app.infrastructure.database.dao.rdb.series import BookingSeriesDAO
+from app.infrastructure.database.dao.rdb.waitlist import WaitlistDAO
+from app.infrastructure.database.dao.rdb.events import BookingEventDAO
 
 
 class HolderDao:
@@ -11,3 +16,14 @@ class HolderDao:
         self.user = UserDAO(session=self.session)
         self.stadium = StadiumDAO(session=self.session)
         self.booking = BookingDAO(session=self.session)
+        self.series = BookingSeriesDAO(session=self.session)
+        self.waitlist = WaitlistDAO(session=self.session)
+        self.booking_events = BookingEventDAO(session=self.session)
+        self.image = ImageDAO(session=self.session)
+        self.media = MediaDAO(session=self.session)
+        self.profile = ProfileDAO(session=self.session)
+        self.stats = StatsDAO(session=self.session)
+        self.analytics = AnalyticsDAO(session=self.session)
+
+    async def get_admin_stats(self) -> dict:
+        return await self.stats.get_admin_stats()
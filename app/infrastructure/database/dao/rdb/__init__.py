@@ -1,4 +1,7 @@
 from .base import BaseDAO
 from .user import UserDAO
+from .media import MediaDAO
 from .stadium import StadiumDAO
 from .booking import BookingDAO
+from .image import ImageDAO
+from .profile import ProfileDAO
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List, Tuple
+
+from fastapi import HTTPException
+import numpy as np
+from sqlalchemy import select, func, and_, literal_column, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.settings import get_redis_connection
+from app.dto.stadium2 import RevenueBucket, StadiumRevenueResponse, HourOccupancy, StadiumOccupancyResponse, \
+    StadiumHeatmapResponse
+from app.infrastructure.analytics import occupancy_matrices, percentile_ranks
+from app.infrastructure.cache import HeatmapCache
+from app.infrastructure.cache.stats import REVENUE_STATUSES
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.dao.rdb.stadium import StadiumDAO
+from app.infrastructure.database.models import BookingModel, StadiumModel
+from app.infrastructure.database.models.analytics import StadiumDailyStatsModel, StadiumHourlyStatsModel
+
+logger = logging.getLogger(__name__)
+
+MAX_ANALYTICS_DAYS = 731
+REVENUE_PERIODS = ("day", "week", "month")
+
+
+def split_by_hour(start: datetime, end: datetime) -> Iterator[Tuple[date, int, int]]:
+    """(day, hour, minutes) of every clock hour the interval [start, end) overlaps"""
+    cursor = start
+    while cursor < end:
+        next_hour = cursor.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        chunk_end = min(next_hour, end)
+        yield cursor.date(), cursor.hour, int((chunk_end - cursor).total_seconds()) // 60
+        cursor = chunk_end
+
+
+def _epoch(column):
+    return func.extract("epoch", column).cast(BigInteger)
+
+
+class AnalyticsDAO(BaseDAO):
+    """
+    Owner analytics served from the per-day and per-hour rollup tables. Bookings are
+    read only by refresh_day(), which the rollup aggregator calls for changed days.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(StadiumDailyStatsModel, session)
+
+    async def refresh_day(self, stadium_id: int, day: date) -> None:
+        """Rebuild the rollups of one stadium day from its bookings"""
+        day_start = datetime.combine(day, time.min)
+        day_end = day_start + timedelta(days=1)
+        try:
+            result = await self.session.execute(
+                select(BookingModel.start_time, BookingModel.end_time, BookingModel.total_price)
+                .where(
+                    and_(
+                        BookingModel.stadium_id == stadium_id,
+                        BookingModel.status.in_(REVENUE_STATUSES),
+                        # A booking can start on the previous day and run past midnight
+                        BookingModel.start_time >= day_start - timedelta(days=1),
+                        BookingModel.start_time < day_end,
+                        BookingModel.end_time > day_start
+                    )
+                )
+            )
+            revenue, bookings, minutes = Decimal(0), 0, [0] * 24
+            for start_time, end_time, total_price in result.all():
+                if start_time >= day_start:
+                    revenue += total_price
+                    bookings += 1
+                for _, hour, booked in split_by_hour(max(start_time, day_start), min(end_time, day_end)):
+                    minutes[hour] += booked
+
+            stmt = insert(StadiumDailyStatsModel).values(
+                stadium_id=stadium_id, day=day, revenue=revenue, bookings=bookings, booked_minutes=sum(minutes)
+            )
+            await self.session.execute(stmt.on_conflict_do_update(
+                index_elements=[StadiumDailyStatsModel.stadium_id, StadiumDailyStatsModel.day],
+                set_={
+                    "revenue": stmt.excluded.revenue,
+                    "bookings": stmt.excluded.bookings,
+                    "booked_minutes": stmt.excluded.booked_minutes,
+                    "updated_at": func.now(),
+                }
+            ))
+            stmt = insert(StadiumHourlyStatsModel).values([
+                {"stadium_id": stadium_id, "day": day, "hour": hour, "booked_minutes": booked}
+                for hour, booked in enumerate(minutes)
+            ])
+            await self.session.execute(stmt.on_conflict_do_update(
+                index_elements=[StadiumHourlyStatsModel.stadium_id, StadiumHourlyStatsModel.day,
+                                StadiumHourlyStatsModel.hour],
+                set_={"booked_minutes": stmt.excluded.booked_minutes, "updated_at": func.now()}
+            ))
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to refresh stadium rollups: {e}")
+            raise
+
+    async def get_rollup_buckets(self) -> List[Tuple[int, date]]:
+        """Every (stadium, day) that has counted bookings, for the initial backfill"""
+        booking_day = func.date(BookingModel.start_time)
+        result = await self.session.execute(
+            select(BookingModel.stadium_id, booking_day)
+            .where(BookingModel.status.in_(REVENUE_STATUSES))
+            .group_by(BookingModel.stadium_id, booking_day)
+        )
+        return [(stadium_id, day) for stadium_id, day in result.all()]
+
+    @staticmethod
+    def _check_range(start_date: date, end_date: date) -> None:
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        if (end_date - start_date).days + 1 > MAX_ANALYTICS_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_ANALYTICS_DAYS} days")
+
+    async def get_revenue(self, stadium: StadiumModel, start_date: date, end_date: date,
+                          period: str) -> StadiumRevenueResponse:
+        self._check_range(start_date, end_date)
+        if period not in REVENUE_PERIODS:
+            raise HTTPException(status_code=400, detail=f"Invalid period. Allowed: {', '.join(REVENUE_PERIODS)}")
+
+        bucket = func.date_trunc(literal_column(f"'{period}'"), StadiumDailyStatsModel.day).label("bucket")
+        try:
+            result = await self.session.execute(
+                select(bucket, func.sum(StadiumDailyStatsModel.revenue), func.sum(StadiumDailyStatsModel.bookings))
+                .where(
+                    and_(
+                        StadiumDailyStatsModel.stadium_id == stadium.id,
+                        StadiumDailyStatsModel.day >= start_date,
+                        StadiumDailyStatsModel.day <= end_date
+                    )
+                )
+                .group_by(bucket)
+                .order_by(bucket)
+            )
+            buckets = [
+                RevenueBucket(period_start=period_start.date(), revenue=revenue, bookings=bookings)
+                for period_start, revenue, bookings in result.all()
+            ]
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadium revenue: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        return StadiumRevenueResponse(
+            stadium_id=stadium.id,
+            stadium_name=stadium.name,
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
+            total_revenue=sum((item.revenue for item in buckets), Decimal(0)),
+            total_bookings=sum(item.bookings for item in buckets),
+            buckets=buckets
+        )
+
+    async def get_occupancy(self, stadium: StadiumModel, start_date: date,
+                            end_date: date) -> StadiumOccupancyResponse:
+        """Booked share of the open minutes of every hour of the week over the range"""
+        self._check_range(start_date, end_date)
+        weekday = (func.extract("isodow", StadiumHourlyStatsModel.day) - 1).label("weekday")
+        try:
+            result = await self.session.execute(
+                select(weekday, StadiumHourlyStatsModel.hour, func.sum(StadiumHourlyStatsModel.booked_minutes))
+                .where(
+                    and_(
+                        StadiumHourlyStatsModel.stadium_id == stadium.id,
+                        StadiumHourlyStatsModel.day >= start_date,
+                        StadiumHourlyStatsModel.day <= end_date
+                    )
+                )
+                .group_by(weekday, StadiumHourlyStatsModel.hour)
+            )
+            booked = {(int(day), hour): minutes for day, hour, minutes in result.all()}
+            template = await StadiumDAO(self.session).get_slot_template(stadium)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadium occupancy: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        # Open minutes per hour of the week, from the schedule; the day before the range
+        # is included because a late closing spills into the first day
+        range_start = datetime.combine(start_date, time.min)
+        range_end = datetime.combine(end_date + timedelta(days=1), time.min)
+        open_minutes: Dict[Tuple[int, int], int] = defaultdict(int)
+        for offset in range(-1, (end_date - start_date).days + 1):
+            day_slots = template.for_date(start_date + timedelta(days=offset))
+            if day_slots is None:
+                continue
+            opens, closes = day_slots.bounds(start_date + timedelta(days=offset))
+            for bucket_day, hour, minutes in split_by_hour(max(opens, range_start), min(closes, range_end)):
+                open_minutes[(bucket_day.weekday(), hour)] += minutes
+
+        hours = [
+            HourOccupancy(
+                weekday=day,
+                hour=hour,
+                booked_minutes=booked.get((day, hour), 0),
+                open_minutes=minutes,
+                occupancy_rate=round(min(1.0, booked.get((day, hour), 0) / minutes), 4)
+            )
+            for (day, hour), minutes in sorted(open_minutes.items())
+        ]
+        return StadiumOccupancyResponse(
+            stadium_id=stadium.id,
+            stadium_name=stadium.name,
+            start_date=start_date,
+            end_date=end_date,
+            hours=hours
+        )
+
+    async def get_heatmap(self, stadium: StadiumModel, start_date: date, end_date: date) -> StadiumHeatmapResponse:
+        """Weekday x hour occupancy of the stadium, ranked against every stadium of its district"""
+        self._check_range(start_date, end_date)
+        try:
+            cache = HeatmapCache(await get_redis_connection())
+            cached = await cache.get(stadium.id, start_date, end_date)
+            if cached is not None:
+                return StadiumHeatmapResponse.model_validate_json(cached)
+        except Exception as e:
+            cache = None
+            logger.error(f"Failed to read heatmap cache: {e}")
+
+        window_start = datetime.combine(start_date, time.min)
+        window_end = datetime.combine(end_date + timedelta(days=1), time.min)
+        try:
+            result = await self.session.execute(
+                select(StadiumModel.id).where(StadiumModel.district == stadium.district).order_by(StadiumModel.id)
+            )
+            stadium_ids = np.asarray(result.scalars().all(), dtype=np.int64)
+            # One row of three arrays: the driver hands back whole columns, not a Python object per booking
+            result = await self.session.execute(
+                select(
+                    func.array_agg(BookingModel.stadium_id),
+                    func.array_agg(_epoch(BookingModel.start_time)),
+                    func.array_agg(_epoch(BookingModel.end_time))
+                )
+                .where(
+                    and_(
+                        BookingModel.stadium_id.in_(select(StadiumModel.id)
+                                                    .where(StadiumModel.district == stadium.district)),
+                        BookingModel.status.in_(REVENUE_STATUSES),
+                        BookingModel.start_time >= window_start - timedelta(days=1),
+                        BookingModel.start_time < window_end,
+                        BookingModel.end_time > window_start
+                    )
+                )
+            )
+            owners, starts, ends = result.one()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to load bookings for heatmap: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        def compute():
+            owner_ids = np.asarray(owners or [], dtype=np.int64)
+            matrices = occupancy_matrices(
+                np.asarray(starts or [], dtype=np.int64),
+                np.asarray(ends or [], dtype=np.int64),
+                np.searchsorted(stadium_ids, owner_ids),
+                len(stadium_ids),
+                int(window_start.replace(tzinfo=timezone.utc).timestamp()),
+                int(window_end.replace(tzinfo=timezone.utc).timestamp()),
+                start_date.weekday()
+            )
+            index = int(np.searchsorted(stadium_ids, stadium.id))
+            cells, overall_percentile = percentile_ranks(matrices, index)
+            return matrices[index], cells, float(matrices[index].mean()), overall_percentile
+
+        occupancy, cells, overall, overall_percentile = await asyncio.to_thread(compute)
+        heatmap = StadiumHeatmapResponse(
+            stadium_id=stadium.id,
+            stadium_name=stadium.name,
+            district=stadium.district,
+            start_date=start_date,
+            end_date=end_date,
+            occupancy=np.round(occupancy, 4).tolist(),
+            district_percentile=np.round(cells, 1).tolist(),
+            overall_occupancy=round(overall, 4),
+            overall_percentile=round(overall_percentile, 1),
+            district_stadiums=len(stadium_ids)
+        )
+        if cache is not None:
+            try:
+                await cache.set(stadium.id, start_date, end_date, heatmap.model_dump_json())
+            except Exception as e:
+                logger.error(f"Failed to cache heatmap: {e}")
+        return heatmap
@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import (
     List,
@@ -10,6 +11,8 @@ from fastapi import HTTPException
 from sqlalchemy import delete, func, Row, RowMapping, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.future import select
 from sqlalchemy.orm.strategy_options import Load
 from app.infrastructure.database.models import Base
@@ -18,6 +21,20 @@ Model = TypeVar("Model", Base, Base)
 
 logger = logging.getLogger(__name__)
 
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, planned but not run"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
 class BaseDAO(Generic[Model]):
 
     def __init__(self, model, session: AsyncSession):
@@ -62,6 +79,14 @@ class BaseDAO(Generic[Model]):
         result = await self.session.execute(select(func.count(self.model.id)))
         return result.scalar_one()
 
+    async def _estimate_rows(self, statement) -> int:
+        """The planner's row estimate for statement, from table statistics only"""
+        result = await self.session.execute(Explain(statement))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def commit(
             self,
     ):
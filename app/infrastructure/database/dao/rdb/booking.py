@@ -1,31 +1,59 @@
 import asyncio
 import logging
-from datetime import datetime
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List, Tuple, Sequence, Dict, Set, Collection
 from redis import asyncio as redis_asyncio
 
 from fastapi import HTTPException
-from sqlalchemy import select, insert, and_, or_, update
+from sqlalchemy import select, insert, and_, or_, update, func, Select, values, column, union_all, null, \
+    Integer, DateTime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.util import await_only
 
-from app.api.dependencies.settings import get_redis_connection
-from app.dto.booking import BookingCreate
+from app.api.dependencies.settings import get_redis_connection, get_redis_binary_connection
+from app.dto.booking import BookingCreate, BookingConflict, BookingResponse, BulkBookingCreate, BulkBookingResponse
+from app.infrastructure.cache import StadiumVersions, AdminStats, RollupQueue, StadiumLeaderboard, BookingCounts
+from app.infrastructure.audit import booking_events
+from app.infrastructure.cache.stats import ACTIVE_STATUSES, REVENUE_STATUSES
 from app.infrastructure.database.dao.rdb import BaseDAO
-from app.infrastructure.database.models import BookingModel, StadiumModel
-from app.infrastructure.database.models.booking import BookingStatus
+from app.infrastructure.database.dao.rdb.stadium import StadiumDAO
+from app.infrastructure.database.dao.rdb.waitlist import WaitlistDAO
+from app.infrastructure.database.models import BookingModel, StadiumModel, WaitlistEntryModel
+from app.infrastructure.database.models.booking import BookingStatus, WaitlistStatus, EXCLUSION_VIOLATION
+from app.infrastructure.scheduling import AvailabilityBitsetCache, SlotHolds
+from app.infrastructure.scheduling.holds import HOLD_TTL_MS
+from app.infrastructure.scheduling.broadcast import publish_availability_change
 
 logger = logging.getLogger(__name__)
 
+# Above this many rows by the planner's estimate, listings report the estimate instead of counting
+COUNT_ESTIMATE_THRESHOLD = 50_000
+BOOKING_EXPIRATION_SECONDS = 600
+# Columns returned by multi-row UPDATEs, enough for BookingDAO._after_bookings_change
+CHANGED_COLUMNS = (BookingModel.id, BookingModel.stadium_id, BookingModel.start_time, BookingModel.end_time,
+                   BookingModel.total_price, BookingModel.created_at)
+
+
+def is_overlap(error: SQLAlchemyError) -> bool:
+    """The statement would have made two active bookings of a stadium overlap"""
+    return getattr(getattr(error, "orig", None), "sqlstate", None) == EXCLUSION_VIOLATION
+
 
 class BookingDAO(BaseDAO):
     def __init__(self, session: AsyncSession):
         super().__init__(BookingModel, session)
 
     async def create(self, booking_data: BookingCreate, user_id: int,
-                     ) -> BookingModel:
+                     hold_token: Optional[str] = None, held_until: Optional[datetime] = None) -> BookingModel:
+        # Requests racing for a held range are turned away here, before any query;
+        # hold_token books a range already held for this user (a waitlist offer) until
+        # held_until, and that hold outlives a failed attempt
+        token = await self._hold_slot(booking_data, hold_token, held_until)
+        own_token = None if hold_token else token
         try:
             # Check if stadium exists
             stadium = await self.session.execute(
@@ -35,6 +63,14 @@ class BookingDAO(BaseDAO):
             if not stadium:
                 raise HTTPException(status_code=404, detail="Stadium not found")
 
+            # Booking must fit the stadium's opening schedule and slot grid
+            template = await StadiumDAO(self.session).get_slot_template(stadium)
+            if template.locate(booking_data.start_time, booking_data.end_time) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Booking must be within opening hours and aligned to {template.slot_minutes}-minute slots"
+                )
+
             # Check availability
             if not await self._check_availability(booking_data.stadium_id,
                                                   booking_data.start_time,
@@ -57,80 +93,498 @@ class BookingDAO(BaseDAO):
             await self.session.commit()
             booking = result.scalar()
 
+            await self._after_booking_change(booking, "created", actor_id=user_id)
+
             # Set Redis expiration for booking confirmation (10 minutes)
             await self._set_booking_expiration(booking.id)
 
             return booking
+        except HTTPException:
+            await self._release_slot(booking_data, own_token)
+            raise
         except SQLAlchemyError as e:
             await self.session.rollback()
+            await self._release_slot(booking_data, own_token)
+            if is_overlap(e):
+                raise HTTPException(status_code=409, detail="Stadium not available for selected time")
             logger.error(f"Failed to create booking: {e}")
             raise HTTPException(status_code=500, detail="Failed to create booking")
 
-    async def _set_booking_expiration(self, booking_id: int):
-        """Set booking expiration in Redis (10 minutes)"""
-        redis_client = await get_redis_connection()
+    async def _hold_slot(self, booking_data: BookingCreate, token: Optional[str] = None,
+                         until: Optional[datetime] = None) -> Optional[str]:
+        """
+        Claim the range in Redis: 409 if another request holds it, None if Redis is unavailable.
+        An existing hold taken again with its token keeps until, not a fresh HOLD_TTL_MS.
+        """
+        token = token or uuid.uuid4().hex
+        ttl_ms = HOLD_TTL_MS
+        if until is not None:
+            ttl_ms = max(1, int((until - datetime.utcnow()).total_seconds() * 1000))
         try:
-            expiration_key = f"booking_expiration:{booking_id}"
-            await redis_client.setex(expiration_key, 600, "pending")  # 600 seconds = 10 minutes
+            held = await SlotHolds(await get_redis_connection()).hold(
+                booking_data.stadium_id, booking_data.start_time, booking_data.end_time, token, ttl_ms=ttl_ms
+            )
+        except Exception as e:
+            logger.error(f"Failed to take slot hold: {e}")
+            return None
+        if not held:
+            raise HTTPException(status_code=409, detail="Stadium not available for selected time")
+        return token
+
+    async def hold_ranges(self, requests: Sequence[Tuple[int, datetime, datetime]], token: str,
+                          all_or_nothing: bool = True) -> Set[int]:
+        """
+        Claim requested (stadium_id, start, end) ranges in Redis like _hold_slot, all in one
+        call. Returns the indexes someone else holds, none if Redis is unavailable.
+        """
+        try:
+            return await SlotHolds(await get_redis_connection()).hold_many(requests, token, all_or_nothing)
+        except Exception as e:
+            logger.error(f"Failed to take slot holds: {e}")
+            return set()
+
+    async def release_ranges(self, requests: Sequence[Tuple[int, datetime, datetime]], token: str) -> None:
+        if not requests:
+            return
+        try:
+            await SlotHolds(await get_redis_connection()).release_many(requests, token)
+        except Exception as e:
+            logger.error(f"Failed to release slot holds: {e}")
+
+    async def _release_slot(self, booking_data: BookingCreate, token: Optional[str]) -> None:
+        if token is None:
+            return
+        try:
+            await SlotHolds(await get_redis_connection()).release(
+                booking_data.stadium_id, booking_data.start_time, booking_data.end_time, token
+            )
+        except Exception as e:
+            logger.error(f"Failed to release slot hold: {e}")
+
+    async def _after_booking_change(self, booking: BookingModel, event: str,
+                                    previous_status: Optional[BookingStatus] = None,
+                                    actor_id: Optional[int] = None):
+        await self._after_bookings_change([booking], event, [previous_status], actor_id)
+
+    async def _after_bookings_change(self, bookings: Sequence, event: str,
+                                     previous_statuses: Optional[Sequence[Optional[BookingStatus]]] = None,
+                                     actor_id: Optional[int] = None):
+        """
+        Log the change for audit, drop cached availability for the day(s) the bookings touch,
+        notify live subscribers, update the dashboard aggregates and trending leaderboard and
+        queue their analytics rollups for rebuilding, batching the Redis work of all bookings.
+        event is "created", "updated" (times or notes only) or the new status; previous_statuses
+        lines up with bookings for status changes. actor_id is the user who made the change,
+        None for the system. bookings may be models or rows with the same columns.
+        """
+        if not bookings:
+            return
+        if event == "created":
+            status, previous_statuses = BookingStatus.PENDING, [None] * len(bookings)
+        elif event == "updated":
+            status, previous_statuses = None, [None] * len(bookings)
+        else:
+            status = BookingStatus(event)
+
+        now = datetime.utcnow()
+        # Time edits pass old and new rows of a booking; its last row is the one to log
+        logged = {booking.id: (booking, previous) for booking, previous in zip(bookings, previous_statuses)}
+        booking_events.record([{
+            "booking_id": booking.id,
+            "stadium_id": booking.stadium_id,
+            "actor_id": actor_id,
+            "event": event,
+            "from_status": previous,
+            "to_status": status,
+            "start_time": booking.start_time,
+            "end_time": booking.end_time,
+            "occurred_at": now,
+        } for booking, previous in logged.values()])
+
+        days = defaultdict(set)
+        for booking in bookings:
+            day = booking.start_time.date()
+            # Bookings after midnight belong to the previous day's schedule when a stadium closes late,
+            # and one running past midnight also occupies the start of its end day
+            days[booking.stadium_id].update((day, day - timedelta(days=1), booking.end_time.date()))
+        try:
+            cache = AvailabilityBitsetCache(await get_redis_binary_connection())
+            for stadium_id, stadium_days in days.items():
+                await cache.invalidate(stadium_id, *stadium_days)
+        except Exception as e:
+            logger.error(f"Failed to invalidate availability cache: {e}")
+
+        try:
+            redis_client = await get_redis_connection()
+            for booking in bookings:
+                await publish_availability_change(redis_client, booking.stadium_id, {
+                    "event": event,
+                    "booking_id": booking.id,
+                    "date": booking.start_time.date().isoformat(),
+                    "start_time": booking.start_time.isoformat(),
+                    "end_time": booking.end_time.isoformat(),
+                })
+        except Exception as e:
+            logger.error(f"Failed to publish availability change: {e}")
+
+        try:
+            versions = StadiumVersions(await get_redis_connection())
+            for stadium_id in days:
+                await versions.bump_bookings(stadium_id)
+        except Exception as e:
+            logger.error(f"Failed to bump stadium bookings version: {e}")
+
+        try:
+            await BookingCounts(await get_redis_connection()).bump()
+        except Exception as e:
+            logger.error(f"Failed to invalidate booking counts: {e}")
+
+        try:
+            await RollupQueue(await get_redis_connection()).mark(
+                {(booking.stadium_id, booking.start_time.date()) for booking in bookings}
+                | {(booking.stadium_id, booking.end_time.date()) for booking in bookings}
+            )
+        except Exception as e:
+            logger.error(f"Failed to queue booking rollups: {e}")
+
+        if status is None:
+            return
+
+        if status not in ACTIVE_STATUSES:
+            await self.free_ranges([(booking.stadium_id, booking.start_time, booking.end_time)
+                                    for booking in bookings])
+
+        try:
+            await AdminStats(await get_redis_connection()).record_bookings(
+                [(booking.start_time, booking.total_price, previous)
+                 for booking, previous in zip(bookings, previous_statuses)],
+                status
+            )
+        except Exception as e:
+            logger.error(f"Failed to update admin stats: {e}")
+
+        confirmed = [(booking, (status in REVENUE_STATUSES) - (previous in REVENUE_STATUSES))
+                     for booking, previous in zip(bookings, previous_statuses)]
+        confirmed = [(booking, delta) for booking, delta in confirmed if delta]
+        if confirmed:
+            try:
+                result = await self.session.execute(
+                    select(StadiumModel.id, StadiumModel.district)
+                    .where(StadiumModel.id.in_({booking.stadium_id for booking, _ in confirmed}))
+                )
+                districts = dict(result.all())
+                await StadiumLeaderboard(await get_redis_connection()).record(
+                    [(booking.stadium_id, districts[booking.stadium_id], booking.created_at, delta)
+                     for booking, delta in confirmed]
+                )
+            except Exception as e:
+                logger.error(f"Failed to update trending leaderboard: {e}")
+
+    async def free_ranges(self, ranges: Sequence[Tuple[int, datetime, datetime]]) -> None:
+        """Hand (stadium_id, start, end) ranges bookings no longer occupy to the waitlist"""
+        try:
+            # The winner's hold outlives its insert; don't let it block a freed slot
+            await SlotHolds(await get_redis_connection()).clear(ranges)
+        except Exception as e:
+            logger.error(f"Failed to clear slot holds: {e}")
+        try:
+            await WaitlistDAO(self.session).offer_freed(ranges)
+        except Exception as e:
+            logger.error(f"Failed to offer freed bookings to the waitlist: {e}")
+
+    async def _set_booking_expiration(self, *booking_ids: int):
+        """Set booking expiration in Redis (10 minutes); one timer covers all the bookings"""
+        try:
+            redis_client = await get_redis_connection()
+            pipe = redis_client.pipeline(transaction=False)
+            for booking_id in booking_ids:
+                pipe.setex(f"booking_expiration:{booking_id}", BOOKING_EXPIRATION_SECONDS, "pending")
+            await pipe.execute()
 
             # Schedule background task to check expiration
-            asyncio.create_task(self._check_booking_expiration(booking_id))
+            asyncio.create_task(self._check_booking_expiration(*booking_ids))
         except Exception as e:
             logger.error(f"Failed to set booking expiration in Redis: {e}")
 
-    async def _check_booking_expiration(self, booking_id: int):
-        """Background task to check and expire bookings"""
-        redis_client = await get_redis_connection()
-        try:
-            await asyncio.sleep(600)  # Wait 10 minutes
-
-            expiration_key = f"booking_expiration:{booking_id}"
-            if await redis_client.exists(expiration_key):
-                # Check if booking is still pending
-                booking = await self._get_by_id(booking_id)
-                if booking and booking.status == BookingStatus.PENDING:
-                    # Expire the booking
-                    await self.session.execute(
-                        update(BookingModel)
-                        .where(BookingModel.id == booking_id)
-                        .values(status=BookingStatus.EXPIRED)
-                    )
-                    await self.session.commit()
-                    logger.info(f"Booking {booking_id} expired due to no confirmation")
+    async def _check_booking_expiration(self, *booking_ids: int):
+        """Background task to expire, in one UPDATE, the bookings still pending after the timeout"""
+        try:
+            await asyncio.sleep(BOOKING_EXPIRATION_SECONDS)
+
+            redis_client = await get_redis_connection()
+            keys = [f"booking_expiration:{booking_id}" for booking_id in booking_ids]
+            pipe = redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(key)
+            waiting = [booking_id for booking_id, exists in zip(booking_ids, await pipe.execute()) if exists]
+            if waiting:
+                result = await self.session.execute(
+                    update(BookingModel)
+                    .where(BookingModel.id.in_(waiting),
+                           BookingModel.status.in_(BookingStatus.allowed_from(BookingStatus.EXPIRED)))
+                    .values(status=BookingStatus.EXPIRED, version=BookingModel.version + 1)
+                    .returning(*CHANGED_COLUMNS)
+                    .execution_options(synchronize_session=False)
+                )
+                expired = result.all()
+                await self.session.commit()
+                await self._after_bookings_change(expired, BookingStatus.EXPIRED.value,
+                                                  [BookingStatus.PENDING] * len(expired))
+                for booking in expired:
+                    logger.info(f"Booking {booking.id} expired due to no confirmation")
 
-                # Remove from Redis
-                await redis_client.delete(expiration_key)
+            # Remove from Redis
+            await redis_client.delete(*keys)
         except Exception as e:
             logger.error(f"Failed to check booking expiration: {e}")
 
-    async def confirm_booking(self, booking_id: int, user_id: int) -> Optional[BookingModel]:
-        """Confirm booking and remove from Redis expiration"""
+    async def transition(self, booking_id: int, status: BookingStatus, user_id: Optional[int] = None,
+                         if_match: Optional[Set[int]] = None, actor_id: Optional[int] = None) -> BookingModel:
+        """
+        Move a booking (of user_id, if given) to status with one conditional UPDATE.
+        404 if there is no such booking, 412 if its version is not in if_match (versions
+        from If-Match), 409 if its current status can't move to status. actor_id, for the
+        audit log, defaults to user_id.
+        """
         try:
-            booking = await self._get_by_id(booking_id)
-            if not booking:
-                raise HTTPException(status_code=404, detail="Booking not found")
+            booking, previous_status = await self._transition(booking_id, status, user_id, if_match)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update booking status: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update booking")
+
+        if previous_status == BookingStatus.PENDING:
+            try:
+                redis_client = await get_redis_connection()
+                await redis_client.delete(f"booking_expiration:{booking_id}")
+            except Exception as e:
+                logger.error(f"Failed to clear booking expiration: {e}")
+        await self._after_booking_change(booking, status.value, previous_status=previous_status,
+                                         actor_id=actor_id if actor_id is not None else user_id)
+        return booking
+
+    async def _transition(self, booking_id: int, status: BookingStatus, user_id: Optional[int] = None,
+                          if_match: Optional[Set[int]] = None) -> Tuple[BookingModel, BookingStatus]:
+        """
+        The UPDATE behind transition, returning the changed booking and its previous
+        status. The locking sub-select re-checks the status after waiting for a
+        concurrent change, so of racing transitions only the valid ones apply. Caller commits.
+        """
+        criteria = [BookingModel.id == booking_id, BookingModel.status.in_(BookingStatus.allowed_from(status))]
+        if user_id is not None:
+            criteria.append(BookingModel.user_id == user_id)
+        if if_match is not None:
+            criteria.append(BookingModel.version.in_(if_match))
+        previous = (
+            select(BookingModel.id, BookingModel.status)
+            .where(*criteria)
+            .with_for_update()
+            .subquery()
+        )
+        result = await self.session.execute(
+            update(BookingModel)
+            .where(BookingModel.id == previous.c.id)
+            .values(status=status, version=BookingModel.version + 1)
+            .returning(BookingModel, previous.c.status)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise await self._transition_error(booking_id, status, user_id, if_match)
+        return row[0], row[1]
+
+    async def _transition_error(self, booking_id: int, status: BookingStatus, user_id: Optional[int] = None,
+                                if_match: Optional[Set[int]] = None) -> HTTPException:
+        """Why a transition changed no row; only runs when one failed"""
+        result = await self.session.execute(
+            select(BookingModel.user_id, BookingModel.status, BookingModel.version)
+            .where(BookingModel.id == booking_id)
+        )
+        current = result.one_or_none()
+        if current is None or (user_id is not None and current.user_id != user_id):
+            detail = "Booking not found" if user_id is None else "Booking not found or access denied"
+            return HTTPException(status_code=404, detail=detail)
+        if if_match is not None and current.version not in if_match:
+            return HTTPException(status_code=412, detail="Booking was changed since it was read, fetch it again")
+        return HTTPException(status_code=409,
+                             detail=f"Booking is {current.status.value} and cannot become {status.value}")
+
+    async def confirm_booking(self, booking_id: int, user_id: int,
+                              if_match: Optional[Set[int]] = None) -> BookingModel:
+        """Confirm a pending booking, which also stops its expiration"""
+        return await self.transition(booking_id, BookingStatus.CONFIRMED, user_id, if_match)
+
+    async def cancel(self, booking_id: int, actor_id: Optional[int] = None) -> BookingModel:
+        """Cancel any user's pending or confirmed booking"""
+        return await self.transition(booking_id, BookingStatus.CANCELLED, actor_id=actor_id)
 
-            if booking.status != BookingStatus.PENDING:
-                raise HTTPException(status_code=400, detail="Booking cannot be confirmed")
+    async def create_from_offer(self, entry_id: int, user_id: int) -> BookingModel:
+        """Book the range a waitlist entry of the user was offered, under the offer's hold"""
+        waitlist = WaitlistDAO(self.session)
+        entry = await waitlist.get_offer(entry_id, user_id)
+        booking_data = BookingCreate(stadium_id=entry.stadium_id, start_time=entry.start_time,
+                                     end_time=entry.end_time, notes=entry.notes)
+        booking = await self.create(booking_data, user_id, hold_token=entry.offer_token,
+                                    held_until=entry.offered_until)
+        await waitlist.fulfil(entry.id, booking.id)
+        # The booking covers the range now; a later cancellation must be able to offer it again
+        await self._release_slot(booking_data, entry.offer_token)
+        return booking
 
-            # Update booking status
-            await self.session.execute(
-                update(BookingModel)
-                .where(BookingModel.id == booking_id)
-                .values(status=BookingStatus.CONFIRMED)
+    async def find_conflicts(self, requests: Sequence[Tuple[int, datetime, datetime]],
+                             series_id: Optional[int] = None
+                             ) -> Tuple[Dict[int, List[int]], Dict[int, List[int]], Set[int]]:
+        """
+        Overlaps of requested (stadium_id, start, end) ranges in one query: with active
+        bookings ({index: [booking ids]}, ignoring series_id's own bookings), with
+        earlier requests of the same stadium ({index: [earlier indexes]}) and with
+        open waitlist offers ({indexes}), which are held for their waiter.
+        """
+        requested = select(values(
+            column("idx", Integer), column("stadium_id", Integer),
+            column("start_time", DateTime), column("end_time", DateTime),
+            name="requested_values"
+        ).data([(i, stadium_id, start, end) for i, (stadium_id, start, end) in enumerate(requests)])).cte("requested")
+        other = requested.alias("other")
+
+        with_bookings = [
+            BookingModel.stadium_id == requested.c.stadium_id,
+            BookingModel.status.in_(ACTIVE_STATUSES),
+            # Bookings fit one day's schedule, so none starts over a day before it ends;
+            # the lower bound keeps this a (stadium_id, start_time) index range scan
+            BookingModel.start_time > requested.c.start_time - timedelta(days=1),
+            BookingModel.start_time < requested.c.end_time,
+            BookingModel.end_time > requested.c.start_time,
+        ]
+        if series_id is not None:
+            with_bookings.append(BookingModel.series_id.is_distinct_from(series_id))
+
+        with_offers = [
+            WaitlistEntryModel.stadium_id == requested.c.stadium_id,
+            WaitlistEntryModel.status == WaitlistStatus.OFFERED,
+            WaitlistEntryModel.offered_until > datetime.utcnow(),
+            WaitlistEntryModel.start_time > requested.c.start_time - timedelta(days=1),
+            WaitlistEntryModel.start_time < requested.c.end_time,
+            WaitlistEntryModel.end_time > requested.c.start_time,
+        ]
+
+        result = await self.session.execute(union_all(
+            select(requested.c.idx, BookingModel.id.label("booking_id"), null().label("other_idx"),
+                   null().label("entry_id"))
+            .join(BookingModel, and_(*with_bookings)),
+            select(requested.c.idx, null(), other.c.idx, null())
+            .join(other, and_(
+                other.c.stadium_id == requested.c.stadium_id,
+                other.c.idx < requested.c.idx,
+                other.c.start_time < requested.c.end_time,
+                other.c.end_time > requested.c.start_time,
+            )),
+            select(requested.c.idx, null(), null(), WaitlistEntryModel.id)
+            .join(WaitlistEntryModel, and_(*with_offers))
+        ))
+        booked, overlapping, offered = {}, {}, set()
+        for idx, booking_id, other_idx, entry_id in result.all():
+            if booking_id is not None:
+                booked.setdefault(idx, []).append(booking_id)
+            elif other_idx is not None:
+                overlapping.setdefault(idx, []).append(other_idx)
+            else:
+                offered.add(idx)
+        return booked, overlapping, offered
+
+    async def check_requests(self, stadiums: Dict[int, StadiumModel],
+                             requests: Sequence[Tuple[int, datetime, datetime]],
+                             series_id: Optional[int] = None,
+                             held: Collection[int] = ()) -> Tuple[List[int], List[BookingConflict]]:
+        """
+        Validate requested (stadium_id, start, end) ranges against the stadiums' slot
+        templates, existing bookings, the indexes hold_ranges found held by others, open
+        waitlist offers and each other. Returns the accepted indexes and a conflict per rejected one; an item
+        only loses to an earlier item that was accepted.
+        """
+        booked, overlapping, offered = await self.find_conflicts(requests, series_id)
+        stadium_dao = StadiumDAO(self.session)
+        templates = {stadium_id: await stadium_dao.get_slot_template(stadium)
+                     for stadium_id, stadium in stadiums.items()}
+
+        accepted, conflicts = [], []
+        for i, (stadium_id, start, end) in enumerate(requests):
+            conflict = dict(index=i, stadium_id=stadium_id, start_time=start, end_time=end)
+            earlier = [j for j in overlapping.get(i, []) if j in accepted]
+            if stadium_id not in templates:
+                conflicts.append(BookingConflict(**conflict, reason="stadium_not_found"))
+            elif templates[stadium_id].locate(start, end) is None:
+                conflicts.append(BookingConflict(**conflict, reason="closed"))
+            elif i in booked:
+                conflicts.append(BookingConflict(**conflict, reason="booked", booking_ids=booked[i]))
+            elif i in held or i in offered:
+                # Offers are held in Redis too; the database knows them when Redis didn't
+                conflicts.append(BookingConflict(**conflict, reason="held"))
+            elif earlier:
+                conflicts.append(BookingConflict(**conflict, reason="overlaps_request", overlaps_index=min(earlier)))
+            else:
+                accepted.append(i)
+        return accepted, conflicts
+
+    @staticmethod
+    def conflict_error(conflicts: List[BookingConflict]) -> HTTPException:
+        return HTTPException(status_code=409, detail={
+            "message": f"{len(conflicts)} booking(s) are not available",
+            "conflicts": [conflict.model_dump(mode="json") for conflict in conflicts],
+        })
+
+    async def create_bulk(self, data: BulkBookingCreate, user_id: int) -> BulkBookingResponse:
+        """
+        Validate all items in one query and insert them with one multi-row INSERT,
+        all or nothing or just the free ones. Every range is held in Redis across the
+        check and the insert, like a single booking's.
+        """
+        requests = [(item.stadium_id, item.start_time, item.end_time) for item in data.bookings]
+        token = uuid.uuid4().hex
+        held = await self.hold_ranges(requests, token, data.all_or_nothing)
+        try:
+            result = await self.session.execute(
+                select(StadiumModel).where(StadiumModel.id.in_({stadium_id for stadium_id, _, _ in requests}))
             )
-            await self.session.commit()
+            stadiums = {stadium.id: stadium for stadium in result.scalars().all()}
 
-            # Remove from Redis expiration
-            expiration_key = f"booking_expiration:{booking_id}"
-            redis_client = await get_redis_connection()
-            await redis_client.delete(expiration_key)
+            accepted, conflicts = await self.check_requests(stadiums, requests, held=held)
+            if not accepted or (conflicts and data.all_or_nothing):
+                raise self.conflict_error(conflicts)
 
-            return await self._get_by_id(booking_id)
+            rows = []
+            for i in accepted:
+                item = data.bookings[i]
+                duration_hours = (item.end_time - item.start_time).total_seconds() / 3600
+                rows.append({
+                    **item.model_dump(),
+                    "user_id": user_id,
+                    "total_price": stadiums[item.stadium_id].price_per_hour * Decimal(str(duration_hours)),
+                })
+            result = await self.session.execute(insert(BookingModel).values(rows).returning(BookingModel))
+            bookings = sorted(result.scalars().all(), key=lambda booking: (booking.start_time, booking.stadium_id))
+            await self.session.commit()
+        except HTTPException:
+            await self.release_ranges(requests, token)
+            raise
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Failed to confirm booking: {e}")
-            raise HTTPException(status_code=500, detail="Failed to confirm booking")
+            await self.release_ranges(requests, token)
+            if is_overlap(e):
+                raise HTTPException(status_code=409, detail="Stadium not available for selected time")
+            logger.error(f"Failed to create bulk bookings: {e}")
+            raise HTTPException(status_code=500, detail="Failed to create bookings")
+
+        accepted = set(accepted)
+        await self.release_ranges([request for i, request in enumerate(requests) if i not in accepted], token)
+
+        await self._after_bookings_change(bookings, "created", actor_id=user_id)
+        await self._set_booking_expiration(*(booking.id for booking in bookings))
+        return BulkBookingResponse(
+            bookings=[BookingResponse.model_validate(booking) for booking in bookings],
+            conflicts=conflicts,
+        )
 
     async def _check_availability(self, stadium_id: int, start_time: datetime, end_time: datetime) -> bool:
         try:
@@ -153,24 +607,9 @@ class BookingDAO(BaseDAO):
             logger.error(f"Failed to check availability: {e}")
             return False
 
-    async def update_status(self, booking_id: int, status: BookingStatus, user_id: int) -> Optional[BookingModel]:
-        try:
-            # Check if booking exists and belongs to user
-            existing = await self._get_by_id(booking_id)
-            if not existing or existing.user_id != user_id:
-                raise HTTPException(status_code=404, detail="Booking not found or access denied")
-
-            await self.session.execute(
-                update(BookingModel)
-                .where(BookingModel.id == booking_id)
-                .values(status=status)
-            )
-            await self.session.commit()
-            return await self._get_by_id(booking_id)
-        except SQLAlchemyError as e:
-            await self.session.rollback()
-            logger.error(f"Failed to update booking status: {e}")
-            raise HTTPException(status_code=500, detail="Failed to update booking")
+    async def update_status(self, booking_id: int, status: BookingStatus, user_id: int,
+                            if_match: Optional[Set[int]] = None) -> BookingModel:
+        return await self.transition(booking_id, status, user_id, if_match)
 
     async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 10):
         try:
@@ -197,3 +636,91 @@ class BookingDAO(BaseDAO):
         except SQLAlchemyError as e:
             logger.error(f"Failed to get bookings by stadium: {e}")
             raise HTTPException(status_code=500, detail="Database error occurred")
+
+    @staticmethod
+    def _filter_predicates(status: Optional[BookingStatus] = None, stadium_id: Optional[int] = None,
+                           user_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> list:
+        """Bare column comparisons, so the (stadium_id|user_id, start_time) indexes apply"""
+        predicates = []
+        if status is not None:
+            predicates.append(BookingModel.status == status)
+        if stadium_id is not None:
+            predicates.append(BookingModel.stadium_id == stadium_id)
+        if user_id is not None:
+            predicates.append(BookingModel.user_id == user_id)
+        if start_date is not None:
+            predicates.append(BookingModel.start_time >= start_date)
+        if end_date is not None:
+            predicates.append(BookingModel.start_time < end_date)
+        return predicates
+
+    def export_query(self, status: Optional[BookingStatus] = None, stadium_id: Optional[int] = None,
+                     user_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None) -> Select:
+        """Plain booking columns for streaming export, in an order an index can deliver"""
+        order = BookingModel.start_time if stadium_id is not None or user_id is not None else BookingModel.id
+        return (
+            select(BookingModel.id, BookingModel.stadium_id, BookingModel.user_id, BookingModel.start_time,
+                   BookingModel.end_time, BookingModel.total_price, BookingModel.status, BookingModel.notes,
+                   BookingModel.created_at)
+            .where(*self._filter_predicates(status, stadium_id, user_id, start_date, end_date))
+            .order_by(order)
+        )
+
+    async def get_all_with_filters(self, skip: int = 0, limit: int = 100,
+                                   status: Optional[BookingStatus] = None, stadium_id: Optional[int] = None,
+                                   user_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                                   end_date: Optional[datetime] = None) -> List[BookingModel]:
+        """Bookings starting in [start_date, end_date), newest start first"""
+        predicates = self._filter_predicates(status, stadium_id, user_id, start_date, end_date)
+        try:
+            result = await self.session.execute(
+                select(BookingModel)
+                .where(*predicates)
+                .order_by(BookingModel.start_time.desc(), BookingModel.id.desc())
+                .offset(skip).limit(limit)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get bookings with filters: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def count_with_filters(self, status: Optional[BookingStatus] = None, stadium_id: Optional[int] = None,
+                                 user_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                                 end_date: Optional[datetime] = None) -> Tuple[int, bool]:
+        """
+        (total, is_exact) for get_all_with_filters. Exact counts are cached per filter
+        signature until the next booking change; when the planner expects more than
+        COUNT_ESTIMATE_THRESHOLD rows the estimate is returned instead of counting them.
+        """
+        filters = {"status": status, "stadium_id": stadium_id, "user_id": user_id,
+                   "start_date": start_date, "end_date": end_date}
+        counts = generation = None
+        try:
+            counts = BookingCounts(await get_redis_connection())
+            generation = await counts.generation()
+            cached = await counts.get(generation, filters)
+            if cached is not None:
+                return cached, True
+        except Exception as e:
+            logger.error(f"Failed to read cached booking count: {e}")
+            counts = None
+
+        predicates = self._filter_predicates(**filters)
+        try:
+            estimate = await self._estimate_rows(select(BookingModel.id).where(*predicates))
+            if estimate > COUNT_ESTIMATE_THRESHOLD:
+                return estimate, False
+            result = await self.session.execute(select(func.count(BookingModel.id)).where(*predicates))
+            total = result.scalar_one()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to count bookings with filters: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+        if counts is not None:
+            try:
+                await counts.set(generation, filters, total)
+            except Exception as e:
+                logger.error(f"Failed to cache booking count: {e}")
+        return total, True
@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.models import BookingEventModel
+
+logger = logging.getLogger(__name__)
+
+
+class BookingEventDAO(BaseDAO):
+    """
+    Reads of the booking audit log. Events are written by the buffered writer
+    (app.infrastructure.audit), so the latest change may take a flush interval to show.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(BookingEventModel, session)
+
+    async def get_by_booking(self, booking_id: int) -> Sequence[BookingEventModel]:
+        """A booking's history, oldest first; served by (booking_id, occurred_at)"""
+        try:
+            result = await self.session.execute(
+                select(BookingEventModel)
+                .where(BookingEventModel.booking_id == booking_id)
+                .order_by(BookingEventModel.occurred_at, BookingEventModel.id)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get booking history: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def get_by_stadium(self, stadium_id: int, since: Optional[datetime] = None,
+                             until: Optional[datetime] = None, skip: int = 0,
+                             limit: int = 100) -> Sequence[BookingEventModel]:
+        """Events of a stadium's bookings in [since, until), newest first; served by (stadium_id, occurred_at)"""
+        predicates = [BookingEventModel.stadium_id == stadium_id]
+        if since is not None:
+            predicates.append(BookingEventModel.occurred_at >= since)
+        if until is not None:
+            predicates.append(BookingEventModel.occurred_at < until)
+        try:
+            result = await self.session.execute(
+                select(BookingEventModel)
+                .where(*predicates)
+                .order_by(BookingEventModel.occurred_at.desc(), BookingEventModel.id.desc())
+                .offset(skip).limit(limit)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadium booking events: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
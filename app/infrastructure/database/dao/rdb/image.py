@@ -0,0 +1,131 @@
+import logging
+from typing import Dict, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, delete, and_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.dao.rdb.media import MediaDAO
+from app.infrastructure.database.dao.rdb.stadium import StadiumDAO
+from app.infrastructure.database.models.stadium import ImageModel
+
+logger = logging.getLogger(__name__)
+
+
+class ImageDAO(BaseDAO):
+    def __init__(self, session: AsyncSession):
+        super().__init__(ImageModel, session)
+
+    async def _touch_stadium(self, stadium_id: int) -> int:
+        """Images are part of the stadium: bump its row version in the same transaction"""
+        return await StadiumDAO(self.session)._touch(stadium_id)
+
+    async def _bump_stadium_version(self, stadium_id: int, version: int) -> None:
+        await StadiumDAO(self.session)._bump_version(stadium_id, version)
+
+    async def create(self, stadium_id: int, url: str, variants: dict, content_hash: Optional[str] = None,
+                     placeholder: Optional[str] = None, dominant_color: Optional[str] = None,
+                     alt_text: Optional[str] = None, is_primary: bool = False) -> ImageModel:
+        try:
+            if is_primary:
+                await self.session.execute(
+                    update(ImageModel)
+                    .where(and_(ImageModel.stadium_id == stadium_id, ImageModel.is_primary.is_(True)))
+                    .values(is_primary=False)
+                )
+            if content_hash and not await MediaDAO(self.session).acquire(content_hash):
+                await self.session.rollback()
+                raise HTTPException(status_code=409, detail="Image storage changed, please retry the upload")
+            result = await self.session.execute(
+                insert(ImageModel).values(
+                    stadium_id=stadium_id,
+                    url=url,
+                    variants=variants,
+                    content_hash=content_hash,
+                    placeholder=placeholder,
+                    dominant_color=dominant_color,
+                    alt_text=alt_text,
+                    is_primary=is_primary
+                ).returning(ImageModel)
+            )
+            image = result.scalar()
+            version = await self._touch_stadium(stadium_id)
+            await self.session.commit()
+            await self._bump_stadium_version(stadium_id, version)
+            return image
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to create image: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save image")
+
+    async def get_by_stadium(self, stadium_id: int) -> Sequence[ImageModel]:
+        try:
+            result = await self.session.execute(
+                select(ImageModel)
+                .where(ImageModel.stadium_id == stadium_id)
+                .order_by(ImageModel.is_primary.desc(), ImageModel.id)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get images by stadium: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def get_covers(self, stadium_ids: Sequence[int]) -> Dict[int, ImageModel]:
+        """Primary (else first) image of each stadium, in one query"""
+        if not stadium_ids:
+            return {}
+        try:
+            result = await self.session.execute(
+                select(ImageModel)
+                .where(ImageModel.stadium_id.in_(stadium_ids))
+                .distinct(ImageModel.stadium_id)
+                .order_by(ImageModel.stadium_id, ImageModel.is_primary.desc(), ImageModel.id)
+            )
+            return {image.stadium_id: image for image in result.scalars().all()}
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get cover images: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def get_for_stadium(self, stadium_id: int, image_id: int) -> Optional[ImageModel]:
+        try:
+            result = await self.session.execute(
+                select(ImageModel).where(and_(ImageModel.id == image_id, ImageModel.stadium_id == stadium_id))
+            )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get image: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def set_primary(self, stadium_id: int, image_id: int) -> bool:
+        try:
+            result = await self.session.execute(
+                update(ImageModel)
+                .where(ImageModel.stadium_id == stadium_id)
+                .values(is_primary=ImageModel.id == image_id)
+            )
+            version = await self._touch_stadium(stadium_id)
+            await self.session.commit()
+            await self._bump_stadium_version(stadium_id, version)
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to set primary image: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update image")
+
+    async def delete(self, image: ImageModel) -> bool:
+        """Delete the row and drop its media reference; files are left to the garbage collector"""
+        try:
+            result = await self.session.execute(delete(ImageModel).where(ImageModel.id == image.id))
+            if result.rowcount and image.content_hash:
+                await MediaDAO(self.session).release(image.content_hash)
+            version = await self._touch_stadium(image.stadium_id) if result.rowcount else None
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to delete image: {e}")
+            raise HTTPException(status_code=500, detail="Failed to delete record")
+        if result.rowcount:
+            await self._bump_stadium_version(image.stadium_id, version)
+        return result.rowcount > 0
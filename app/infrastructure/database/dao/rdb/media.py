@@ -0,0 +1,132 @@
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.models.stadium import MediaObjectModel, ImageModel
+
+logger = logging.getLogger(__name__)
+
+
+class MediaDAO(BaseDAO):
+    """
+    Reference counting for content-addressed media objects.
+
+    acquire/release/release_for_stadium do not commit: they run in the same
+    transaction as the image rows that hold the references.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(MediaObjectModel, session)
+
+    async def get_by_hash(self, content_hash: str) -> Optional[MediaObjectModel]:
+        try:
+            result = await self.session.execute(
+                select(MediaObjectModel).where(MediaObjectModel.content_hash == content_hash)
+            )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get media object: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def register(self, content_hash: str, original: str, size_bytes: int, width: int, height: int,
+                       placeholder: Optional[str] = None, dominant_color: Optional[str] = None,
+                       store: Optional[Callable[[], Awaitable[None]]] = None) -> MediaObjectModel:
+        """
+        Record an object with no references yet. A concurrent upload of the same content
+        may have registered it first; that row is returned instead.
+
+        store, which puts the object's files in place, runs while the upsert holds the
+        row lock. The garbage collector then skips the row. If it had locked the row
+        first, the upsert waits until its files and row are gone, then recreates both.
+        """
+        try:
+            stmt = insert(MediaObjectModel).values(
+                content_hash=content_hash,
+                original=original,
+                size_bytes=size_bytes,
+                width=width,
+                height=height,
+                placeholder=placeholder,
+                dominant_color=dominant_color,
+                ref_count=0,
+                updated_at=func.now()
+            )
+            result = await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[MediaObjectModel.content_hash],
+                    set_={"updated_at": func.now()}  # Restart the garbage collection grace period
+                ).returning(MediaObjectModel)
+            )
+            media = result.scalar_one()
+            if store is not None:
+                await store()
+            await self.session.commit()
+            return media
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to register media object: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save image")
+        except BaseException:
+            await self.session.rollback()
+            raise
+
+    async def acquire(self, content_hash: str) -> bool:
+        """Take a reference; False when the object has been garbage collected meanwhile"""
+        result = await self.session.execute(
+            update(MediaObjectModel)
+            .where(MediaObjectModel.content_hash == content_hash)
+            .values(ref_count=MediaObjectModel.ref_count + 1)
+        )
+        return result.rowcount > 0
+
+    async def release(self, content_hash: str) -> None:
+        await self.session.execute(
+            update(MediaObjectModel)
+            .where(MediaObjectModel.content_hash == content_hash)
+            .values(ref_count=MediaObjectModel.ref_count - 1)
+        )
+
+    async def release_for_stadium(self, stadium_id: int) -> None:
+        """Drop the references held by every image of a stadium and delete those images"""
+        references = (
+            select(ImageModel.content_hash, func.count().label("refs"))
+            .where(and_(ImageModel.stadium_id == stadium_id, ImageModel.content_hash.is_not(None)))
+            .group_by(ImageModel.content_hash)
+            .subquery()
+        )
+        await self.session.execute(
+            update(MediaObjectModel)
+            .where(MediaObjectModel.content_hash == references.c.content_hash)
+            .values(ref_count=MediaObjectModel.ref_count - references.c.refs)
+        )
+        await self.session.execute(delete(ImageModel).where(ImageModel.stadium_id == stadium_id))
+
+    async def lock_unreferenced(self, older_than: datetime, limit: int) -> List[str]:
+        """
+        Lock a batch of garbage objects until the transaction ends. Uploads of the same
+        content block on the lock, so files are never removed under a new reference.
+        """
+        result = await self.session.execute(
+            select(MediaObjectModel.content_hash)
+            .where(and_(MediaObjectModel.ref_count == 0, MediaObjectModel.updated_at < older_than))
+            .order_by(MediaObjectModel.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_objects(self, content_hashes: Sequence[str]) -> int:
+        result = await self.session.execute(
+            delete(MediaObjectModel).where(
+                and_(MediaObjectModel.content_hash.in_(content_hashes), MediaObjectModel.ref_count == 0)
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
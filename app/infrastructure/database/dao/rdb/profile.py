@@ -0,0 +1,95 @@
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app import dto
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.models.profile import UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileDAO(BaseDAO):
+    """Profiles are always returned with their user loaded, so callers never lazy-load it"""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(UserProfile, session)
+
+    async def get_profile_by_user(self, user_id: int) -> Optional[UserProfile]:
+        try:
+            result = await self.session.execute(
+                select(UserProfile)
+                .options(joinedload(UserProfile.user))
+                .where(UserProfile.user_id == user_id)
+                .execution_options(populate_existing=True)
+            )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get profile: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def create_profile(self, user_id: int) -> UserProfile:
+        """Create an empty profile unless the user already has one"""
+        try:
+            await self.session.execute(
+                insert(UserProfile).values(user_id=user_id).on_conflict_do_nothing(
+                    index_elements=[UserProfile.user_id]
+                )
+            )
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to create profile: {e}")
+            raise HTTPException(status_code=500, detail="Failed to create profile")
+        return await self.get_profile_by_user(user_id)
+
+    async def edit_profile(self, user_id: int, profile_data: dto.ProfileBase) -> UserProfile:
+        """Update the fields that were sent, creating the profile if needed. The photo is set by upload only."""
+        values = profile_data.model_dump(exclude_unset=True, exclude={"photo"})
+        if not values:
+            return await self.create_profile(user_id)
+        try:
+            await self.session.execute(
+                insert(UserProfile).values(user_id=user_id, **values).on_conflict_do_update(
+                    index_elements=[UserProfile.user_id],
+                    set_={**values, "updated_at": func.now()}
+                )
+            )
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(status_code=400, detail="Username is already taken")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to edit profile: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update profile")
+        return await self.get_profile_by_user(user_id)
+
+    async def set_photo(self, user_id: int, photo: str, thumbnails: dict) -> Optional[dict]:
+        """Point the profile at new avatar files; returns the thumbnails it replaced"""
+        try:
+            result = await self.session.execute(
+                select(UserProfile.photo_thumbnails).where(UserProfile.user_id == user_id).with_for_update()
+            )
+            previous = result.scalar_one_or_none()
+            result = await self.session.execute(
+                update(UserProfile)
+                .where(UserProfile.user_id == user_id)
+                .values(photo=photo, photo_thumbnails=thumbnails)
+            )
+            if result.rowcount == 0:
+                await self.session.execute(
+                    insert(UserProfile).values(user_id=user_id, photo=photo, photo_thumbnails=thumbnails)
+                )
+            await self.session.commit()
+            return previous
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to set profile photo: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update profile photo")
@@ -0,0 +1,320 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Collection, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, values, column, Integer, DateTime
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.settings import get_redis_connection
+from app.dto.booking import (BookingSeriesCreate, BookingSeriesUpdate, BookingSeriesResponse, BookingResponse,
+                             BookingConflict, MAX_SERIES_OCCURRENCES)
+from app.infrastructure.cache.stats import ACTIVE_STATUSES
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.dao.rdb.booking import BookingDAO, CHANGED_COLUMNS, is_overlap
+from app.infrastructure.database.models import BookingModel, BookingSeriesModel, StadiumModel
+from app.infrastructure.database.models.booking import BookingStatus
+
+logger = logging.getLogger(__name__)
+
+SERIES_EXPIRATION_SECONDS = 600
+
+
+class BookingSeriesDAO(BaseDAO):
+    """
+    Weekly booking series. Every occurrence is checked for conflicts in one query,
+    inserted with one multi-row INSERT and changed with one UPDATE; the Redis side
+    effects of all occurrences are batched.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(BookingSeriesModel, session)
+        self.bookings = BookingDAO(session)
+
+    @staticmethod
+    def _occurrences(data: BookingSeriesCreate) -> List[Tuple[datetime, datetime]]:
+        step = timedelta(weeks=data.interval_weeks)
+        occurrences = []
+        for k in range(data.occurrences or MAX_SERIES_OCCURRENCES):
+            start = data.start_time + k * step
+            if data.until is not None and start.date() > data.until:
+                break
+            occurrences.append((start, data.end_time + k * step))
+        return occurrences
+
+    async def _check_occurrences(self, stadium: StadiumModel, occurrences: Sequence[Tuple[datetime, datetime]],
+                                 series_id: Optional[int] = None, held: Collection[int] = ()) -> List[BookingConflict]:
+        _, conflicts = await self.bookings.check_requests(
+            {stadium.id: stadium}, [(stadium.id, start, end) for start, end in occurrences], series_id, held
+        )
+        return conflicts
+
+    async def create(self, data: BookingSeriesCreate, user_id: int) -> BookingSeriesResponse:
+        occurrences = self._occurrences(data)
+        requests = [(data.stadium_id, start, end) for start, end in occurrences]
+        # Held across the check and the insert, like a single booking's range
+        token = uuid.uuid4().hex
+        held = await self.bookings.hold_ranges(requests, token, all_or_nothing=not data.skip_conflicts)
+        try:
+            stadium = await self.session.get(StadiumModel, data.stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+
+            conflicts = await self._check_occurrences(stadium, occurrences, held=held)
+            if conflicts and not data.skip_conflicts:
+                raise self.bookings.conflict_error(conflicts)
+            unavailable = {conflict.index for conflict in conflicts}
+            free = [occurrence for i, occurrence in enumerate(occurrences) if i not in unavailable]
+            if not free:
+                raise self.bookings.conflict_error(conflicts)
+
+            duration_hours = (data.end_time - data.start_time).total_seconds() / 3600
+            total_price = stadium.price_per_hour * Decimal(str(duration_hours))
+
+            series = (await self.session.execute(
+                insert(BookingSeriesModel).values(
+                    user_id=user_id, stadium_id=stadium.id,
+                    interval_weeks=data.interval_weeks, occurrences=len(occurrences)
+                ).returning(BookingSeriesModel)
+            )).scalar_one()
+            result = await self.session.execute(
+                insert(BookingModel).values([{
+                    "user_id": user_id,
+                    "stadium_id": stadium.id,
+                    "series_id": series.id,
+                    "start_time": start,
+                    "end_time": end,
+                    "total_price": total_price,
+                    "notes": data.notes,
+                } for start, end in free]).returning(BookingModel)
+            )
+            bookings = sorted(result.scalars().all(), key=lambda booking: booking.start_time)
+            await self.session.commit()
+        except HTTPException:
+            await self.bookings.release_ranges(requests, token)
+            raise
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            await self.bookings.release_ranges(requests, token)
+            if is_overlap(e):
+                raise HTTPException(status_code=409, detail="Stadium not available for selected time")
+            logger.error(f"Failed to create booking series: {e}")
+            raise HTTPException(status_code=500, detail="Failed to create booking series")
+
+        await self.bookings.release_ranges([requests[i] for i in unavailable], token)
+
+        await self.bookings._after_bookings_change(bookings, "created", actor_id=user_id)
+        await self._set_series_expiration(series.id)
+        return self._response(series, bookings, conflicts)
+
+    @staticmethod
+    def _response(series: BookingSeriesModel, bookings: Sequence[BookingModel],
+                  conflicts: List[BookingConflict] = ()) -> BookingSeriesResponse:
+        return BookingSeriesResponse(
+            id=series.id,
+            stadium_id=series.stadium_id,
+            interval_weeks=series.interval_weeks,
+            bookings=[BookingResponse.model_validate(booking) for booking in bookings],
+            conflicts=list(conflicts),
+        )
+
+    async def _get_owned(self, series_id: int, user_id: int) -> BookingSeriesModel:
+        series = await self._get_by_id(series_id)
+        if not series or series.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Booking series not found or access denied")
+        return series
+
+    async def _get_bookings(self, series_id: int) -> Sequence[BookingModel]:
+        result = await self.session.execute(
+            select(BookingModel)
+            .where(BookingModel.series_id == series_id)
+            .order_by(BookingModel.start_time)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
+    async def get(self, series_id: int, user_id: int) -> BookingSeriesResponse:
+        try:
+            series = await self._get_owned(series_id, user_id)
+            return self._response(series, await self._get_bookings(series_id))
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get booking series: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def _transition(self, series_id: int, from_statuses: Sequence[BookingStatus], status: BookingStatus,
+                          upcoming_only: bool = False) -> List:
+        """
+        Move the series' bookings in from_statuses to status with one UPDATE, returning
+        the changed rows and their previous statuses. Caller commits.
+        """
+        criteria = [BookingModel.series_id == series_id, BookingModel.status.in_(from_statuses)]
+        if upcoming_only:
+            criteria.append(BookingModel.start_time > datetime.utcnow())
+        previous = (
+            select(BookingModel.id, BookingModel.status)
+            .where(*criteria)
+            .with_for_update()
+            .subquery()
+        )
+        result = await self.session.execute(
+            update(BookingModel)
+            .where(BookingModel.id == previous.c.id)
+            .values(status=status, version=BookingModel.version + 1)
+            .returning(*CHANGED_COLUMNS, previous.c.status.label("previous_status"))
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    async def _change_status(self, series_id: int, from_statuses: Sequence[BookingStatus],
+                             status: BookingStatus, upcoming_only: bool = False,
+                             actor_id: Optional[int] = None) -> List:
+        try:
+            rows = await self._transition(series_id, from_statuses, status, upcoming_only)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update booking series status: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update booking series")
+        await self.bookings._after_bookings_change(rows, status.value, [row.previous_status for row in rows],
+                                                   actor_id)
+        return rows
+
+    async def confirm(self, series_id: int, user_id: int) -> BookingSeriesResponse:
+        series = await self._get_owned(series_id, user_id)
+        await self._change_status(series_id, [BookingStatus.PENDING], BookingStatus.CONFIRMED, actor_id=user_id)
+        try:
+            redis_client = await get_redis_connection()
+            await redis_client.delete(f"booking_series_expiration:{series_id}")
+        except Exception as e:
+            logger.error(f"Failed to clear booking series expiration: {e}")
+        return await self.get(series.id, user_id)
+
+    async def cancel(self, series_id: int, user_id: int) -> BookingSeriesResponse:
+        """Cancel every upcoming active occurrence; past ones are left as they are"""
+        series = await self._get_owned(series_id, user_id)
+        await self._change_status(series_id, list(ACTIVE_STATUSES), BookingStatus.CANCELLED, upcoming_only=True,
+                                  actor_id=user_id)
+        return await self.get(series.id, user_id)
+
+    async def edit(self, series_id: int, data: BookingSeriesUpdate, user_id: int) -> BookingSeriesResponse:
+        """
+        Change the times and/or notes of every upcoming active occurrence in one UPDATE.
+        New times are held in Redis across the check and the UPDATE; occurrences that
+        stopped being active meanwhile are left alone and reported as conflicts.
+        """
+        requests, token = [], uuid.uuid4().hex
+        try:
+            series = await self._get_owned(series_id, user_id)
+            result = await self.session.execute(
+                select(BookingModel)
+                .where(
+                    BookingModel.series_id == series_id,
+                    BookingModel.status.in_(ACTIVE_STATUSES),
+                    BookingModel.start_time > datetime.utcnow(),
+                )
+                .order_by(BookingModel.start_time)
+            )
+            upcoming = result.scalars().all()
+            if not upcoming:
+                raise HTTPException(status_code=400, detail="Booking series has no upcoming bookings")
+
+            changes = {}
+            if data.notes is not None:
+                changes["notes"] = data.notes
+            if data.start_time is not None:
+                stadium = await self.session.get(StadiumModel, series.stadium_id)
+                occurrences = []
+                for booking in upcoming:
+                    start = datetime.combine(booking.start_time.date(), data.start_time)
+                    end = datetime.combine(booking.start_time.date(), data.end_time)
+                    if end <= start:
+                        end += timedelta(days=1)
+                    occurrences.append((start, end))
+                requests = [(stadium.id, start, end) for start, end in occurrences]
+                held = await self.bookings.hold_ranges(requests, token)
+                conflicts = await self._check_occurrences(stadium, occurrences, series_id, held)
+                if conflicts:
+                    raise self.bookings.conflict_error(conflicts)
+
+                # Dashboard revenue of confirmed occurrences catches up at the next stats reconcile
+                duration_hours = (occurrences[0][1] - occurrences[0][0]).total_seconds() / 3600
+                changes["total_price"] = stadium.price_per_hour * Decimal(str(duration_hours))
+                ranges = values(
+                    column("id", Integer), column("start_time", DateTime), column("end_time", DateTime),
+                    name="new_times"
+                ).data([(booking.id, start, end) for booking, (start, end) in zip(upcoming, occurrences)])
+                statement = (
+                    update(BookingModel)
+                    .where(BookingModel.id == ranges.c.id)
+                    .values(start_time=ranges.c.start_time, end_time=ranges.c.end_time,
+                            version=BookingModel.version + 1, **changes)
+                )
+            elif changes:
+                statement = (
+                    update(BookingModel)
+                    .where(BookingModel.id.in_([booking.id for booking in upcoming]))
+                    .values(version=BookingModel.version + 1, **changes)
+                )
+            else:
+                return self._response(series, await self._get_bookings(series_id))
+
+            result = await self.session.execute(
+                statement.where(BookingModel.status.in_(ACTIVE_STATUSES))
+                .returning(*CHANGED_COLUMNS).execution_options(synchronize_session=False)
+            )
+            changed = result.all()
+            await self.session.commit()
+        except HTTPException:
+            await self.bookings.release_ranges(requests, token)
+            raise
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            await self.bookings.release_ranges(requests, token)
+            if is_overlap(e):
+                raise HTTPException(status_code=409, detail="Stadium not available for selected time")
+            logger.error(f"Failed to edit booking series: {e}")
+            raise HTTPException(status_code=500, detail="Failed to edit booking series")
+
+        changed_ids = {row.id for row in changed}
+        skipped = [BookingConflict(index=i, stadium_id=booking.stadium_id, start_time=booking.start_time,
+                                   end_time=booking.end_time, reason="not_active")
+                   for i, booking in enumerate(upcoming) if booking.id not in changed_ids]
+        if skipped and requests:
+            await self.bookings.release_ranges([requests[conflict.index] for conflict in skipped], token)
+
+        # Both the old and the new times of each occurrence
+        before = [booking for booking in upcoming if booking.id in changed_ids]
+        await self.bookings._after_bookings_change([*before, *changed], "updated", actor_id=user_id)
+        if requests:
+            # Old times no occurrence took over are free for the waitlist
+            taken = {(row.stadium_id, row.start_time, row.end_time) for row in changed}
+            await self.bookings.free_ranges([
+                (booking.stadium_id, booking.start_time, booking.end_time) for booking in before
+                if (booking.stadium_id, booking.start_time, booking.end_time) not in taken
+            ])
+        return self._response(series, await self._get_bookings(series_id), skipped)
+
+    async def _set_series_expiration(self, series_id: int):
+        """Expire the series' still pending bookings together, like a single booking's expiration"""
+        try:
+            redis_client = await get_redis_connection()
+            await redis_client.setex(f"booking_series_expiration:{series_id}", SERIES_EXPIRATION_SECONDS, "pending")
+            asyncio.create_task(self._check_series_expiration(series_id))
+        except Exception as e:
+            logger.error(f"Failed to set booking series expiration in Redis: {e}")
+
+    async def _check_series_expiration(self, series_id: int):
+        try:
+            await asyncio.sleep(SERIES_EXPIRATION_SECONDS)
+            redis_client = await get_redis_connection()
+            expiration_key = f"booking_series_expiration:{series_id}"
+            if await redis_client.exists(expiration_key):
+                rows = await self._change_status(series_id, [BookingStatus.PENDING], BookingStatus.EXPIRED)
+                logger.info(f"Expired {len(rows)} bookings of series {series_id} due to no confirmation")
+                await redis_client.delete(expiration_key)
+        except Exception as e:
+            logger.error(f"Failed to check booking series expiration: {e}")
@@ -1,26 +1,38 @@
-from datetime import date, timedelta, datetime
-from typing import Union, Sequence, Optional
+from datetime import date, timedelta, datetime, time
+from typing import Union, Sequence, Optional, Tuple, Set
 
 from fastapi import HTTPException
 from pydantic import parse_obj_as
-from sqlalchemy import insert, select, update, func, and_
+from sqlalchemy import insert, select, update, func, and_, or_, delete
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.dto import StadiumCreate, StadiumUpdate
 from app.dto.stadium2 import StadiumAvailabilityResponse, WeeklyAvailability, HourlyAvailability, \
-    HourlyAvailabilityResponse
+    HourlyAvailabilityResponse, DailyOccupancy, StadiumCalendarResponse, FreeWindow, FreeWindowsResponse, \
+    WeekdaySchedule, ScheduleException, StadiumScheduleUpdate, StadiumScheduleResponse
+from app.api.dependencies.settings import get_redis_binary_connection, get_redis_connection
 from app.infrastructure.database.dao.rdb import UserDAO
 from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.dao.rdb.media import MediaDAO
 from app.infrastructure.database.models import StadiumModel, BookingModel, UserModel
 from app import dto
 import logging
 
 from app.infrastructure.database.models.booking import BookingStatus, AvailabilityStatus
-from app.infrastructure.database.models.stadium import stadium_admins
+from app.infrastructure.cache import StadiumVersions, AdminStats, StadiumLeaderboard
+from app.infrastructure.database.models.stadium import stadium_admins, StadiumScheduleModel, \
+    StadiumScheduleExceptionModel
+from app.infrastructure.scheduling import SlotBitset, AvailabilityBitsetCache, SlotTemplate, DaySlots, \
+    get_cached_template, cache_template, invalidate_template
 
 logger = logging.getLogger(__name__)
 
+MAX_CALENDAR_DAYS = 62
+# Stadium columns the compiled slot template depends on
+SCHEDULE_FIELDS = {"opening_hour", "closing_hour", "slot_minutes"}
+
 
 class StadiumDAO(BaseDAO):
     def __init__(self, session: AsyncSession):
@@ -33,54 +45,310 @@ class StadiumDAO(BaseDAO):
                 insert(StadiumModel).values(**stadium_dict, owner_id=owner_id).returning(StadiumModel)
             )
             await self.session.commit()
-            return result.scalar()
+            stadium = result.scalar()
+            await self._bump_version()
+            await self._record_stats(1)
+            return stadium
         except SQLAlchemyError as e:
             await self.session.rollback()
             logger.error(f"Failed to create stadium: {e}")
             raise HTTPException(status_code=500, detail="Failed to create stadium")
 
-    async def update(self, stadium_id: int, stadium_data: StadiumUpdate, user: UserModel) -> Optional[StadiumModel]:
+    async def _bump_version(self, stadium_id: Optional[int] = None, version: Optional[int] = None) -> None:
+        """Invalidate conditional-GET validators; a stadium change also changes listings"""
+        try:
+            versions = StadiumVersions(await get_redis_connection())
+            if stadium_id is None:
+                await versions.bump_list()
+            else:
+                await versions.bump_stadium(stadium_id, version)
+        except Exception as e:
+            logger.error(f"Failed to bump stadium version: {e}")
+
+    async def remember_version(self, stadium: StadiumModel) -> None:
+        """Let conditional GETs of the stadium be answered from Redis once its version was read"""
+        try:
+            await StadiumVersions(await get_redis_connection()).remember(stadium.id, stadium.version)
+        except Exception as e:
+            logger.error(f"Failed to remember stadium version: {e}")
+
+    async def _record_stats(self, delta: int) -> None:
+        try:
+            await AdminStats(await get_redis_connection()).record_stadium(delta)
+        except Exception as e:
+            logger.error(f"Failed to update admin stats: {e}")
+
+    async def _update_leaderboard(self, stadium_id: int, district: str, new_district: Optional[str] = None) -> None:
+        """Drop a deleted stadium from the trending leaderboard, or follow its move to another district"""
+        try:
+            leaderboard = StadiumLeaderboard(await get_redis_connection())
+            if new_district is None:
+                await leaderboard.remove(stadium_id, district)
+            else:
+                await leaderboard.move(stadium_id, district, new_district)
+        except Exception as e:
+            logger.error(f"Failed to update trending leaderboard: {e}")
+
+    async def get_with_images(self, stadium_id: int) -> Optional[StadiumModel]:
+        try:
+            result = await self.session.execute(
+                select(StadiumModel)
+                .where(StadiumModel.id == stadium_id)
+                .options(selectinload(StadiumModel.images))
+            )
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadium with images: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def delete(self, stadium_id: int) -> bool:
+        try:
+            result = await self.session.execute(select(StadiumModel.district).where(StadiumModel.id == stadium_id))
+            district = result.scalar_one_or_none()
+            # Images go first (FK); their media objects are reclaimed by the garbage collector
+            await MediaDAO(self.session).release_for_stadium(stadium_id)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to release stadium images: {e}")
+            raise HTTPException(status_code=500, detail="Failed to delete record")
+        deleted = await self._delete(stadium_id)
+        if deleted:
+            invalidate_template(stadium_id)
+            await self._bump_version(stadium_id)
+            await self._record_stats(-1)
+            await self._update_leaderboard(stadium_id, district)
+        return deleted
+
+    async def update(self, stadium_id: int, stadium_data: StadiumUpdate, user: UserModel,
+                     if_match: Optional[Set[int]] = None) -> StadiumModel:
+        """
+        Apply the given fields. With if_match (versions from If-Match) the UPDATE only
+        applies to one of those versions, so a concurrent edit fails with 412 instead of
+        being overwritten.
+        """
         try:
             existing = await self._get_by_id(stadium_id)
             if not existing:
                 raise HTTPException(status_code=404, detail="Stadium not found")
 
-            # Check if user is owner, admin of this stadium, or super admin
-            is_owner = existing.owner_id == user.id
-            is_super_admin = user.role == "admin"
-
-            # Check if user is admin of this stadium
-            is_stadium_admin = False
-            if not (is_owner or is_super_admin):
-                admin_check = await self.session.execute(
-                    select(stadium_admins).where(
-                        and_(
-                            stadium_admins.c.user_id == user.id,
-                            stadium_admins.c.stadium_id == stadium_id
-                        )
-                    )
-                )
-                is_stadium_admin = admin_check.fetchone() is not None
-
-            if not (is_owner or is_super_admin or is_stadium_admin):
-                raise HTTPException(status_code=403, detail="Access denied")
+            await self._ensure_can_manage(existing, user)
+            if if_match is not None and existing.version not in if_match:
+                raise self.precondition_failed()
 
             update_data = {k: v for k, v in stadium_data.model_dump().items() if v is not None}
             if not update_data:
                 return existing
+            green = update_data.get("availability_green_max", existing.availability_green_max)
+            yellow = update_data.get("availability_yellow_max", existing.availability_yellow_max)
+            if green > yellow:
+                raise HTTPException(
+                    status_code=400, detail="availability_green_max must not exceed availability_yellow_max"
+                )
+            if SCHEDULE_FIELDS & update_data.keys():
+                update_data["schedule_version"] = StadiumModel.schedule_version + 1
+            old_district = existing.district
 
-            await self.session.execute(
+            criteria = [StadiumModel.id == stadium_id]
+            if if_match is not None:
+                criteria.append(StadiumModel.version.in_(if_match))
+            result = await self.session.execute(
                 update(StadiumModel)
-                .where(StadiumModel.id == stadium_id)
-                .values(**update_data)
+                .where(*criteria)
+                .values(**update_data, version=StadiumModel.version + 1)
+                .returning(StadiumModel)
+                .execution_options(synchronize_session=False, populate_existing=True)
             )
+            stadium = result.scalar_one_or_none()
+            if stadium is None:
+                # Changed or deleted since it was read above
+                if if_match is not None:
+                    raise self.precondition_failed()
+                raise HTTPException(status_code=404, detail="Stadium not found")
             await self.session.commit()
-            return await self._get_by_id(stadium_id)
         except SQLAlchemyError as e:
             await self.session.rollback()
             logger.error(f"Failed to update stadium: {e}")
             raise HTTPException(status_code=500, detail="Failed to update stadium")
 
+        await self._bump_version(stadium_id, stadium.version)
+        if stadium.district != old_district:
+            await self._update_leaderboard(stadium_id, old_district, stadium.district)
+        return stadium
+
+    @staticmethod
+    def precondition_failed() -> HTTPException:
+        return HTTPException(status_code=412, detail="Stadium was changed since it was read, fetch it again")
+
+    async def _touch(self, stadium_id: int, schedule: bool = False) -> int:
+        """
+        Bump the row version for a change to the stadium's schedule or images (and the
+        schedule_version with schedule). Returns the new version; caller commits.
+        """
+        changes = {"version": StadiumModel.version + 1}
+        if schedule:
+            changes["schedule_version"] = StadiumModel.schedule_version + 1
+        result = await self.session.execute(
+            update(StadiumModel)
+            .where(StadiumModel.id == stadium_id)
+            .values(**changes)
+            .returning(StadiumModel.version)
+        )
+        return result.scalar_one()
+
+    async def _ensure_can_manage(self, stadium: StadiumModel, user: UserModel) -> None:
+        """Owner, admin of this stadium, or super admin"""
+        if stadium.owner_id == user.id or user.role == "admin":
+            return
+
+        admin_check = await self.session.execute(
+            select(stadium_admins).where(
+                and_(
+                    stadium_admins.c.user_id == user.id,
+                    stadium_admins.c.stadium_id == stadium.id
+                )
+            )
+        )
+        if admin_check.fetchone() is None:
+            raise HTTPException(status_code=403, detail="Access denied")
+
+    async def get_slot_template(self, stadium: StadiumModel) -> SlotTemplate:
+        """Compiled opening schedule; rebuilt only when the stadium's schedule_version changes"""
+        template = get_cached_template(stadium.id, stadium.schedule_version or 1)
+        if template is not None:
+            return template
+
+        schedules = await self.session.execute(
+            select(StadiumScheduleModel).where(StadiumScheduleModel.stadium_id == stadium.id)
+        )
+        exceptions = await self.session.execute(
+            select(StadiumScheduleExceptionModel).where(
+                and_(
+                    StadiumScheduleExceptionModel.stadium_id == stadium.id,
+                    StadiumScheduleExceptionModel.date >= date.today() - timedelta(days=1)
+                )
+            )
+        )
+        template = SlotTemplate.compile(stadium, schedules.scalars().all(), exceptions.scalars().all())
+        cache_template(template)
+        return template
+
+    async def get_schedule(self, stadium_id: int) -> StadiumScheduleResponse:
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+
+            schedules = await self.session.execute(
+                select(StadiumScheduleModel)
+                .where(StadiumScheduleModel.stadium_id == stadium_id)
+                .order_by(StadiumScheduleModel.weekday)
+            )
+            exceptions = await self.session.execute(
+                select(StadiumScheduleExceptionModel)
+                .where(
+                    and_(
+                        StadiumScheduleExceptionModel.stadium_id == stadium_id,
+                        StadiumScheduleExceptionModel.date >= date.today()
+                    )
+                )
+                .order_by(StadiumScheduleExceptionModel.date)
+            )
+            return StadiumScheduleResponse(
+                stadium_id=stadium_id,
+                slot_minutes=stadium.slot_minutes or 60,
+                default_opening_hour=stadium.opening_hour,
+                default_closing_hour=stadium.closing_hour,
+                weekdays=[WeekdaySchedule.model_validate(row) for row in schedules.scalars().all()],
+                exceptions=[ScheduleException.model_validate(row) for row in exceptions.scalars().all()]
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadium schedule: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def set_weekly_schedule(self, stadium_id: int, schedule: StadiumScheduleUpdate,
+                                  user: UserModel) -> StadiumScheduleResponse:
+        """Replace the per-weekday schedule; weekdays left out fall back to the default hours"""
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+            await self._ensure_can_manage(stadium, user)
+
+            await self.session.execute(
+                delete(StadiumScheduleModel).where(StadiumScheduleModel.stadium_id == stadium_id)
+            )
+            if schedule.weekdays:
+                await self.session.execute(
+                    insert(StadiumScheduleModel),
+                    [{**day.model_dump(), "stadium_id": stadium_id} for day in schedule.weekdays]
+                )
+            version = await self._touch(stadium_id, schedule=True)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update stadium schedule: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update stadium schedule")
+        invalidate_template(stadium_id)
+        await self._bump_version(stadium_id, version)
+        return await self.get_schedule(stadium_id)
+
+    async def set_schedule_exception(self, stadium_id: int, exception: ScheduleException,
+                                     user: UserModel) -> StadiumScheduleResponse:
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+            await self._ensure_can_manage(stadium, user)
+
+            await self.session.execute(
+                delete(StadiumScheduleExceptionModel).where(
+                    and_(
+                        StadiumScheduleExceptionModel.stadium_id == stadium_id,
+                        StadiumScheduleExceptionModel.date == exception.date
+                    )
+                )
+            )
+            await self.session.execute(
+                insert(StadiumScheduleExceptionModel).values(**exception.model_dump(), stadium_id=stadium_id)
+            )
+            version = await self._touch(stadium_id, schedule=True)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to set schedule exception: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update stadium schedule")
+        invalidate_template(stadium_id)
+        await self._bump_version(stadium_id, version)
+        return await self.get_schedule(stadium_id)
+
+    async def delete_schedule_exception(self, stadium_id: int, exception_date: date,
+                                        user: UserModel) -> StadiumScheduleResponse:
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+            await self._ensure_can_manage(stadium, user)
+
+            result = await self.session.execute(
+                delete(StadiumScheduleExceptionModel).where(
+                    and_(
+                        StadiumScheduleExceptionModel.stadium_id == stadium_id,
+                        StadiumScheduleExceptionModel.date == exception_date
+                    )
+                )
+            )
+            if result.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Schedule exception not found")
+            version = await self._touch(stadium_id, schedule=True)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to delete schedule exception: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update stadium schedule")
+        invalidate_template(stadium_id)
+        await self._bump_version(stadium_id, version)
+        return await self.get_schedule(stadium_id)
+
     async def get_by_owner(self, owner_id: int, skip: int = 0, limit: int = 10):
         try:
             result = await self.session.execute(
@@ -93,6 +361,68 @@ class StadiumDAO(BaseDAO):
             logger.error(f"Failed to get stadiums by owner: {e}")
             raise HTTPException(status_code=500, detail="Database error occurred")
 
+    @staticmethod
+    def _filter_predicates(search: Optional[str] = None, status: Optional[str] = None) -> list:
+        """Admin listing filters: search matches name, address or district; status is active or inactive"""
+        predicates = []
+        if search:
+            pattern = f"%{search}%"
+            predicates.append(or_(StadiumModel.name.ilike(pattern), StadiumModel.address.ilike(pattern),
+                                  StadiumModel.district.ilike(pattern)))
+        if status is not None:
+            if status not in ("active", "inactive"):
+                raise HTTPException(status_code=400, detail="Status must be 'active' or 'inactive'")
+            predicates.append(StadiumModel.is_active.is_(status == "active"))
+        return predicates
+
+    async def get_all_with_filters(self, skip: int = 0, limit: int = 100, search: Optional[str] = None,
+                                   status: Optional[str] = None) -> Sequence[StadiumModel]:
+        """Stadiums for the admin listing, oldest first"""
+        predicates = self._filter_predicates(search, status)
+        try:
+            result = await self.session.execute(
+                select(StadiumModel).where(*predicates).order_by(StadiumModel.id).offset(skip).limit(limit)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get stadiums with filters: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def count_with_filters(self, search: Optional[str] = None, status: Optional[str] = None) -> int:
+        predicates = self._filter_predicates(search, status)
+        try:
+            result = await self.session.execute(select(func.count(StadiumModel.id)).where(*predicates))
+            return result.scalar_one()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to count stadiums with filters: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def _get_daily_booking_stats(self, stadium_id: int, start_date: date, end_date: date) -> dict:
+        """
+        Aggregate active bookings per day for [start_date, end_date] in a single range scan.
+        Returns {date: (booking_count, booked_hours)}; days without bookings are absent.
+        """
+        booking_day = func.date(BookingModel.start_time).label("booking_day")
+        result = await self.session.execute(
+            select(
+                booking_day,
+                func.count(BookingModel.id),
+                func.coalesce(
+                    func.sum(func.extract("epoch", BookingModel.end_time - BookingModel.start_time)), 0
+                ) / 3600
+            )
+            .where(
+                and_(
+                    BookingModel.stadium_id == stadium_id,
+                    BookingModel.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+                    BookingModel.start_time >= datetime.combine(start_date, time.min),
+                    BookingModel.start_time < datetime.combine(end_date + timedelta(days=1), time.min)
+                )
+            )
+            .group_by(booking_day)
+        )
+        return {row[0]: (row[1], float(row[2])) for row in result.all()}
+
     async def get_weekly_availability(self, stadium_id: int) -> StadiumAvailabilityResponse:
         try:
             stadium = await self._get_by_id(stadium_id)
@@ -101,46 +431,25 @@ class StadiumDAO(BaseDAO):
 
             # Get next 7 days starting from tomorrow
             start_date = date.today() + timedelta(days=1)
-            weekly_data = []
+            end_date = start_date + timedelta(days=6)
+            daily_stats = await self._get_daily_booking_stats(stadium_id, start_date, end_date)
+            template = await self.get_slot_template(stadium)
 
+            weekly_data = []
             for i in range(7):
                 current_date = start_date + timedelta(days=i)
-                weekday_name = current_date.strftime("%A")
-
-                # Get bookings count for this date
-                result = await self.session.execute(
-                    select(func.count(BookingModel.id))
-                    .where(
-                        and_(
-                            BookingModel.stadium_id == stadium_id,
-                            BookingModel.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-                            func.date(BookingModel.start_time) == current_date
-                        )
-                    )
-                )
-                booking_count = result.scalar() or 0
-
-                # Calculate available slots (assuming 1-hour slots from opening to closing)
-                opening_time = datetime.strptime(stadium.opening_hour, "%H:%M").time()
-                closing_time = datetime.strptime(stadium.closing_hour, "%H:%M").time()
-                total_hours = (datetime.combine(current_date, closing_time) -
-                               datetime.combine(current_date, opening_time)).seconds // 3600
-                available_slots = max(0, total_hours - booking_count)
-
-                # Determine status based on booking count
-                if booking_count <= 2:
-                    status = AvailabilityStatus.GREEN
-                elif booking_count <= 5:
-                    status = AvailabilityStatus.YELLOW
-                else:
-                    status = AvailabilityStatus.RED
+                booking_count, _ = daily_stats.get(current_date, (0, 0.0))
+                day_slots = template.for_date(current_date)
+                total_hours = day_slots.minutes // 60 if day_slots else 0
 
                 weekly_data.append(WeeklyAvailability(
                     date=current_date,
-                    weekday=weekday_name,
-                    status=status,
+                    weekday=current_date.strftime("%A"),
+                    status=AvailabilityStatus.from_booking_count(
+                        booking_count, stadium.availability_green_max, stadium.availability_yellow_max
+                    ),
                     booking_count=booking_count,
-                    available_slots=available_slots
+                    available_slots=max(0, total_hours - booking_count)
                 ))
 
             return StadiumAvailabilityResponse(
@@ -152,74 +461,154 @@ class StadiumDAO(BaseDAO):
             logger.error(f"Failed to get weekly availability: {e}")
             raise HTTPException(status_code=500, detail="Database error occurred")
 
-    async def get_hourly_availability(self, stadium_id: int, target_date: date) -> HourlyAvailabilityResponse:
+    async def get_calendar_availability(self, stadium_id: int, start_date: date,
+                                        end_date: date) -> StadiumCalendarResponse:
+        """Per-day occupancy heatmap for an arbitrary (capped) date range"""
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+        if (end_date - start_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_CALENDAR_DAYS} days")
+
         try:
             stadium = await self._get_by_id(stadium_id)
             if not stadium:
                 raise HTTPException(status_code=404, detail="Stadium not found")
 
-            # Don't allow checking past dates
-            if target_date < date.today():
-                raise HTTPException(status_code=400, detail="Cannot check availability for past dates")
+            daily_stats = await self._get_daily_booking_stats(stadium_id, start_date, end_date)
+            template = await self.get_slot_template(stadium)
 
-            # Get all bookings for the target date
-            result = await self.session.execute(
-                select(BookingModel.start_time, BookingModel.end_time)
-                .where(
-                    and_(
-                        BookingModel.stadium_id == stadium_id,
-                        BookingModel.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
-                        func.date(BookingModel.start_time) == target_date
-                    )
-                )
+            days = []
+            for i in range((end_date - start_date).days + 1):
+                current_date = start_date + timedelta(days=i)
+                booking_count, booked_hours = daily_stats.get(current_date, (0, 0.0))
+                day_slots = template.for_date(current_date)
+                total_hours = day_slots.minutes / 60 if day_slots else 0
+                days.append(DailyOccupancy(
+                    date=current_date,
+                    weekday=current_date.strftime("%A"),
+                    status=AvailabilityStatus.from_booking_count(
+                        booking_count, stadium.availability_green_max, stadium.availability_yellow_max
+                    ),
+                    booking_count=booking_count,
+                    booked_hours=round(booked_hours, 2),
+                    occupancy_rate=round(min(1.0, booked_hours / total_hours), 4) if total_hours else 0.0
+                ))
+
+            return StadiumCalendarResponse(
+                stadium_id=stadium_id,
+                stadium_name=stadium.name,
+                start_date=start_date,
+                end_date=end_date,
+                days=days
             )
-            bookings = result.fetchall()
-            print("Bookins for the week", bookings)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get calendar availability: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
 
-            # Parse stadium operating hours
-            opening_time = datetime.strptime(stadium.opening_hour, "%H:%M").time()
-            closing_time = datetime.strptime(stadium.closing_hour, "%H:%M").time()
+    async def _get_day_bitset(self, stadium: StadiumModel,
+                              target_date: date) -> Tuple[SlotBitset, Optional[DaySlots]]:
+        """Occupancy of one stadium-day as a SlotBitset, served from Redis when cached"""
+        day_slots = (await self.get_slot_template(stadium)).for_date(target_date)
+        if day_slots is None:
+            return SlotBitset(0), None
+
+        slot_minutes = day_slots.slot_minutes
+        day_open, day_close = day_slots.bounds(target_date)
+        size = day_slots.size
+        open_minute = day_slots.open_minute
+
+        cache = AvailabilityBitsetCache(await get_redis_binary_connection())
+        bitset, generation = await cache.get(stadium.id, target_date, slot_minutes, open_minute, size)
+        if bitset is not None:
+            return bitset, day_slots
+
+        result = await self.session.execute(
+            select(BookingModel.start_time, BookingModel.end_time)
+            .where(
+                and_(
+                    BookingModel.stadium_id == stadium.id,
+                    BookingModel.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+                    BookingModel.start_time < day_close,
+                    BookingModel.end_time > day_open
+                )
+            )
+        )
 
-            # Generate hourly slots
-            hourly_data = []
-            current_hour = datetime.combine(target_date, opening_time)
-            end_datetime = datetime.combine(target_date, closing_time)
+        bitset = SlotBitset(size)
+        slot_seconds = slot_minutes * 60
+        for booking_start, booking_end in result.all():
+            # A slot is busy if the booking overlaps any part of it
+            first = int((booking_start - day_open).total_seconds() // slot_seconds)
+            last = -int(-(booking_end - day_open).total_seconds() // slot_seconds)
+            bitset.mark_busy(first, last)
 
-            while current_hour < end_datetime:
-                slot_end = current_hour + timedelta(hours=1)
+        await cache.set(stadium.id, target_date, slot_minutes, open_minute, bitset, generation)
+        return bitset, day_slots
 
-                # Check if this hour slot conflicts with any booking
-                is_booked = False
-                for booking in bookings:
-                    booking_start = booking.start_time
-                    booking_end = booking.end_time
+    async def get_hourly_availability(self, stadium_id: int, target_date: date) -> HourlyAvailabilityResponse:
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
 
-                    # Check for overlap: slot overlaps with booking if:
-                    # slot_start < booking_end AND slot_end > booking_start
-                    if current_hour < booking_end and slot_end > booking_start:
-                        is_booked = True
-                        break
+            # Don't allow checking past dates
+            if target_date < date.today():
+                raise HTTPException(status_code=400, detail="Cannot check availability for past dates")
 
-                # Determine status: GREEN if available, RED if booked
-                status = AvailabilityStatus.RED if is_booked else AvailabilityStatus.GREEN
+            bitset, day_slots = await self._get_day_bitset(stadium, target_date)
 
+            hourly_data = []
+            for index in range(bitset.size):
+                is_available = bitset.is_free(index)
                 hourly_data.append(HourlyAvailability(
-                    hour=current_hour.strftime("%H:%M"),
-                    status=status,
-                    is_available=not is_booked
+                    hour=day_slots.labels[index],
+                    status=AvailabilityStatus.GREEN if is_available else AvailabilityStatus.RED,
+                    is_available=is_available
                 ))
 
-                current_hour = slot_end
-
             return HourlyAvailabilityResponse(
                 stadium_id=stadium_id,
                 stadium_name=stadium.name,
                 date=target_date,
                 hourly_availability=hourly_data,
-                total_slots=len(hourly_data),
-                available_slots=sum(1 for slot in hourly_data if slot.is_available)
+                total_slots=bitset.size,
+                available_slots=bitset.free_count(),
+                slot_minutes=stadium.slot_minutes or 60
             )
 
         except SQLAlchemyError as e:
             logger.error(f"Failed to get hourly availability: {e}")
-            raise HTTPException(status_code=500, detail="Database error occurred")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def get_free_windows(self, stadium_id: int, target_date: date, min_minutes: int = 0) -> FreeWindowsResponse:
+        try:
+            stadium = await self._get_by_id(stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+
+            if target_date < date.today():
+                raise HTTPException(status_code=400, detail="Cannot check availability for past dates")
+
+            bitset, day_slots = await self._get_day_bitset(stadium, target_date)
+            slot_minutes = stadium.slot_minutes or 60
+
+            def to_window(first: int, last: int) -> FreeWindow:
+                day_open, _ = day_slots.bounds(target_date)
+                return FreeWindow(
+                    start=(day_open + timedelta(minutes=first * slot_minutes)).strftime("%H:%M"),
+                    end=(day_open + timedelta(minutes=last * slot_minutes)).strftime("%H:%M"),
+                    minutes=(last - first) * slot_minutes
+                )
+
+            min_slots = max(1, -(-min_minutes // slot_minutes))
+            longest = bitset.longest_free_window()
+            return FreeWindowsResponse(
+                stadium_id=stadium_id,
+                date=target_date,
+                slot_minutes=slot_minutes,
+                free_windows=[to_window(first, last) for first, last in bitset.free_ranges(min_slots)],
+                longest_free_window=to_window(*longest) if longest[1] > longest[0] else None
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get free windows: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
@@ -0,0 +1,139 @@
+import logging
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.settings import get_redis_connection
+from app.infrastructure.cache import AdminStats, StadiumLeaderboard
+from app.infrastructure.cache.leaderboard import HALF_LIFE
+from app.infrastructure.cache.stats import ACTIVE_STATUSES, REVENUE_STATUSES, month_key, to_cents
+from app.infrastructure.database.models import StadiumModel, BookingModel, UserModel
+
+logger = logging.getLogger(__name__)
+
+POPULAR_STADIUMS = 5
+
+
+class StatsDAO:
+    """Admin dashboard statistics and the trending leaderboard, served from Redis"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def compute_admin_stats(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Exact aggregates from Postgres: (totals, revenue cents per month)"""
+        try:
+            result = await self.session.execute(select(
+                select(func.count(StadiumModel.id)).scalar_subquery().label("total_stadiums"),
+                select(func.count(UserModel.id)).scalar_subquery().label("total_users"),
+                select(func.count(BookingModel.id)).scalar_subquery().label("total_bookings"),
+                select(func.count(BookingModel.id))
+                .where(BookingModel.status.in_(ACTIVE_STATUSES))
+                .scalar_subquery().label("active_bookings"),
+            ))
+            totals = dict(result.one()._mapping)
+
+            month = func.to_char(BookingModel.start_time, "YYYY-MM")
+            result = await self.session.execute(
+                select(month, func.sum(BookingModel.total_price))
+                .where(BookingModel.status.in_(REVENUE_STATUSES))
+                .group_by(month)
+            )
+            revenue = {key: to_cents(amount) for key, amount in result.all()}
+            return totals, revenue
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to compute admin stats: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def reconcile(self) -> None:
+        """Replace the Redis aggregates with exact values"""
+        await AdminStats(await get_redis_connection()).replace(*await self.compute_admin_stats())
+
+    async def compute_leaderboard(self, landmark: float) -> List[Tuple[int, str, float]]:
+        """Decayed confirmed bookings per stadium, (stadium_id, district, score), for a landmark"""
+        weight = func.power(2, (func.extract("epoch", BookingModel.created_at) - landmark) / HALF_LIFE)
+        try:
+            result = await self.session.execute(
+                select(StadiumModel.id, StadiumModel.district, func.sum(weight))
+                .join(BookingModel, BookingModel.stadium_id == StadiumModel.id)
+                .where(BookingModel.status.in_(REVENUE_STATUSES))
+                .group_by(StadiumModel.id, StadiumModel.district)
+            )
+            return [(stadium_id, district, float(score)) for stadium_id, district, score in result.all()]
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to compute trending leaderboard: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def rebuild_leaderboard(self) -> int:
+        """Recompute the trending leaderboard from Postgres with a fresh landmark; returns the stadium count"""
+        landmark = int(time.time())
+        scores = await self.compute_leaderboard(landmark)
+        await StadiumLeaderboard(await get_redis_connection()).replace(landmark, scores)
+        return len(scores)
+
+    async def get_trending(self, district: Optional[str] = None,
+                           limit: int = 10) -> List[Tuple[StadiumModel, float]]:
+        """Top stadiums by decayed confirmed bookings, with their scores"""
+        top = await StadiumLeaderboard(await get_redis_connection()).top(district, limit)
+        if not top:
+            return []
+        try:
+            result = await self.session.execute(
+                select(StadiumModel).where(StadiumModel.id.in_([stadium_id for stadium_id, _ in top]))
+            )
+            stadiums = {stadium.id: stadium for stadium in result.scalars().all()}
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get trending stadiums: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+        return [(stadiums[stadium_id], score) for stadium_id, score in top if stadium_id in stadiums]
+
+    async def _booking_counts(self, stadium_ids: List[int]) -> Dict[int, int]:
+        """All-time bookings per stadium, for the few stadiums listed on the dashboard"""
+        if not stadium_ids:
+            return {}
+        try:
+            result = await self.session.execute(
+                select(BookingModel.stadium_id, func.count(BookingModel.id))
+                .where(BookingModel.stadium_id.in_(stadium_ids))
+                .group_by(BookingModel.stadium_id)
+            )
+            return dict(result.all())
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to count popular stadium bookings: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def get_admin_stats(self) -> dict:
+        this_month = month_key(datetime.now())
+        try:
+            stats = AdminStats(await get_redis_connection())
+            current = await stats.get(this_month)
+            if current is None:
+                await self.reconcile()
+                current = await stats.get(this_month)
+            totals, revenue = current
+            popular = await self.get_trending(limit=POPULAR_STADIUMS)
+            counts = await self._booking_counts([stadium.id for stadium, _ in popular])
+        except HTTPException:
+            raise
+        except Exception as e:
+            # Redis is down: answer from Postgres, without the leaderboard
+            logger.error(f"Failed to read admin stats: {e}")
+            totals, revenue_by_month = await self.compute_admin_stats()
+            revenue = revenue_by_month.get(this_month, 0)
+            popular, counts = [], {}
+
+        return {
+            **totals,
+            "revenue_this_month": Decimal(revenue) / 100,
+            "popular_stadiums": [
+                {"stadium_id": stadium.id, "name": stadium.name, "total_bookings": counts.get(stadium.id, 0),
+                 "trending_score": round(score, 2)}
+                for stadium, score in popular
+            ],
+        }
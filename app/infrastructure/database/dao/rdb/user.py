@@ -1,14 +1,19 @@
+import logging
 from typing import Type, Sequence, Any, Coroutine
 
-from sqlalchemy import insert, select, text
+from sqlalchemy import insert, select, text, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.api.dependencies.settings import get_redis_connection
 from app.dto.user import UserInCreate
+from app.infrastructure.cache import AdminStats
 from app.infrastructure.database.dao.rdb import BaseDAO
 from app.infrastructure.database.models import UserModel
 from app import dto
 
+logger = logging.getLogger(__name__)
+
 
 class UserDAO(BaseDAO[UserModel]):
     def __init__(self, session: AsyncSession):
@@ -22,7 +27,12 @@ class UserDAO(BaseDAO[UserModel]):
                                                                      ).returning(UserModel))
         await self.session.commit()
         await self.session.flush()
-        return result.scalar()
+        user = result.scalar()
+        try:
+            await AdminStats(await get_redis_connection()).record_user(1)
+        except Exception as e:
+            logger.error(f"Failed to update admin stats: {e}")
+        return user
 
 
     async def get_user_with_stadiums(self, phone_number: str):
@@ -55,6 +65,12 @@ class UserDAO(BaseDAO[UserModel]):
         ))
         return result.unique().scalar()
 
+    def export_query(self) -> Select:
+        """Plain user columns for streaming export"""
+        return select(UserModel.id, UserModel.username, UserModel.phone_number, UserModel.first_name,
+                      UserModel.last_name, UserModel.role, UserModel.is_active,
+                      UserModel.created_at).order_by(UserModel.id)
+
     async def get_users(self) -> Sequence[UserModel]:
         result = await self.session.execute(
             select(UserModel)
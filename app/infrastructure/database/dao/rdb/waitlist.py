@@ -0,0 +1,286 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.settings import get_redis_connection
+from app.dto.booking import WaitlistJoin
+from app.infrastructure.cache.stats import ACTIVE_STATUSES
+from app.infrastructure.database.dao.rdb.base import BaseDAO
+from app.infrastructure.database.dao.rdb.stadium import StadiumDAO
+from app.infrastructure.database.models import BookingModel, StadiumModel, WaitlistEntryModel
+from app.infrastructure.database.models.booking import WaitlistStatus
+from app.infrastructure.scheduling import SlotHolds, WaitlistQueues
+
+logger = logging.getLogger(__name__)
+
+# How long a promoted waiter has to claim the freed range before the next one gets it
+OFFER_SECONDS = 900
+OPEN_STATUSES = (WaitlistStatus.WAITING, WaitlistStatus.OFFERED)
+
+
+class WaitlistDAO(BaseDAO):
+    """
+    Users waiting for taken ranges. When a booking is cancelled or expires, the
+    oldest waiter of each overlapping range that is now free is offered it: the
+    range is held for them in SlotHolds for OFFER_SECONDS, then offered onwards.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(WaitlistEntryModel, session)
+
+    async def _taken(self, stadium_id: int, start: datetime, end: datetime) -> bool:
+        result = await self.session.execute(
+            select(BookingModel.id)
+            .where(
+                BookingModel.stadium_id == stadium_id,
+                BookingModel.status.in_(ACTIVE_STATUSES),
+                BookingModel.start_time > start - timedelta(days=1),
+                BookingModel.start_time < end,
+                BookingModel.end_time > start,
+            )
+            .limit(1)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def join(self, data: WaitlistJoin, user_id: int) -> WaitlistEntryModel:
+        try:
+            stadium = await self.session.get(StadiumModel, data.stadium_id)
+            if not stadium:
+                raise HTTPException(status_code=404, detail="Stadium not found")
+            template = await StadiumDAO(self.session).get_slot_template(stadium)
+            if template.locate(data.start_time, data.end_time) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Booking must be within opening hours and aligned to {template.slot_minutes}-minute slots"
+                )
+            if not await self._taken(data.stadium_id, data.start_time, data.end_time):
+                raise HTTPException(status_code=400, detail="Stadium is available for selected time, book it instead")
+
+            result = await self.session.execute(
+                select(WaitlistEntryModel.id).where(
+                    WaitlistEntryModel.user_id == user_id,
+                    WaitlistEntryModel.stadium_id == data.stadium_id,
+                    WaitlistEntryModel.start_time == data.start_time,
+                    WaitlistEntryModel.end_time == data.end_time,
+                    WaitlistEntryModel.status.in_(OPEN_STATUSES),
+                )
+            )
+            if result.first() is not None:
+                raise HTTPException(status_code=409, detail="Already on the waitlist for selected time")
+
+            result = await self.session.execute(
+                insert(WaitlistEntryModel).values(**data.model_dump(), user_id=user_id).returning(WaitlistEntryModel)
+            )
+            entry = result.scalar_one()
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to join waitlist: {e}")
+            raise HTTPException(status_code=500, detail="Failed to join waitlist")
+
+        try:
+            await WaitlistQueues(await get_redis_connection()).join(
+                entry.id, entry.stadium_id, entry.start_time, entry.end_time
+            )
+        except Exception as e:
+            # An entry missing from its queue would never be offered anything
+            logger.error(f"Failed to queue waitlist entry: {e}")
+            await self._delete(entry.id)
+            raise HTTPException(status_code=503, detail="Waitlist is unavailable, please retry")
+        return entry
+
+    async def get_by_user(self, user_id: int) -> Sequence[WaitlistEntryModel]:
+        """The user's entries for ranges that have not ended yet"""
+        try:
+            result = await self.session.execute(
+                select(WaitlistEntryModel)
+                .where(WaitlistEntryModel.user_id == user_id, WaitlistEntryModel.end_time > datetime.utcnow())
+                .order_by(WaitlistEntryModel.start_time)
+            )
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get waitlist entries: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    async def _transition(self, criteria: list, status: WaitlistStatus, **changes) -> List:
+        """
+        Move the open entries matching criteria to status with one UPDATE, returning
+        (entry, previous status) rows. Caller commits.
+        """
+        previous = (
+            select(WaitlistEntryModel.id, WaitlistEntryModel.status)
+            .where(*criteria)
+            .with_for_update()
+            .subquery()
+        )
+        result = await self.session.execute(
+            update(WaitlistEntryModel)
+            .where(WaitlistEntryModel.id == previous.c.id)
+            .values(status=status, **changes)
+            .returning(WaitlistEntryModel, previous.c.status)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.all()
+
+    async def leave(self, entry_id: int, user_id: int) -> None:
+        """Leave the queue, or turn down an offer, which passes the range on"""
+        try:
+            rows = await self._transition(
+                [WaitlistEntryModel.id == entry_id, WaitlistEntryModel.user_id == user_id,
+                 WaitlistEntryModel.status.in_(OPEN_STATUSES)],
+                WaitlistStatus.LEFT
+            )
+            if not rows:
+                raise HTTPException(status_code=404, detail="Waitlist entry not found or access denied")
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to leave waitlist: {e}")
+            raise HTTPException(status_code=500, detail="Failed to leave waitlist")
+
+        entry, previous_status = rows[0]
+        if previous_status == WaitlistStatus.OFFERED:
+            await self._withdraw_offers([entry])
+        else:
+            try:
+                await WaitlistQueues(await get_redis_connection()).remove(
+                    entry.id, entry.stadium_id, entry.start_time, entry.end_time
+                )
+            except Exception as e:
+                logger.error(f"Failed to remove waitlist entry from its queue: {e}")
+
+    async def get_offer(self, entry_id: int, user_id: int) -> WaitlistEntryModel:
+        """The user's entry with a live offer; 404 if there is no such entry, 409 without an offer"""
+        try:
+            entry = await self._get_by_id(entry_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get waitlist entry: {e}")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+        if not entry or entry.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Waitlist entry not found or access denied")
+        if entry.status != WaitlistStatus.OFFERED or entry.offered_until <= datetime.utcnow():
+            raise HTTPException(status_code=409, detail=f"Waitlist entry has no open offer ({entry.status.value})")
+        return entry
+
+    async def fulfil(self, entry_id: int, booking_id: int) -> None:
+        """Record the booking an offer was claimed with"""
+        try:
+            rows = await self._transition(
+                [WaitlistEntryModel.id == entry_id, WaitlistEntryModel.status == WaitlistStatus.OFFERED],
+                WaitlistStatus.BOOKED, booking_id=booking_id
+            )
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error(f"Failed to mark waitlist entry {entry_id} booked: {e}")
+            return
+        if not rows:
+            logger.warning(f"Waitlist entry {entry_id} was booked after its offer ended")
+
+    async def _heads(self, stadium_id: int, start: datetime, end: datetime) -> List[Tuple[int, datetime, datetime]]:
+        """First waiter of each range overlapping [start, end); from Postgres when Redis is unavailable"""
+        try:
+            return await WaitlistQueues(await get_redis_connection()).heads(stadium_id, start, end)
+        except Exception as e:
+            logger.error(f"Failed to read waitlist queues, using the database: {e}")
+        result = await self.session.execute(
+            select(WaitlistEntryModel.id, WaitlistEntryModel.start_time, WaitlistEntryModel.end_time)
+            .where(
+                WaitlistEntryModel.stadium_id == stadium_id,
+                WaitlistEntryModel.status == WaitlistStatus.WAITING,
+                WaitlistEntryModel.start_time < end,
+                WaitlistEntryModel.end_time > max(start, datetime.utcnow()),
+            )
+            .distinct(WaitlistEntryModel.start_time, WaitlistEntryModel.end_time)
+            .order_by(WaitlistEntryModel.start_time, WaitlistEntryModel.end_time, WaitlistEntryModel.id)
+        )
+        return sorted(tuple(row) for row in result.all())
+
+    async def offer_freed(self, ranges: Iterable[Tuple[int, datetime, datetime]]) -> List[WaitlistEntryModel]:
+        """
+        Offer freed (stadium_id, start, end) ranges to the waiters first in line for them.
+        A waiter is skipped, and stays in line, while other bookings or holds still
+        cover part of their range; overlapping waiters lose to the first one offered.
+        """
+        offered = []
+        now = datetime.utcnow()
+        for stadium_id, start, end in ranges:
+            if end <= now:
+                continue
+            try:
+                for entry_id, entry_start, entry_end in await self._heads(stadium_id, start, end):
+                    entry = await self._offer(entry_id, stadium_id, entry_start, entry_end)
+                    if entry is not None:
+                        offered.append(entry)
+            except SQLAlchemyError as e:
+                await self.session.rollback()
+                logger.error(f"Failed to offer freed range to the waitlist: {e}")
+        return offered
+
+    async def _offer(self, entry_id: int, stadium_id: int, start: datetime, end: datetime) -> Optional[WaitlistEntryModel]:
+        if await self._taken(stadium_id, start, end):
+            return None
+        token = uuid.uuid4().hex
+        try:
+            holds = SlotHolds(await get_redis_connection())
+            if not await holds.hold(stadium_id, start, end, token, ttl_ms=OFFER_SECONDS * 1000):
+                return None
+        except Exception as e:
+            # Without Redis the offer is still recorded, it just doesn't keep others away
+            logger.error(f"Failed to hold range for waitlist offer: {e}")
+            holds = None
+
+        rows = await self._transition(
+            [WaitlistEntryModel.id == entry_id, WaitlistEntryModel.status == WaitlistStatus.WAITING],
+            WaitlistStatus.OFFERED, offer_token=token,
+            offered_until=datetime.utcnow() + timedelta(seconds=OFFER_SECONDS)
+        )
+        await self.session.commit()
+        try:
+            await WaitlistQueues(await get_redis_connection()).remove(entry_id, stadium_id, start, end)
+            if not rows and holds is not None:
+                # The entry left meanwhile
+                await holds.release(stadium_id, start, end, token)
+        except Exception as e:
+            logger.error(f"Failed to update waitlist queue after offer: {e}")
+        if not rows:
+            return None
+        logger.info(f"Offered stadium {stadium_id} {start}-{end} to waitlist entry {entry_id}")
+        return rows[0][0]
+
+    async def _withdraw_offers(self, entries: Sequence[WaitlistEntryModel]) -> None:
+        """Release the holds of offers that ended unclaimed and pass their ranges on"""
+        try:
+            holds = SlotHolds(await get_redis_connection())
+            for entry in entries:
+                await holds.release(entry.stadium_id, entry.start_time, entry.end_time, entry.offer_token)
+        except Exception as e:
+            logger.error(f"Failed to release waitlist offer holds: {e}")
+        await self.offer_freed([(entry.stadium_id, entry.start_time, entry.end_time) for entry in entries])
+
+    async def expire_offers(self) -> int:
+        """
+        End, in one UPDATE, every offer still unclaimed after its offered_until and pass
+        the ranges on; returns how many ended. Run periodically by OfferSweeper.
+        """
+        try:
+            rows = await self._transition(
+                [WaitlistEntryModel.status == WaitlistStatus.OFFERED,
+                 WaitlistEntryModel.offered_until <= datetime.utcnow()],
+                WaitlistStatus.EXPIRED
+            )
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        expired = [entry for entry, _ in rows]
+        for entry in expired:
+            logger.info(f"Waitlist offer {entry.id} expired unclaimed")
+        await self._withdraw_offers(expired)
+        return len(expired)
@@ -1,4 +1,6 @@
 from .base import Base
 from .user import UserModel
 from .stadium import StadiumModel
-from .booking import BookingModel
+from .booking import BookingModel, BookingSeriesModel, WaitlistEntryModel, BookingEventModel
+from .profile import UserProfile
+from .analytics import StadiumDailyStatsModel, StadiumHourlyStatsModel
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Numeric, UniqueConstraint
+
+from app.infrastructure.database.models.base import BaseModel
+
+
+class StadiumDailyStatsModel(BaseModel):
+    """
+    Rollup of one stadium's bookings starting on one day. Counts confirmed and
+    completed bookings only. Rebuilt per (stadium, day) by the rollup aggregator.
+    """
+    __tablename__ = "stadium_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("stadium_id", "day", name="uq_stadium_daily_stats_stadium_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
+
+
+class StadiumHourlyStatsModel(BaseModel):
+    """Booked minutes of one stadium within one clock hour (0-23) of one day"""
+    __tablename__ = "stadium_hourly_stats"
+    __table_args__ = (
+        UniqueConstraint("stadium_id", "day", "hour", name="uq_stadium_hourly_stats_stadium_day_hour"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    hour = Column(Integer, nullable=False)
+    booked_minutes = Column(Integer, nullable=False, default=0)
@@ -3,9 +3,10 @@ import enum
 from app.infrastructure.database.models.base import BaseModel
 from sqlalchemy.orm import relationship
 from sqlalchemy import (
-     Integer, Column, Text, ForeignKey,
-    Enum as SQLEnum, DateTime, Numeric,
+     Integer, Column, Text, ForeignKey, String,
+    Enum as SQLEnum, DateTime, Numeric, Index, DDL, event, text,
 )
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from datetime import datetime
 
 
@@ -14,6 +15,15 @@ class AvailabilityStatus(str, enum.Enum):
     YELLOW = "yellow"  # Normal bookings (3-5 per day)
     RED = "red"
 
+    @classmethod
+    def from_booking_count(cls, booking_count: int, green_max: int = 2, yellow_max: int = 5) -> "AvailabilityStatus":
+        """Map a day's booking count onto GREEN/YELLOW/RED using per-stadium thresholds"""
+        if booking_count <= green_max:
+            return cls.GREEN
+        if booking_count <= yellow_max:
+            return cls.YELLOW
+        return cls.RED
+
 class BookingStatus(str, enum.Enum):
     PENDING = "pending"
     CONFIRMED = "confirmed"
@@ -21,9 +31,35 @@ class BookingStatus(str, enum.Enum):
     COMPLETED = "completed"
     EXPIRED = "expired"
 
+    @classmethod
+    def allowed_from(cls, status: "BookingStatus") -> frozenset:
+        """Statuses a booking may move to status from"""
+        return frozenset(source for source, targets in BOOKING_TRANSITIONS.items() if status in targets)
+
+
+# Booking status machine: where each status may go; cancelled, completed and expired are final
+BOOKING_TRANSITIONS = {
+    BookingStatus.PENDING: {BookingStatus.CONFIRMED, BookingStatus.CANCELLED, BookingStatus.EXPIRED},
+    BookingStatus.CONFIRMED: {BookingStatus.CANCELLED, BookingStatus.COMPLETED},
+}
+
 
 class BookingModel(BaseModel):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Serves every per-stadium date range scan (availability, calendar)
+        Index("ix_bookings_stadium_start_time", "stadium_id", "start_time"),
+        # Admin listing: a user's bookings, and everything newest first or within a date range
+        Index("ix_bookings_user_start_time", "user_id", "start_time"),
+        Index("ix_bookings_start_time", "start_time"),
+        # Overlapping active bookings of a stadium are impossible, whatever checks or holds
+        # a writer skipped; inserts and updates breaking this fail with EXCLUSION_VIOLATION
+        ExcludeConstraint(
+            ("stadium_id", "="), (text("tsrange(start_time, end_time)"), "&&"),
+            name="ex_bookings_active_overlap", using="gist",
+            where=text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -33,9 +69,92 @@ class BookingModel(BaseModel):
     total_price = Column(Numeric(10, 2), nullable=False)
     status = Column(SQLEnum(BookingStatus), default=BookingStatus.PENDING)
     notes = Column(Text)
+    series_id = Column(Integer, ForeignKey("booking_series.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Bumped by every UPDATE of the row; the ETag clients send back in If-Match
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     user = relationship("UserModel", back_populates="bookings")
-    stadium = relationship("StadiumModel", back_populates="bookings")
\ No newline at end of file
+    stadium = relationship("StadiumModel", back_populates="bookings")
+    series = relationship("BookingSeriesModel", back_populates="bookings")
+
+
+# SQLSTATE of a statement rejected by ex_bookings_active_overlap
+EXCLUSION_VIOLATION = "23P01"
+
+# The gist index of ex_bookings_active_overlap compares the integer stadium_id with btree_gist
+event.listen(
+    BookingModel.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
+
+
+class BookingSeriesModel(BaseModel):
+    """A weekly recurring booking; its occurrences are ordinary bookings carrying series_id"""
+    __tablename__ = "booking_series"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    interval_weeks = Column(Integer, nullable=False, default=1)
+    occurrences = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    bookings = relationship("BookingModel", back_populates="series")
+
+class WaitlistStatus(str, enum.Enum):
+    WAITING = "waiting"
+    OFFERED = "offered"  # The range was freed and is held for the user until offered_until
+    BOOKED = "booked"
+    LEFT = "left"
+    EXPIRED = "expired"  # The offer was not claimed in time
+
+
+class WaitlistEntryModel(BaseModel):
+    """A user waiting for a taken time range; queue order is kept in Redis (WaitlistQueues)"""
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        Index("ix_waitlist_entries_stadium_start_time", "stadium_id", "start_time"),
+        Index("ix_waitlist_entries_user_start_time", "user_id", "start_time"),
+        # The offer sweep's scan
+        Index("ix_waitlist_entries_offered_until", "offered_until", postgresql_where=text("status = 'OFFERED'")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    notes = Column(Text)
+    status = Column(SQLEnum(WaitlistStatus), nullable=False, default=WaitlistStatus.WAITING)
+    # SlotHolds token of the offer, used again when the offer is claimed
+    offer_token = Column(String(32))
+    offered_until = Column(DateTime)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BookingEventModel(BaseModel):
+    """
+    Append-only audit log of booking changes, one row per created booking, status
+    change or time edit. Rows are buffered in-process and inserted in batches
+    (app.infrastructure.audit), so occurred_at, not created_at, is when it happened.
+    """
+    __tablename__ = "booking_events"
+    __table_args__ = (
+        Index("ix_booking_events_booking_occurred_at", "booking_id", "occurred_at"),
+        Index("ix_booking_events_stadium_occurred_at", "stadium_id", "occurred_at"),
+    )
+
+    # No foreign keys: the log outlives the rows it describes and batches never fail on them
+    booking_id = Column(Integer, nullable=False)
+    stadium_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer)  # None for system changes such as expiry
+    event = Column(String(20), nullable=False)  # "created", "updated" or the new status
+    from_status = Column(SQLEnum(BookingStatus))
+    to_status = Column(SQLEnum(BookingStatus))
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    occurred_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey, String, Text, Column
+from sqlalchemy import Integer, ForeignKey, String, Text, Column, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.database.models.base import BaseModel
@@ -7,11 +7,12 @@ from app.infrastructure.database.models.base import BaseModel
 class UserProfile(BaseModel):
     __tablename__ = 'user_profile'
 
-    user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
     username: Mapped[str] = mapped_column(String(255), nullable=True, unique=True)
     first_name: Mapped[str] = mapped_column(String(155), nullable=True)
     last_name: Mapped[str] = mapped_column(String(155), nullable=True)
     bio: Mapped[str] = mapped_column(Text, nullable=True)
     photo = Column(String(255), nullable=True)
+    photo_thumbnails = Column(JSON, nullable=True)  # {"64": url, "128": url, ...}
 
-    # user = relationship('User', backref='profile')
+    user = relationship('UserModel', back_populates='profile')
@@ -4,7 +4,8 @@ from app.infrastructure.database.models.base import BaseModel, Base
 from sqlalchemy.orm import Mapped, mapped_column, validates, relationship, Relationship
 from sqlalchemy import (
     String, TIMESTAMP, Integer, Column, Text, ForeignKey,
-    Float, Enum as SQLEnum, TIME, JSON, DateTime, DECIMAL, Numeric, Boolean, Table,
+    Float, Enum as SQLEnum, TIME, JSON, DateTime, DECIMAL, Numeric, Boolean, Table, Date,
+    UniqueConstraint, Index, text,
 )
 
 import datetime
@@ -34,6 +35,28 @@ stadium_admins = Table(
 )
 
 
+class MediaObjectModel(BaseModel):
+    """
+    One stored original, addressed by the sha256 of its bytes. Identical uploads share
+    a row; ref_count is the number of images pointing at it. Objects whose count
+    reached zero are deleted (row and files) by the media garbage collector.
+    """
+    __tablename__ = "media_objects"
+    __table_args__ = (
+        Index("ix_media_objects_unreferenced", "updated_at", postgresql_where=text("ref_count = 0")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, unique=True)
+    original = Column(String(50), nullable=False)  # File name of the original inside the object directory
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    placeholder = Column(Text)  # Tiny WebP data URI shown while the image loads
+    dominant_color = Column(String(7))  # "#rrggbb"
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
 class ImageModel(BaseModel):
     __tablename__ = "images"
 
@@ -42,6 +65,10 @@ class ImageModel(BaseModel):
     alt_text = Column(String(255))  # Optional alt text for accessibility
     stadium_id = Column(Integer, ForeignKey("stadiums.id"), nullable=False)
     is_primary = Column(Boolean, default=False)  # Mark primary image for stadium
+    variants = Column(JSON)  # {size: {"jpeg": url, "webp": url}}
+    content_hash = Column(String(64), ForeignKey("media_objects.content_hash"), index=True)
+    placeholder = Column(Text)  # Copied from the media object so listings need no join
+    dominant_color = Column(String(7))
     created_at = Column(DateTime, default=datetime.datetime.now(datetime.UTC).replace(tzinfo=None))
     updated_at = Column(DateTime, default=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
                         onupdate=datetime.datetime.now(datetime.UTC).replace(tzinfo=None))
@@ -70,6 +97,14 @@ class StadiumModel(BaseModel):
     is_active = Column(Boolean, default=True)
     opening_hour = Column(String(5), default="06:00")  # HH:MM format
     closing_hour = Column(String(5), default="23:00")  # HH:MM format
+    slot_minutes = Column(Integer, nullable=False, default=60, server_default="60")  # Rental granularity
+    # Bumped whenever hours, slot length or schedule rows change; keys the compiled slot template
+    schedule_version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Daily booking counts up to these values are shown as GREEN / YELLOW, above as RED
+    availability_green_max = Column(Integer, nullable=False, default=2, server_default="2")
+    availability_yellow_max = Column(Integer, nullable=False, default=5, server_default="5")
+    # Bumped by every change to the stadium, its schedule or its images; the ETag clients send back in If-Match
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.datetime.now(datetime.UTC).replace(tzinfo=None))
     updated_at = Column(DateTime, default=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
                         onupdate=datetime.datetime.now(datetime.UTC).replace(tzinfo=None))
@@ -82,6 +117,49 @@ class StadiumModel(BaseModel):
         secondary="stadium_admins",
         back_populates="admin_stadiums"
     )
-    images = relationship("ImageModel", back_populates="stadium", cascade="all, delete-orphan")
+    images = relationship("ImageModel", back_populates="stadium", cascade="all, delete-orphan",
+                          order_by="[ImageModel.is_primary.desc(), ImageModel.id]")
+    schedules = relationship("StadiumScheduleModel", back_populates="stadium", cascade="all, delete-orphan")
+    schedule_exceptions = relationship("StadiumScheduleExceptionModel", back_populates="stadium",
+                                       cascade="all, delete-orphan")
+
+
+class StadiumScheduleModel(BaseModel):
+    """
+    Opening hours for one weekday (0 = Monday). closes_at at or before opens_at
+    means the stadium closes after midnight. Weekdays without a row fall back to
+    StadiumModel.opening_hour / closing_hour.
+    """
+    __tablename__ = "stadium_schedules"
+    __table_args__ = (
+        UniqueConstraint("stadium_id", "weekday", name="uq_stadium_schedules_stadium_weekday"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    weekday = Column(Integer, nullable=False)
+    opens_at = Column(TIME, nullable=True)
+    closes_at = Column(TIME, nullable=True)
+    is_closed = Column(Boolean, nullable=False, default=False)
+
+    stadium = relationship("StadiumModel", back_populates="schedules")
+
+
+class StadiumScheduleExceptionModel(BaseModel):
+    """Overrides the weekly schedule for a single date (holidays, tournaments, maintenance)"""
+    __tablename__ = "stadium_schedule_exceptions"
+    __table_args__ = (
+        UniqueConstraint("stadium_id", "date", name="uq_stadium_schedule_exceptions_stadium_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stadium_id = Column(Integer, ForeignKey("stadiums.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    opens_at = Column(TIME, nullable=True)
+    closes_at = Column(TIME, nullable=True)
+    is_closed = Column(Boolean, nullable=False, default=False)
+    note = Column(String(255))
+
+    stadium = relationship("StadiumModel", back_populates="schedule_exceptions")
 
 
@@ -32,6 +32,7 @@ class UserModel(BaseModel):
     # Relationships
     owned_stadiums = relationship("StadiumModel", back_populates="owner")
     bookings = relationship("BookingModel", back_populates="user")
+    profile = relationship("UserProfile", back_populates="user", uselist=False, passive_deletes=True)
     admin_stadiums = relationship(
         "StadiumModel",
         secondary="stadium_admins",
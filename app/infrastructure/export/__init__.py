@@ -0,0 +1 @@
+from .stream import EXPORT_FORMATS, stream_rows
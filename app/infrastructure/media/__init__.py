@@ -0,0 +1,4 @@
+from .processing import ImageProcessor, SingleFlight, image_processor
+from .uploads import save_upload
+from .storage import ContentStore
+from .cache import DiskLRUCache
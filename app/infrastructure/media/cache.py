@@ -0,0 +1,80 @@
+import asyncio
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class DiskLRUCache:
+    """
+    Size-bounded directory of rendered files, evicting the least recently used first.
+
+    Keys are relative paths whose first two components are ``ab/<content_hash>``, so
+    everything derived from one object can be dropped at once. The recency index is
+    kept in memory and rebuilt from modification times by load(). Workers sharing the
+    directory each bound the files they know about; files another worker evicted are
+    noticed on lookup, files it rendered are picked up the same way.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def load(self) -> None:
+        """Index files already on disk, oldest first. Blocking; run it in a thread."""
+        files = []
+        for path in self.root.rglob("*"):
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.relative_to(self.root).as_posix(), stat.st_size))
+        for _, key, size in sorted(files):
+            self._add(key, size)
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.root / key
+        if not path.is_file():
+            self._forget(key)
+            return None
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            self._add(key, path.stat().st_size)
+        return path
+
+    def add(self, key: str, size: int) -> None:
+        self._add(key, size)
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            evicted, evicted_size = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            (self.root / evicted).unlink(missing_ok=True)
+
+    async def remove(self, content_hashes: Iterable[str]) -> None:
+        """Drop every file derived from the given objects"""
+        content_hashes = set(content_hashes)
+        for key in [key for key in self._entries if key.split("/", 2)[1] in content_hashes]:
+            self._forget(key)
+        await asyncio.to_thread(self._remove_dirs, content_hashes)
+
+    def _remove_dirs(self, content_hashes: Iterable[str]) -> None:
+        for content_hash in content_hashes:
+            shutil.rmtree(self.root / content_hash[:2] / content_hash, ignore_errors=True)
+
+    def _add(self, key: str, size: int) -> None:
+        self._forget(key)
+        self._entries[key] = size
+        self._size += size
+
+    def _forget(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
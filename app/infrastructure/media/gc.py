@@ -0,0 +1,66 @@
+"""
+Background reclamation of unreferenced media objects.
+
+Deleting an image only decrements its object's ref_count. Every worker runs this
+collector; batches are claimed with FOR UPDATE SKIP LOCKED so workers never
+collect the same object, and the grace period keeps objects whose count just
+reached zero around for requests that are still serving them.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.database.dao.rdb.media import MediaDAO
+from app.infrastructure.media.cache import DiskLRUCache
+from app.infrastructure.media.storage import ContentStore
+
+logger = logging.getLogger(__name__)
+
+
+class MediaGarbageCollector:
+    def __init__(self, store: ContentStore, caches: Sequence[DiskLRUCache] = (), interval: float = 600,
+                 grace: timedelta = timedelta(hours=1), batch_size: int = 200):
+        self.store = store
+        self.caches = caches  # Hold files derived from the objects, dropped along with them
+        self.interval = interval
+        self.grace = grace
+        self.batch_size = batch_size
+        self._pool: Optional[sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def collect(self) -> int:
+        """Remove one batch of garbage; returns the number of objects deleted"""
+        async with self._pool() as session:
+            dao = MediaDAO(session)
+            content_hashes = await dao.lock_unreferenced(datetime.now(timezone.utc) - self.grace, self.batch_size)
+            if not content_hashes:
+                return 0
+            # Files go while the rows are still locked: a re-upload of the same content
+            # waits for this transaction and then stores the object again
+            await asyncio.to_thread(self.store.remove, content_hashes)
+            for cache in self.caches:
+                await cache.remove(content_hashes)
+            return await dao.delete_objects(content_hashes)
+
+    async def start(self, pool: sessionmaker) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.collect() == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Media garbage collection failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,151 @@
+"""
+Pillow work for uploaded images. Everything here runs inside ImageProcessor's
+worker processes, so functions take and return plain picklable values.
+"""
+import base64
+import io
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Reject decompression bombs well before Pillow's own (warning-only) default
+Image.MAX_IMAGE_PIXELS = 60_000_000
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+EXIF_ORIENTATION = 0x0112
+EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+ANALYSIS_SIZE = 64
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+DOMINANT_PALETTE_SIZE = 5
+
+SAVE_OPTIONS = {
+    "jpeg": {"format": "JPEG", "quality": JPEG_QUALITY, "optimize": True, "progressive": True},
+    "webp": {"format": "WEBP", "quality": WEBP_QUALITY, "method": 4},
+}
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """RGB copy, transparent areas on white"""
+    if image.mode in ("RGBA", "LA", "P"):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def inspect_image(source_path: str) -> Dict[str, object]:
+    """
+    Decode the upload fully to reject corrupt files and derive what clients show before
+    the real image arrives. Returns width and height as displayed, placeholder (a tiny
+    WebP data URI) and dominant_color ("#rrggbb").
+    """
+    try:
+        with Image.open(source_path) as source:
+            source.load()
+            width, height = source.size
+            orientation = source.getexif().get(EXIF_ORIENTATION)
+            # In place and via reduce(): the full-size pixels are not copied again
+            source.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE), reducing_gap=2.0)
+            small = _flatten(source)
+    except Image.DecompressionBombError:
+        raise ImageProcessingError("Image dimensions are too large")
+    except (UnidentifiedImageError, OSError):
+        raise ImageProcessingError("Invalid or corrupted image file")
+
+    if orientation in EXIF_TRANSPOSE:
+        small = small.transpose(EXIF_TRANSPOSE[orientation])
+        if orientation >= 5:
+            width, height = height, width
+
+    tiny = small.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+    quantized = small.quantize(colors=DOMINANT_PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": placeholder,
+        "dominant_color": f"#{r:02x}{g:02x}{b:02x}",
+    }
+
+
+def render_resized(source_path: str, destination: str, width: int, fmt: str) -> int:
+    """
+    Write source scaled down to ``width`` (never upscaled) in ``fmt``. The file appears
+    atomically at destination, so concurrent readers never see a partial image.
+    Returns the size in bytes.
+    """
+    target = Path(destination)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{target.name}.{os.getpid()}")
+    try:
+        with Image.open(source_path) as source:
+            # JPEG decoders can downscale by 1/2..1/8 while decoding, far cheaper than a full
+            # decode. Square request: the EXIF rotation applied below may swap the axes.
+            source.draft("RGB", (width, width))
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            image.save(partial, **SAVE_OPTIONS[fmt])
+        os.replace(partial, target)
+        return target.stat().st_size
+    except Image.DecompressionBombError:
+        raise ImageProcessingError("Image dimensions are too large")
+    except (UnidentifiedImageError, OSError):
+        raise ImageProcessingError("Invalid or corrupted image file")
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def render_avatar(source_path: str, destination_dir: str, sizes: Tuple[int, ...]) -> Dict[int, str]:
+    """
+    Centre-crop source to a square and write it at each size as WebP into destination_dir.
+    Returns the file name per size.
+    """
+    target = Path(destination_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    largest = max(sizes)
+    try:
+        with Image.open(source_path) as source:
+            source.draft("RGB", (largest, largest))
+            image = _flatten(ImageOps.exif_transpose(source))
+    except Image.DecompressionBombError:
+        raise ImageProcessingError("Image dimensions are too large")
+    except (UnidentifiedImageError, OSError):
+        raise ImageProcessingError("Invalid or corrupted image file")
+
+    # Small uploads are cropped at their own size, never upscaled
+    side = min(largest, *image.size)
+    square = ImageOps.fit(image, (side, side), Image.LANCZOS)
+    names = {}
+    for size in sorted(sizes, reverse=True):
+        if square.width > size:
+            square = square.resize((size, size), Image.LANCZOS)
+        names[size] = f"{size}.webp"
+        square.save(target / names[size], **SAVE_OPTIONS["webp"])
+    return names
@@ -0,0 +1,77 @@
+"""
+Static serving of the media directory.
+
+Content-addressed files (``objects/ab/<sha256>/...``) never change: they get a strong
+ETag derived from the hash and are cached for a year as immutable. Everything else
+(avatars, legacy uploads) is revalidated on every use, which costs a 304 at most.
+Range requests are handled by Starlette's FileResponse. When the ASGI server supports
+the ``http.response.pathsend`` extension the file is handed to the server, which can
+send it with sendfile(2) instead of copying it through the event loop.
+"""
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+
+HASHED_PATH = re.compile(r"^objects/[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})/(?P<name>[^/]+)$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+CHUNK_SIZE = 256 * 1024
+
+
+class MediaFileResponse(FileResponse):
+    chunk_size = CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        use_pathsend = (
+            "http.response.pathsend" in scope.get("extensions", {})
+            and scope["method"].upper() == "GET"
+            and "range" not in Headers(scope=scope)
+            and self.background is None
+        )
+        if not use_pathsend:
+            return await super().__call__(scope, receive, send)
+
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            self.set_stat_headers(self.stat_result)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+
+
+class MediaFiles(StaticFiles):
+    def get_path(self, scope: Scope) -> str:
+        path = super().get_path(scope)
+        # Dot entries are private (upload staging, partial renders)
+        if any(part.startswith(".") for part in Path(path).parts):
+            raise HTTPException(status_code=404)
+        return path
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope,
+                      status_code: int = 200) -> Response:
+        headers = {"Cache-Control": REVALIDATE_CACHE_CONTROL}
+        etag = self.hashed_etag(self.get_path(scope))
+        if etag is not None:
+            headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+
+        response = MediaFileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def hashed_etag(path: str) -> Optional[str]:
+        match = HASHED_PATH.match(Path(path).as_posix())
+        if match is None:
+            return None
+        return f'"{match["hash"][:16]}-{match["name"]}"'
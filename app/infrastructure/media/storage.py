@@ -0,0 +1,50 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class ContentStore:
+    """
+    Immutable media directories addressed by content hash: ``{root}/ab/abcdef.../``.
+
+    Uploads are written and processed in a private staging directory and then
+    renamed into place, so an object directory is either absent or complete.
+    """
+
+    def __init__(self, root: Path, url_prefix: str):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def object_dir(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash
+
+    def url(self, content_hash: str, file_name: str) -> str:
+        return f"{self.url_prefix}/{content_hash[:2]}/{content_hash}/{file_name}"
+
+    def original_path(self, content_hash: str) -> Optional[Path]:
+        return next(self.object_dir(content_hash).glob("original.*"), None)
+
+    def new_staging_dir(self) -> Path:
+        # Under root so publishing is a same-filesystem rename
+        return self.root / ".staging" / uuid.uuid4().hex
+
+    def publish(self, staging_dir: Path, content_hash: str) -> None:
+        target = self.object_dir(content_hash)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(staging_dir, target)
+        except OSError:
+            # Same content already published by a concurrent upload
+            if not target.is_dir():
+                raise
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    @staticmethod
+    def discard(staging_dir: Path) -> None:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def remove(self, content_hashes: Iterable[str]) -> None:
+        for content_hash in content_hashes:
+            shutil.rmtree(self.object_dir(content_hash), ignore_errors=True)
@@ -0,0 +1,37 @@
+import hashlib
+from pathlib import Path
+from typing import Tuple
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+async def save_upload(file: UploadFile, destination: Path, max_size: int) -> Tuple[int, str]:
+    """
+    Copy an upload to disk in fixed-size chunks, enforcing max_size as bytes arrive.
+    Memory use stays at one chunk regardless of file size. Returns the byte count
+    and the sha256 hex digest of the content.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        async with aiofiles.open(destination, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {max_size // (1024 * 1024)}MB"
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+    if written == 0:
+        destination.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Empty file")
+    return written, digest.hexdigest()
@@ -0,0 +1,5 @@
+from .bitset import SlotBitset
+from .cache import AvailabilityBitsetCache
+from .template import SlotTemplate, DaySlots, get_cached_template, cache_template, invalidate_template
+from .holds import SlotHolds
+from .waitlist import WaitlistQueues
@@ -0,0 +1,87 @@
+"""
+Compact availability representation for one stadium-day.
+
+Bit i is set when slot i is occupied. Slot checks, free-range search and
+"longest free window" are plain integer bit operations, and the whole day
+serializes to ceil(size / 8) bytes for Redis.
+"""
+from typing import List, Tuple
+
+
+class SlotBitset:
+    __slots__ = ("size", "bits")
+
+    def __init__(self, size: int, bits: int = 0):
+        self.size = size
+        self.bits = bits & self.full_mask(size)
+
+    @staticmethod
+    def full_mask(size: int) -> int:
+        return (1 << size) - 1
+
+    @staticmethod
+    def range_mask(first: int, last: int) -> int:
+        """Mask for slots [first, last)"""
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int) -> "SlotBitset":
+        return cls(size, int.from_bytes(data, "little"))
+
+    def to_bytes(self) -> bytes:
+        return self.bits.to_bytes((self.size + 7) // 8, "little")
+
+    def mark_busy(self, first: int, last: int) -> None:
+        first, last = max(0, first), min(self.size, last)
+        self.bits |= self.range_mask(first, last)
+
+    def is_free(self, index: int) -> bool:
+        return not (self.bits >> index) & 1
+
+    def is_range_free(self, first: int, last: int) -> bool:
+        if first < 0 or last > self.size:
+            return False
+        return not self.bits & self.range_mask(first, last)
+
+    @property
+    def free_bits(self) -> int:
+        return ~self.bits & self.full_mask(self.size)
+
+    def free_count(self) -> int:
+        return bin(self.free_bits).count("1")
+
+    def free_ranges(self, min_slots: int = 1) -> List[Tuple[int, int]]:
+        """All maximal runs of free slots as [first, last) pairs, in order"""
+        ranges = []
+        free = self.free_bits
+        while free:
+            first = (free & -free).bit_length() - 1
+            shifted = free >> first
+            # Number of trailing ones == length of this free run
+            length = (shifted ^ (shifted + 1)).bit_length() - 1
+            if length >= min_slots:
+                ranges.append((first, first + length))
+            free &= ~self.range_mask(first, first + length)
+        return ranges
+
+    def longest_free_window(self) -> Tuple[int, int]:
+        """
+        Longest run of free slots as a [first, last) pair ((0, 0) when fully booked).
+        After k rounds of ``x &= x >> 1`` only runs longer than k survive, so the
+        loop runs once per slot of the longest window.
+        """
+        current = self.free_bits
+        length = 0
+        while current:
+            last_nonzero = current
+            current &= current >> 1
+            length += 1
+        if not length:
+            return 0, 0
+        first = (last_nonzero & -last_nonzero).bit_length() - 1
+        return first, first + length
+
+    def __repr__(self):
+        return f"SlotBitset(size={self.size}, bits={self.bits:0{self.size}b})"
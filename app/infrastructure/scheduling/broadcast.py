@@ -0,0 +1,123 @@
+"""
+Availability change fan-out.
+
+BookingDAO publishes one message per booking change on ``availability:{stadium_id}``.
+Every worker holds a single pattern subscription and dispatches messages to its
+local SSE subscribers of that stadium-day. Each subscriber has a bounded queue;
+a subscriber that falls behind has its backlog dropped and gets a single
+``resync`` event telling the client to refetch availability.
+"""
+import asyncio
+import json
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from redis import asyncio as redis_asyncio
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "availability:"
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+
+
+def sse_frame(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+async def publish_availability_change(redis_client: redis_asyncio.Redis, stadium_id: int, payload: dict) -> None:
+    await redis_client.publish(f"{CHANNEL_PREFIX}{stadium_id}", json.dumps(payload, default=str))
+
+
+class Subscriber:
+    __slots__ = ("key", "queue")
+
+    def __init__(self, key: Tuple[int, date], queue_size: int):
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog, the client refetches a snapshot instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+
+
+class AvailabilityHub:
+    def __init__(self, queue_size: int = 16, max_subscribers: int = 20000):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[Tuple[int, date], Set[Subscriber]] = {}
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._redis: Optional[redis_asyncio.Redis] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def subscribe(self, stadium_id: int, day: date) -> Optional[Subscriber]:
+        """None when this worker is at its subscriber limit"""
+        if self._count >= self.max_subscribers:
+            return None
+        subscriber = Subscriber((stadium_id, day), self.queue_size)
+        self._subscribers.setdefault(subscriber.key, set()).add(subscriber)
+        self._count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.key)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        self._count -= 1
+        if not subscribers:
+            del self._subscribers[subscriber.key]
+
+    def dispatch(self, stadium_id: int, payload: str) -> None:
+        message = json.loads(payload)
+        frame = sse_frame("booking", payload)  # Encoded once, shared by every queue
+        day = date.fromisoformat(message["date"])
+        # A booking after midnight may show on the previous day's late schedule
+        for key in ((stadium_id, day), (stadium_id, day - timedelta(days=1))):
+            for subscriber in self._subscribers.get(key, ()):
+                subscriber.offer(frame)
+
+    async def start(self, redis_client: redis_asyncio.Redis) -> None:
+        self._redis = redis_client
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    try:
+                        stadium_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                        self.dispatch(stadium_id, message["data"])
+                    except (ValueError, KeyError) as e:
+                        logger.error(f"Malformed availability message: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Availability subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+availability_hub = AvailabilityHub()
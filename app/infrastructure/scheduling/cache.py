@@ -0,0 +1,89 @@
+import logging
+import struct
+from datetime import date
+from typing import Optional, Tuple
+
+from redis import asyncio as redis_asyncio
+
+from app.infrastructure.scheduling.bitset import SlotBitset
+
+logger = logging.getLogger(__name__)
+
+# slot_minutes, opening minute of day, slot count: a cached value built for a
+# different layout (stadium hours or granularity changed) is treated as a miss
+_HEADER = struct.Struct("<HHH")
+
+# Outlives any read-then-write window, so an invalidation is never forgotten mid-request
+GENERATION_TTL = 86400
+
+# KEYS = bitset, generation; ARGV = generation read before querying, ttl, value
+SET_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[2])
+return 1
+"""
+
+
+class AvailabilityBitsetCache:
+    """
+    Stores one packed SlotBitset per stadium-day in Redis as raw bytes. Each
+    stadium-day has a generation that invalidate() increments; a bitset is only
+    stored if the generation is still the one read before its bookings were
+    queried, so a reader that raced a booking can't cache what it saw.
+    """
+
+    def __init__(self, redis_client: redis_asyncio.Redis, ttl: int = 3600):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(stadium_id: int, day: date) -> str:
+        return f"availability_bits:{stadium_id}:{day.isoformat()}"
+
+    @staticmethod
+    def _generation_key(stadium_id: int, day: date) -> str:
+        return f"availability_gen:{stadium_id}:{day.isoformat()}"
+
+    async def get(self, stadium_id: int, day: date, slot_minutes: int, open_minute: int,
+                  size: int) -> Tuple[Optional[SlotBitset], Optional[bytes]]:
+        """(cached bitset or None, generation to pass to set); generation None if Redis failed"""
+        try:
+            raw, generation = await self.redis.mget(
+                self._key(stadium_id, day), self._generation_key(stadium_id, day)
+            )
+        except Exception as e:
+            logger.error(f"Failed to read availability bitset from Redis: {e}")
+            return None, None
+        generation = generation or b"0"
+        if not raw or len(raw) < _HEADER.size:
+            return None, generation
+        if _HEADER.unpack_from(raw) != (slot_minutes, open_minute, size):
+            return None, generation
+        return SlotBitset.from_bytes(raw[_HEADER.size:], size), generation
+
+    async def set(self, stadium_id: int, day: date, slot_minutes: int, open_minute: int,
+                  bitset: SlotBitset, generation: Optional[bytes]) -> None:
+        """Store bitset unless the stadium-day was invalidated since generation was read"""
+        if generation is None:
+            return
+        value = _HEADER.pack(slot_minutes, open_minute, bitset.size) + bitset.to_bytes()
+        try:
+            await self.redis.register_script(SET_SCRIPT)(
+                keys=[self._key(stadium_id, day), self._generation_key(stadium_id, day)],
+                args=[generation, self.ttl, value]
+            )
+        except Exception as e:
+            logger.error(f"Failed to write availability bitset to Redis: {e}")
+
+    async def invalidate(self, stadium_id: int, *days: date) -> None:
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            for day in days:
+                pipe.incr(self._generation_key(stadium_id, day))
+                pipe.expire(self._generation_key(stadium_id, day), GENERATION_TTL)
+                pipe.delete(self._key(stadium_id, day))
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to invalidate availability bitset: {e}")
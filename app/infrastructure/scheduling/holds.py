@@ -0,0 +1,159 @@
+"""
+Short-lived claims on stadium time ranges, taken in Redis before a booking insert.
+
+``slot_holds:{stadium_id}`` is a hash of ``"{start}:{end}"`` (unix seconds) to
+``"{token} {expires_ms}"``. Checking every live hold of the stadium for overlap and
+claiming the range is one Lua call, so of many requests racing for one slot all but
+one get an answer at Redis latency, before any Postgres work. Bulk and series
+requests claim all their ranges in one call the same way. Postgres stays the
+source of truth: a hold only filters contenders, the insert still checks conflicts,
+and a missing hold (Redis down, expired) just means the database decides, where
+an exclusion constraint rejects overlapping active bookings.
+"""
+import calendar
+from datetime import datetime
+from typing import Iterable, Sequence, Set, Tuple
+
+from redis import asyncio as redis_asyncio
+
+# Long enough to cover the insert; the winner keeps the hold this long after it
+# commits, which turns away the rest of a burst without a database query
+HOLD_TTL_MS = 30_000
+
+# KEYS[1] = holds hash; ARGV = start, end, token, ttl ms
+HOLD_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local start, finish = tonumber(ARGV[1]), tonumber(ARGV[2])
+local holds = redis.call('HGETALL', KEYS[1])
+for i = 1, #holds, 2 do
+    local held_start, held_end = string.match(holds[i], '(%d+):(%d+)')
+    local token, expires = string.match(holds[i + 1], '(%S+) (%d+)')
+    if tonumber(expires) <= now_ms then
+        redis.call('HDEL', KEYS[1], holds[i])
+    elseif tonumber(held_start) < finish and tonumber(held_end) > start and token ~= ARGV[3] then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1] .. ':' .. ARGV[2], ARGV[3] .. ' ' .. (now_ms + tonumber(ARGV[4])))
+if redis.call('PTTL', KEYS[1]) < tonumber(ARGV[4]) then
+    redis.call('PEXPIRE', KEYS[1], ARGV[4])
+end
+return 1
+"""
+
+# KEYS = holds hashes; ARGV = token, ttl ms, all or nothing (1/0), then a key index, start
+# and end per range. Claims the ranges no one else holds, or none of them if all or nothing
+# and any is held; returns the 1-based positions of the held ones
+HOLD_MANY_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local token, ttl = ARGV[1], tonumber(ARGV[2])
+local live = {}
+for k, key in ipairs(KEYS) do
+    live[k] = {}
+    local holds = redis.call('HGETALL', key)
+    for i = 1, #holds, 2 do
+        local held_start, held_end = string.match(holds[i], '(%d+):(%d+)')
+        local held_token, expires = string.match(holds[i + 1], '(%S+) (%d+)')
+        if tonumber(expires) <= now_ms then
+            redis.call('HDEL', key, holds[i])
+        elseif held_token ~= token then
+            table.insert(live[k], {tonumber(held_start), tonumber(held_end)})
+        end
+    end
+end
+local held, free = {}, {}
+for i = 4, #ARGV, 3 do
+    local k, start, finish = tonumber(ARGV[i]), tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])
+    local taken = false
+    for _, range in ipairs(live[k]) do
+        if range[1] < finish and range[2] > start then
+            taken = true
+            break
+        end
+    end
+    if taken then
+        table.insert(held, (i - 1) / 3)
+    else
+        table.insert(free, i)
+    end
+end
+if #held > 0 and ARGV[3] == '1' then
+    return held
+end
+for _, i in ipairs(free) do
+    local key = KEYS[tonumber(ARGV[i])]
+    redis.call('HSET', key, ARGV[i + 1] .. ':' .. ARGV[i + 2], token .. ' ' .. (now_ms + ttl))
+    if redis.call('PTTL', key) < ttl then
+        redis.call('PEXPIRE', key, ttl)
+    end
+end
+return held
+"""
+
+# KEYS[1] = holds hash; ARGV = field, token
+RELEASE_SCRIPT = """
+local held = redis.call('HGET', KEYS[1], ARGV[1])
+if held and string.match(held, '^(%S+)') == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+def _field(start: datetime, end: datetime) -> str:
+    return f"{calendar.timegm(start.timetuple())}:{calendar.timegm(end.timetuple())}"
+
+
+class SlotHolds:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _key(stadium_id: int) -> str:
+        return f"slot_holds:{stadium_id}"
+
+    async def hold(self, stadium_id: int, start: datetime, end: datetime, token: str,
+                   ttl_ms: int = HOLD_TTL_MS) -> bool:
+        """Claim [start, end) for token, or renew token's claim; False if a live hold of someone else overlaps it"""
+        field = _field(start, end)
+        held = await self.redis.register_script(HOLD_SCRIPT)(
+            keys=[self._key(stadium_id)], args=[*field.split(":"), token, ttl_ms]
+        )
+        return bool(held)
+
+    async def hold_many(self, ranges: Sequence[Tuple[int, datetime, datetime]], token: str,
+                        all_or_nothing: bool = True, ttl_ms: int = HOLD_TTL_MS) -> Set[int]:
+        """
+        Claim several (stadium_id, start, end) ranges for token in one call. Returns the
+        indexes of the ranges someone else holds; with all_or_nothing nothing is claimed
+        unless that is empty, otherwise the rest are.
+        """
+        keys = list(dict.fromkeys(self._key(stadium_id) for stadium_id, _, _ in ranges))
+        args = [token, ttl_ms, int(all_or_nothing)]
+        for stadium_id, start, end in ranges:
+            args.extend([keys.index(self._key(stadium_id)) + 1, *_field(start, end).split(":")])
+        held = await self.redis.register_script(HOLD_MANY_SCRIPT)(keys=keys, args=args)
+        return {int(position) - 1 for position in held}
+
+    async def release(self, stadium_id: int, start: datetime, end: datetime, token: str) -> None:
+        """Drop token's hold, e.g. when its insert failed"""
+        await self.redis.register_script(RELEASE_SCRIPT)(
+            keys=[self._key(stadium_id)], args=[_field(start, end), token]
+        )
+
+    async def release_many(self, ranges: Iterable[Tuple[int, datetime, datetime]], token: str) -> None:
+        """Drop token's holds on the ranges it has; others' holds on them are kept"""
+        script = self.redis.register_script(RELEASE_SCRIPT)
+        pipe = self.redis.pipeline(transaction=False)
+        for stadium_id, start, end in ranges:
+            await script(keys=[self._key(stadium_id)], args=[_field(start, end), token], client=pipe)
+        await pipe.execute()
+
+    async def clear(self, ranges: Iterable[Tuple[int, datetime, datetime]]) -> None:
+        """Drop whatever holds (stadium_id, start, end) exactly, for bookings that stopped being active"""
+        pipe = self.redis.pipeline(transaction=False)
+        for stadium_id, start, end in ranges:
+            pipe.hdel(self._key(stadium_id), _field(start, end))
+        await pipe.execute()
@@ -0,0 +1,48 @@
+"""
+Periodic expiry of waitlist offers.
+
+An offer holds a freed range for its waiter until offered_until. Every worker
+sweeps the offers past that moment, expires them and offers their ranges to the
+next waiters. The sweep reads the database, so it doesn't matter which worker
+made an offer or whether that worker is still running.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.database.dao.rdb.waitlist import WaitlistDAO
+
+logger = logging.getLogger(__name__)
+
+
+class OfferSweeper:
+    def __init__(self, interval: float = 30):
+        self.interval = interval
+        self._pool: Optional[sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """Expire the offers past their offered_until; returns how many"""
+        async with self._pool() as session:
+            return await WaitlistDAO(session).expire_offers()
+
+    async def start(self, pool: sessionmaker) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Waitlist offer sweep failed: {e}")
+            await asyncio.sleep(self.interval)
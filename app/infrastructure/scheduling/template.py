@@ -0,0 +1,129 @@
+"""
+Precompiled slot layout for a stadium.
+
+Opening hours are parsed once per stadium (per schedule_version) into per-weekday
+DaySlots plus date exceptions. Availability and booking validation only do
+integer arithmetic against the compiled template.
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True)
+class DaySlots:
+    open_minute: int  # Minutes after midnight of the schedule day
+    slot_minutes: int
+    size: int  # Number of slots; the day may run past midnight
+    labels: Tuple[str, ...]
+
+    @property
+    def minutes(self) -> int:
+        return self.size * self.slot_minutes
+
+    def bounds(self, day: date) -> Tuple[datetime, datetime]:
+        day_open = datetime.combine(day, time.min) + timedelta(minutes=self.open_minute)
+        return day_open, day_open + timedelta(minutes=self.minutes)
+
+    def slot_range(self, day: date, start: datetime, end: datetime) -> Optional[Tuple[int, int]]:
+        """[first, last) slot indexes if start/end fall on slot boundaries inside this day"""
+        day_open, _ = self.bounds(day)
+        start_offset = (start - day_open).total_seconds() / 60
+        end_offset = (end - day_open).total_seconds() / 60
+        if start_offset < 0 or end_offset > self.minutes or end_offset <= start_offset:
+            return None
+        if start_offset % self.slot_minutes or end_offset % self.slot_minutes:
+            return None
+        return int(start_offset) // self.slot_minutes, int(end_offset) // self.slot_minutes
+
+
+def compile_day(opens_at: time, closes_at: time, slot_minutes: int) -> DaySlots:
+    open_minute = opens_at.hour * 60 + opens_at.minute
+    close_minute = closes_at.hour * 60 + closes_at.minute
+    if close_minute <= open_minute:
+        close_minute += MINUTES_PER_DAY
+    size = (close_minute - open_minute) // slot_minutes
+    labels = tuple(
+        "{:02d}:{:02d}".format(((open_minute + i * slot_minutes) // 60) % 24, (open_minute + i * slot_minutes) % 60)
+        for i in range(size)
+    )
+    return DaySlots(open_minute=open_minute, slot_minutes=slot_minutes, size=size, labels=labels)
+
+
+@dataclass(frozen=True)
+class SlotTemplate:
+    stadium_id: int
+    schedule_version: int
+    slot_minutes: int
+    weekdays: Tuple[Optional[DaySlots], ...]  # Index 0 = Monday; None = closed
+    exceptions: Dict[date, Optional[DaySlots]] = field(default_factory=dict)
+
+    def for_date(self, day: date) -> Optional[DaySlots]:
+        if day in self.exceptions:
+            return self.exceptions[day]
+        return self.weekdays[day.weekday()]
+
+    def locate(self, start: datetime, end: datetime) -> Optional[Tuple[date, int, int]]:
+        """
+        Find the schedule day a booking belongs to and its slot range.
+        A booking after midnight may belong to the previous day's late opening.
+        """
+        for day in (start.date(), start.date() - timedelta(days=1)):
+            day_slots = self.for_date(day)
+            if day_slots is None:
+                continue
+            slot_range = day_slots.slot_range(day, start, end)
+            if slot_range is not None:
+                return (day,) + slot_range
+        return None
+
+    @classmethod
+    def compile(cls, stadium, schedules: Iterable, exceptions: Iterable) -> "SlotTemplate":
+        """
+        Build the template from a StadiumModel and its schedule/exception rows.
+        The legacy opening_hour/closing_hour strings are the default for weekdays without a row.
+        """
+        slot_minutes = stadium.slot_minutes or 60
+        default_day = compile_day(
+            datetime.strptime(stadium.opening_hour, "%H:%M").time(),
+            datetime.strptime(stadium.closing_hour, "%H:%M").time(),
+            slot_minutes
+        )
+
+        def row_to_day(row) -> Optional[DaySlots]:
+            if row.is_closed or row.opens_at is None or row.closes_at is None:
+                return None
+            return compile_day(row.opens_at, row.closes_at, slot_minutes)
+
+        weekdays = [default_day] * 7
+        for row in schedules:
+            weekdays[row.weekday] = row_to_day(row)
+
+        return cls(
+            stadium_id=stadium.id,
+            schedule_version=stadium.schedule_version or 1,
+            slot_minutes=slot_minutes,
+            weekdays=tuple(weekdays),
+            exceptions={row.date: row_to_day(row) for row in exceptions}
+        )
+
+
+# In-process cache, one entry per stadium; stale entries are detected by schedule_version
+_templates: Dict[int, SlotTemplate] = {}
+
+
+def get_cached_template(stadium_id: int, schedule_version: int) -> Optional[SlotTemplate]:
+    template = _templates.get(stadium_id)
+    if template is not None and template.schedule_version == schedule_version:
+        return template
+    return None
+
+
+def cache_template(template: SlotTemplate) -> None:
+    _templates[template.stadium_id] = template
+
+
+def invalidate_template(stadium_id: int) -> None:
+    _templates.pop(stadium_id, None)
@@ -0,0 +1,97 @@
+"""
+Waitlist queues for taken stadium time ranges.
+
+``waitlist:{{stadium_id}}:{start}:{end}`` (unix seconds) is a list of waitlist entry
+ids waiting for exactly that range, oldest first, expiring when the range ends.
+``waitlist_ranges:{{stadium_id}}`` is a sorted set of the ranges that have waiters,
+scored by their end. The braces are a cluster hash tag: a stadium's keys share a
+slot, so scripts may name them together. Joining and leaving touch one list and one
+member. When a range is freed, the overlapping ranges are read from the sorted set
+and one Lua call returns the head of each of their queues. The entries themselves
+live in Postgres (waitlist_entries); these keys only order them.
+"""
+import calendar
+from datetime import datetime
+from typing import List, Tuple
+
+from redis import asyncio as redis_asyncio
+
+# KEYS = queue, ranges; ARGV = entry id, range member
+REMOVE_SCRIPT = """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# KEYS = ranges, then the queue of each range member in ARGV; returns each queue's head, '' if empty
+HEADS_SCRIPT = """
+local heads = {}
+for i, member in ipairs(ARGV) do
+    local head = redis.call('LINDEX', KEYS[i + 1], 0)
+    if not head then
+        redis.call('ZREM', KEYS[1], member)
+    end
+    heads[i] = head or ''
+end
+return heads
+"""
+
+
+def _unix(moment: datetime) -> int:
+    return calendar.timegm(moment.timetuple())
+
+
+class WaitlistQueues:
+    def __init__(self, redis_client: redis_asyncio.Redis):
+        self.redis = redis_client
+
+    @staticmethod
+    def _member(start: datetime, end: datetime) -> str:
+        return f"{_unix(start)}:{_unix(end)}"
+
+    @staticmethod
+    def _queue_key(stadium_id: int, member: str) -> str:
+        return f"waitlist:{{{stadium_id}}}:{member}"
+
+    @staticmethod
+    def _ranges_key(stadium_id: int) -> str:
+        return f"waitlist_ranges:{{{stadium_id}}}"
+
+    async def join(self, entry_id: int, stadium_id: int, start: datetime, end: datetime) -> None:
+        member = self._member(start, end)
+        queue = self._queue_key(stadium_id, member)
+        pipe = self.redis.pipeline()
+        pipe.rpush(queue, entry_id)
+        pipe.expireat(queue, _unix(end))
+        pipe.zadd(self._ranges_key(stadium_id), {member: _unix(end)})
+        await pipe.execute()
+
+    async def remove(self, entry_id: int, stadium_id: int, start: datetime, end: datetime) -> None:
+        """Take an entry out of its queue, after it left or was offered the range"""
+        member = self._member(start, end)
+        await self.redis.register_script(REMOVE_SCRIPT)(
+            keys=[self._queue_key(stadium_id, member), self._ranges_key(stadium_id)], args=[entry_id, member]
+        )
+
+    async def heads(self, stadium_id: int, start: datetime, end: datetime) -> List[Tuple[int, datetime, datetime]]:
+        """(entry id, start, end) first in line for each waited-for range overlapping [start, end), oldest first"""
+        ranges = self._ranges_key(stadium_id)
+        pipe = self.redis.pipeline()
+        pipe.zremrangebyscore(ranges, "-inf", _unix(datetime.utcnow()))
+        pipe.zrangebyscore(ranges, f"({_unix(start)}", "+inf")
+        _, members = await pipe.execute()
+        members = [member for member in members if int(member.split(":")[0]) < _unix(end)]
+        if not members:
+            return []
+        found = await self.redis.register_script(HEADS_SCRIPT)(
+            keys=[ranges, *(self._queue_key(stadium_id, member) for member in members)], args=members
+        )
+        heads = []
+        for entry_id, member in zip(found, members):
+            if not entry_id:
+                continue
+            head_start, head_end = (datetime.utcfromtimestamp(int(value)) for value in member.split(":"))
+            heads.append((int(entry_id), head_start, head_end))
+        return sorted(heads)
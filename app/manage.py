@@ -0,0 +1,39 @@
+"""
+Maintenance commands, run with the same environment as the API:
+
+    python -m app.manage rebuild-leaderboard
+"""
+import argparse
+import asyncio
+
+from sqlalchemy.orm import sessionmaker
+
+from app import load_config
+from app.infrastructure.database.dao.rdb.stats import StatsDAO
+from app.infrastructure.database.factory import create_pool, make_connection_string
+
+
+async def rebuild_leaderboard(pool: sessionmaker) -> None:
+    """Recompute the trending leaderboard from confirmed bookings (after Redis data loss)"""
+    async with pool() as session:
+        count = await StatsDAO(session).rebuild_leaderboard()
+    print(f"Trending leaderboard rebuilt for {count} stadiums")
+
+
+COMMANDS = {
+    "rebuild-leaderboard": rebuild_leaderboard,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+
+    settings = load_config()
+    pool = create_pool(url=make_connection_string(settings=settings.db))
+    asyncio.run(COMMANDS[args.command](pool))
+
+
+if __name__ == "__main__":
+    main()